@@ -0,0 +1,100 @@
+"""
+Benchmark of the field lookups of PNTableMetaData and PNBuffer.
+
+Prime a PNBuffer of a 200 string column table from a model that resolves each cell through
+indexPos() and field(), as PNCursorTableModel.value does, and set every value of the row.
+Run it before and after the name indexes of PNTableMetaData and PNBuffer to compare.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_field_index [columns] [rows]
+"""
+
+import sys
+import time
+
+from pineboolib.application.metadata import pntablemetadata, pnfieldmetadata
+from pineboolib.application.database import pnbuffer
+
+from typing import Any, List
+
+
+class BenchModel(object):
+    """Model that returns the values of a single row."""
+
+    def __init__(self, metadata: "pntablemetadata.PNTableMetaData", row: List[Any]) -> None:
+        """Inicialize."""
+
+        self._metadata = metadata
+        self._row = row
+
+    def value(self, row: int, field_name: str) -> Any:
+        """Return a value, looking up the field as PNCursorTableModel.value does."""
+
+        pos = self._metadata.indexPos(field_name)
+        self._metadata.field(field_name).type()  # type: ignore [union-attr]
+        return self._row[pos]
+
+
+class BenchCursor(object):
+    """Cursor with the methods used by PNBuffer."""
+
+    def __init__(self, metadata: "pntablemetadata.PNTableMetaData", model: BenchModel) -> None:
+        """Inicialize."""
+
+        self._metadata = metadata
+        self._model = model
+
+    def metadata(self) -> "pntablemetadata.PNTableMetaData":
+        """Return the metadata."""
+
+        return self._metadata
+
+    def model(self) -> BenchModel:
+        """Return the model."""
+
+        return self._model
+
+    def currentRegister(self) -> int:
+        """Return the current row."""
+
+        return 0
+
+
+def main() -> None:
+    """Run the benchmark."""
+
+    columns = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+    metadata = pntablemetadata.PNTableMetaData("bench", "bench", None)
+    for number in range(columns):
+        metadata.addFieldMD(
+            pnfieldmetadata.PNFieldMetaData(
+                "campo_%03d" % number, "Campo %s" % number, True, number == 0, "string", 20
+            )
+        )
+
+    names = ["campo_%03d" % number for number in range(columns)]
+    row = ["valor_%s" % number for number in range(columns)]
+    buffer = pnbuffer.PNBuffer(BenchCursor(metadata, BenchModel(metadata, row)))  # type: ignore
+
+    start = time.perf_counter()
+    for number in range(rows):
+        buffer.primeUpdate(number)
+    prime_ms = (time.perf_counter() - start) / rows * 1000
+
+    start = time.perf_counter()
+    for number in range(rows):
+        for name in names:
+            buffer.setValue(name, "x")
+    set_ms = (time.perf_counter() - start) / rows * 1000
+
+    print(
+        "%s columns: primeUpdate %.3f ms per row, setValue of the whole row %.3f ms"
+        % (columns, prime_ms, set_ms)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark of the parsed forms cache (qt3uiparser.formcache).
+
+Build the system module forms and the Qt3 forms of the tests with FLManagerModules.createUI,
+with the cache disabled (every form is parsed and its images decoded again) and enabled.
+It also compares parsing the system module forms with loading them pickled, the reason there
+is no cache on disk.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_formcache [passes]
+"""
+
+import glob
+import os
+import pickle
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from pineboolib.loader.main import init_testing, finish_testing  # noqa: E402
+from pineboolib.core import settings  # noqa: E402
+from pineboolib.core.utils.utils_base import filedir, load2xml  # noqa: E402
+
+SYSTEM_FORMS = sorted(glob.glob(filedir("./system_module/forms/*.ui")))
+QT3_FORMS = [
+    filedir("./application/parsers/qt3uiparser/tests/fixtures/form_record_qt3.ui"),
+    filedir("./application/parsers/qt3uiparser/tests/fixtures/main_form_qt3.ui"),
+    filedir("./application/packager/tests/fixtures/principal/forms/agentes.ui"),
+]
+
+
+def build_form(file_name: str) -> bool:
+    """Build a form and return if it could be built."""
+
+    from pineboolib.fllegacy.flmanagermodules import FLManagerModules
+
+    try:
+        widget = FLManagerModules.createUI(file_name)
+    except Exception:
+        return False
+
+    widget.close()
+    widget.deleteLater()
+    return True
+
+
+def buildable_forms(files):
+    """Return the forms that can be built without a project loaded (some need a cursor)."""
+
+    return [file_name for file_name in files if build_form(file_name)]
+
+
+def create_forms(files, passes: int) -> float:
+    """Return the milliseconds per pass building every form of files."""
+
+    for file_name in files:  # Calentamiento: clases de widgets, plugins de uic...
+        build_form(file_name)
+
+    start = time.perf_counter()
+    for _ in range(passes):
+        for file_name in files:
+            build_form(file_name)
+    return (time.perf_counter() - start) / passes * 1000
+
+
+def parse_forms(files, passes: int) -> float:
+    """Return the milliseconds per pass parsing every form of files."""
+
+    start = time.perf_counter()
+    for _ in range(passes):
+        for file_name in files:
+            load2xml(file_name)
+    return (time.perf_counter() - start) / passes * 1000
+
+
+def unpickle_forms(files, passes: int) -> float:
+    """Return the milliseconds per pass loading every form of files pickled."""
+
+    blobs = [
+        pickle.dumps(load2xml(file_name).getroot(), pickle.HIGHEST_PROTOCOL) for file_name in files
+    ]
+    start = time.perf_counter()
+    for _ in range(passes):
+        for blob in blobs:
+            pickle.loads(blob)
+    return (time.perf_counter() - start) / passes * 1000
+
+
+def main() -> None:
+    """Run the benchmark."""
+
+    passes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    init_testing()
+    try:
+        from pineboolib.application.parsers.qt3uiparser import formcache
+
+        print(
+            "parse %s system forms: %.1f ms, unpickle: %.1f ms"
+            % (
+                len(SYSTEM_FORMS),
+                parse_forms(SYSTEM_FORMS, passes * 4),
+                unpickle_forms(SYSTEM_FORMS, passes * 4),
+            )
+        )
+        for title, all_files in (("system", SYSTEM_FORMS), ("qt3", QT3_FORMS)):
+            files = buildable_forms(all_files)
+            settings.config.set_value("ebcomportamiento/form_cache", False)
+            before = create_forms(files, passes)
+            settings.config.set_value("ebcomportamiento/form_cache", True)
+            formcache.FORM_CACHE.clear()
+            after = create_forms(files, passes)
+            print(
+                "createUI %s forms (%s of %s): cache off %.1f ms, cache on %.1f ms per pass"
+                % (title, len(files), len(all_files), before, after)
+            )
+    finally:
+        settings.config.set_value("ebcomportamiento/form_cache", True)
+        finish_testing()
+
+
+if __name__ == "__main__":
+    main()
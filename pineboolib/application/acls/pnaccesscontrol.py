@@ -88,12 +88,19 @@ class PNAccessControl(object):
     """
     _acos_perms: Dict[str, str]
 
+    """
+    Datos precalculados a partir del permiso general y de los ACOs. Se descartan
+    cada vez que cambia alguno de ellos.
+    """
+    _compiled: Any
+
     def __init__(self) -> None:
         """Initialization."""
         self._name = ""
         self._user = ""
         self._perm = ""
         self._acos_perms = {}
+        self._compiled = None
 
     def __del__(self) -> None:
         """Remove values ​​when closed."""
@@ -155,6 +162,7 @@ class PNAccessControl(object):
         """
 
         self._perm = perm
+        self._compiled = None
 
     def clear(self) -> None:
         """
@@ -164,6 +172,7 @@ class PNAccessControl(object):
         self._name = ""
         self._user = ""
         self._perm = ""
+        self._compiled = None
         if self._acos_perms:
             self._acos_perms.clear()
             del self._acos_perms
@@ -196,6 +205,7 @@ class PNAccessControl(object):
             del self._acos_perms
 
         self._acos_perms = {}
+        self._compiled = None
 
         self._perm = element.attribute("perm")
         node = element.firstChild()
@@ -258,6 +268,7 @@ class PNAccessControl(object):
         """
 
         self._acos_perms.clear()
+        self._compiled = None
         i = 0
         while i < len(acos):
             self._acos_perms[acos[i]] = acos[i + 1]
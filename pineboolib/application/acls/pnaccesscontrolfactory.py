@@ -10,7 +10,7 @@ from pineboolib.application.metadata import pntablemetadata
 from . import pnaccesscontrol
 
 
-from typing import Dict, Any, Optional, cast
+from typing import Dict, Any, Optional, Tuple, cast
 
 import logging
 
@@ -35,22 +35,11 @@ class PNAccessControlMainWindow(pnaccesscontrol.PNAccessControl):
 
         if main_window is None:
             return
-        list1 = main_window.findChildren(QtWidgets.QAction)
-
-        if self._perm != "":
-            for action in list1:
-                act = cast(QtWidgets.QAction, action)
-                if act.objectName() in self._acos_perms.keys():
-                    continue
-                if self._perm in ["-w", "--"]:
-                    act.setVisible(False)
-
-        for a_name, perm in self._acos_perms.items():
-            for child in list1:
-                wid = cast(QtWidgets.QWidget, child)
-                if wid.objectName() == a_name:
-                    if perm in ["-w", "--"]:
-                        wid.setVisible(False)
+
+        for action in main_window.findChildren(QtWidgets.QAction):
+            perm = self._acos_perms.get(action.objectName(), self._perm)
+            if perm in ("-w", "--"):
+                cast(QtWidgets.QAction, action).setVisible(False)
 
     def setFromObject(self, object: Any) -> None:
         """Not implemented jet."""
@@ -98,35 +87,27 @@ class PNAccessControlForm(pnaccesscontrol.PNAccessControl):
         if widget is None:
             return
 
-        if self._perm != "":
-            for children in widget.findChildren(QtWidgets.QWidget):
-                child = cast(QtWidgets.QWidget, children)
-                if child.objectName() in self._acos_perms.keys():
-                    continue
-
-                if self._perm in ("-w", "--"):
-                    child.setPalette(self.pal)
-                    child.setDisabled(True)
-                    child.hide()
-                    continue
+        found = set()
+        for children in widget.findChildren(QtWidgets.QWidget):
+            child = cast(QtWidgets.QWidget, children)
+            object_name = child.objectName()
+            perm = self._acos_perms.get(object_name)
+            if perm is None:
+                perm = self._perm
+            elif object_name in found:  # Como findChild, sólo el primero con ese nombre.
+                continue
+            else:
+                found.add(object_name)
 
-                elif self._perm == "r-":
-                    child.setDisabled(True)
+            if perm in ("-w", "--"):
+                child.setPalette(self.pal)
+                child.setDisabled(True)
+                child.hide()
+            elif perm == "r-":
+                child.setDisabled(True)
 
         for object_name in self._acos_perms.keys():
-            child = cast(QtWidgets.QWidget, widget.findChild(QtWidgets.QWidget, object_name))
-            if child:
-                perm = self._acos_perms[object_name]
-                if perm in ("-w", "--"):
-                    child.setPalette(self.pal)
-                    child.setDisabled(True)
-                    child.hide()
-                    continue
-
-                if perm == "r-":
-                    child.setDisabled(True)
-
-            else:
+            if object_name not in found:
                 LOGGER.warning(
                     "PNAccessControlFactory: No se encuentra el control %s para procesar ACLS.",
                     object_name,
@@ -154,47 +135,38 @@ class PNAccessControlTable(pnaccesscontrol.PNAccessControl):
     def processObject(self, table_metadata: "pntablemetadata.PNTableMetaData") -> None:
         """Process pntablemetadata.PNTableMetaData belonging to a table."""
 
-        mask_perm = 0
-        has_acos = True if self._acos_perms else False
+        if self._compiled is None:
+            self._compiled = self._compile()
+
+        if not self._compiled:
+            return
+
+        mask_perm, field_masks = self._compiled
+        for field in table_metadata.fieldList():
+            mask_field_perm = field_masks.get(field.name(), mask_perm)
+            field.setVisible(bool(mask_field_perm & 2))
+            field.setEditable(bool(mask_field_perm & 1))
+
+    def _compile(self) -> Tuple:
+        """
+        Return the general permission mask and the mask of each ACO.
+
+        Mask values are 2 (read) + 1 (write). Return an empty tuple when there is nothing to apply.
+        """
 
         if self._perm:
-            if self._perm[0] == "r":
-                mask_perm += 2
-            if self._perm[1] == "w":
-                mask_perm += 1
-        elif has_acos:
+            mask_perm = self._mask(self._perm)
+        elif self._acos_perms:
             mask_perm = 3
         else:
-            return
+            return ()
+
+        return (mask_perm, {name: self._mask(perm) for name, perm in self._acos_perms.items()})
+
+    def _mask(self, perm: str) -> int:
+        """Return the mask of a permission."""
 
-        field_perm = ""
-        mask_field_perm = 0
-
-        fields_list = table_metadata.fieldList()
-
-        for field in fields_list:
-            mask_field_perm = mask_perm
-            if has_acos and (field.name() in self._acos_perms.keys()):
-                field_perm = self._acos_perms[field.name()]
-                mask_field_perm = 0
-                if field_perm[0] == "r":
-                    mask_field_perm += 2
-
-                if field_perm[1] == "w":
-                    mask_field_perm += 1
-
-            if mask_field_perm == 0:
-                field.setVisible(False)
-                field.setEditable(False)
-            elif mask_field_perm == 1:
-                field.setVisible(False)
-                field.setEditable(True)
-            elif mask_field_perm == 2:
-                field.setVisible(True)
-                field.setEditable(False)
-            elif mask_field_perm == 3:
-                field.setVisible(True)
-                field.setEditable(True)
+        return (2 if perm[0] == "r" else 0) + (1 if perm[1] == "w" else 0)
 
     def setFromObject(self, table_mtd: Optional["pntablemetadata.PNTableMetaData"]) -> None:
         """Apply permissions from a pntablemetadata.PNTableMetaData."""
@@ -206,6 +178,7 @@ class PNAccessControlTable(pnaccesscontrol.PNAccessControl):
             self._acos_perms.clear()
 
         self._acos_perms = {}
+        self._compiled = None
 
         for field in table_mtd.fieldList():
             perm_read = "-"
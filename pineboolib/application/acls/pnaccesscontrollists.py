@@ -12,7 +12,7 @@ from pineboolib.application.database import pnsqlquery
 from . import pnaccesscontrolfactory
 
 from pineboolib import logging
-from typing import Any, Dict, Optional, TYPE_CHECKING
+from typing import Any, Dict, Iterable, List, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from . import pnaccesscontrol  # noqa : F401
@@ -44,11 +44,23 @@ class PNAccessControlLists(object):
 
     _access_control_list: Dict[str, "pnaccesscontrol.PNAccessControl"]
 
+    """
+    Las mismas reglas agrupadas por usuario, tipo y nombre del objeto, para no tener que
+    componer la clave de cada objeto procesado.
+    """
+    _user_rules: Dict[str, Dict[str, Dict[str, "pnaccesscontrol.PNAccessControl"]]]
+
+    """
+    Tipo de objeto de alto nivel de cada clase ya procesada.
+    """
+    _class_types: Dict[type, str] = {}
+
     def __init__(self):
         """Initialize the class."""
 
         self._name = None
         self._access_control_list = {}
+        self._user_rules = {}
 
     def __del__(self) -> None:
         """Process when destroying the class."""
@@ -90,6 +102,7 @@ class PNAccessControlLists(object):
             return
 
         self._access_control_list = {}
+        self._user_rules = {}
         # self._access_control_list.setAutoDelete(True)
 
         doc_elem = doc.documentElement()
@@ -112,6 +125,9 @@ class PNAccessControlLists(object):
                     self._access_control_list[
                         "%s::%s::%s" % (rule.type(), rule.name(), rule.user())
                     ] = rule
+                    self._user_rules.setdefault(rule.user(), {}).setdefault(str(rule.type()), {})[
+                        rule.name()
+                    ] = rule
                     node = node.nextSibling()
                     continue
 
@@ -126,31 +142,34 @@ class PNAccessControlLists(object):
         @param obj High-level object to which access control is applied. It must be or inherit from the QObject class.
         """
 
-        if obj is None or not self._access_control_list:
+        if obj is None or not self._user_rules:
             return
 
-        if not self._access_control_list:
+        if application.PROJECT.conn_manager is None:
+            raise Exception("Project is not connected yet")
+
+        user_rules = self._user_rules.get(application.PROJECT.conn_manager.mainConn().user())
+        if not user_rules:
             return
-        type_ = pnaccesscontrolfactory.PNAccessControlFactory().type(obj)
-        name = ""
 
+        type_ = self._class_types.get(obj.__class__)
+        if type_ is None:
+            type_ = pnaccesscontrolfactory.PNAccessControlFactory().type(obj)
+            self._class_types[obj.__class__] = type_
+
+        type_rules = user_rules.get(type_)
+        if not type_rules:
+            return
+
+        name = ""
         if hasattr(obj, "name"):
             name = obj.name()
         elif hasattr(obj, "objectName"):
             name = obj.objectName()
 
-        from pineboolib import application
-
-        if application.PROJECT.conn_manager is None:
-            raise Exception("Project is not connected yet")
-
-        user = application.PROJECT.conn_manager.mainConn().user()
-        if type_ == "" or name == "" or user == "":
-            return
-
-        key = "%s::%s::%s" % (type_, name, user)
-        if key in self._access_control_list.keys():
-            self._access_control_list[key].processObject(obj)
+        rule = type_rules.get(name) if name else None
+        if rule is not None:
+            rule.processObject(obj)
 
     def install_acl(self, idacl: str) -> None:
         """
@@ -175,16 +194,20 @@ class PNAccessControlLists(object):
         qry.setFrom("flacs")
         qry.setWhere("idacl='%s'" % idacl)
         qry.setOrderBy("prioridad DESC, tipo")
-        qry.setForwardOnly(True)
 
         if qry.exec_():
+            # Los acos y los usuarios de los grupos se leen de una vez, no por cada regla.
+            acos_dict = self.load_acos(idacl)
+            users_dict = self.load_group_users(
+                set(str(row[4]) for row in qry.values_batch() if row[5])
+            )
             # step = 0
             # progress = util.ProgressDialog(util.tr("Instalando control de acceso..."), None, q.size(), None, None, True)
             # progress.setCaption(util.tr("Instalando ACL"))
             # progress.setMinimumDuration(0)
             # progress.setProgress(++step)
             while qry.next():
-                self.make_rule(qry, doc)
+                self.make_rule(qry, doc, acos_dict, users_dict)
                 # progress.setProgress(++step)
 
             from pineboolib import application
@@ -196,7 +219,64 @@ class PNAccessControlLists(object):
                 "acl.xml", "sys", doc.toString()
             )
 
-    def make_rule(self, qry: pnsqlquery.PNSqlQuery, dom_document: QtXml.QDomDocument) -> None:
+    def load_acos(self, idacl: str) -> Dict[str, List[str]]:
+        """
+        Return the ACOs of every rule of an access control list.
+
+        @param idacl Record identifier of the "flacls" table.
+        @return Dict with the ACOs list (name, permission, ...) of each "flacs" identifier.
+        """
+
+        acos_dict: Dict[str, List[str]] = {}
+        qry_acos = pnsqlquery.PNSqlQuery()
+        qry_acos.setTablesList("flacos,flacs")
+        qry_acos.setSelect("flacos.idac,flacos.nombre,flacos.permiso")
+        qry_acos.setFrom("flacos INNER JOIN flacs ON flacos.idac = flacs.idac")
+        qry_acos.setWhere("flacs.idacl='%s'" % idacl)
+        qry_acos.setOrderBy("flacos.idaco")
+        qry_acos.setForwardOnly(True)
+
+        if qry_acos.exec_():
+            for idac, name, perm in qry_acos.rows():
+                acos_dict.setdefault(str(idac), []).extend([str(name), perm])
+
+        return acos_dict
+
+    def load_group_users(self, groups: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Return the users of several groups.
+
+        @param groups Identifiers of the groups.
+        @return Dict with the users list of each group.
+        """
+
+        users_dict: Dict[str, List[str]] = {}
+        groups = sorted(groups)
+        if not groups:
+            return users_dict
+
+        qry_users = pnsqlquery.PNSqlQuery()
+        qry_users.setTablesList("flusers")
+        qry_users.setSelect("idgroup,iduser")
+        qry_users.setFrom("flusers")
+        qry_users.setWhere(
+            "idgroup IN (%s)" % ", ".join("'%s'" % group.replace("'", "''") for group in groups)
+        )
+        qry_users.setForwardOnly(True)
+
+        if qry_users.exec_():
+            for idgroup, iduser in qry_users.rows():
+                users_dict.setdefault(str(idgroup), []).append(str(iduser))
+
+        return users_dict
+
+    def make_rule(
+        self,
+        qry: pnsqlquery.PNSqlQuery,
+        dom_document: QtXml.QDomDocument,
+        acos_dict: Optional[Dict[str, List[str]]] = None,
+        users_dict: Optional[Dict[str, List[str]]] = None,
+    ) -> None:
         """
         Create the corresponding DOM node (s) to a record in the "flacs" table.
 
@@ -207,17 +287,26 @@ class PNAccessControlLists(object):
 
         @param q Query about the "flacs" table positioned in the register to be used to construct the rule (s).
         @param d DOM / XML document in which you will insert the node (s) that describe the access control rule (s).
+        @param acos_dict ACOs of the rules, from PNAccessControlLists::load_acos. If None they are queried.
+        @param users_dict Users of the groups, from PNAccessControlLists::load_group_users. If None they are queried.
         """
         if not qry or not dom_document:
             return
 
+        acos = None if acos_dict is None else acos_dict.get(str(qry.value(0)), [])
         if qry.value(5):
-            self.make_rule_group(qry, dom_document, str(qry.value(4)))
+            idgroup = str(qry.value(4))
+            users = None if users_dict is None else users_dict.get(idgroup, [])
+            self.make_rule_group(qry, dom_document, idgroup, users, acos)
         else:
-            self.make_rule_user(qry, dom_document, str(qry.value(3)))
+            self.make_rule_user(qry, dom_document, str(qry.value(3)), acos)
 
     def make_rule_user(
-        self, qry: pnsqlquery.PNSqlQuery, dom_document: QtXml.QDomDocument, iduser: str
+        self,
+        qry: pnsqlquery.PNSqlQuery,
+        dom_document: QtXml.QDomDocument,
+        iduser: str,
+        acos: Optional[List[str]] = None,
     ) -> None:
         """
         Create a DOM node corresponding to a record in the "flacs" table and for a given user.
@@ -225,6 +314,7 @@ class PNAccessControlLists(object):
         @param q Query about the "flacs" table positioned in the register to be used to construct the rule.
         @param d DOM / XML document in which you will insert the node that describes the access control rule.
         @param iduser Identifier of the user used in the access control rule.
+        @param acos ACOs of the rule (name, permission, ...). If None they are queried.
         """
         if not iduser or not qry or not dom_document:
             return
@@ -235,25 +325,31 @@ class PNAccessControlLists(object):
             rule.setUser(iduser)
             rule.setPerm(str(qry.value(6)))
 
-            qry_acos = pnsqlquery.PNSqlQuery()
-            qry_acos.setTablesList("flacos")
-            qry_acos.setSelect("nombre,permiso")
-            qry_acos.setFrom("flacos")
-            qry_acos.setWhere("idac ='%s'" % qry.value(0))
-            qry_acos.setForwardOnly(True)
+            if acos is None:
+                qry_acos = pnsqlquery.PNSqlQuery()
+                qry_acos.setTablesList("flacos")
+                qry_acos.setSelect("nombre,permiso")
+                qry_acos.setFrom("flacos")
+                qry_acos.setWhere("idac ='%s'" % qry.value(0))
+                qry_acos.setForwardOnly(True)
 
-            acos = []
+                acos = []
 
-            if qry_acos.exec_():
-                while qry_acos.next():
-                    acos.append(str(qry_acos.value(0)))
-                    acos.append((qry_acos.value(1)))
+                if qry_acos.exec_():
+                    while qry_acos.next():
+                        acos.append(str(qry_acos.value(0)))
+                        acos.append((qry_acos.value(1)))
 
             rule.setAcos(acos)
             rule.get(dom_document)
 
     def make_rule_group(
-        self, qry: pnsqlquery.PNSqlQuery, dom_document: QtXml.QDomDocument, idgroup: str = ""
+        self,
+        qry: pnsqlquery.PNSqlQuery,
+        dom_document: QtXml.QDomDocument,
+        idgroup: str = "",
+        users: Optional[List[str]] = None,
+        acos: Optional[List[str]] = None,
     ) -> None:
         """
         Create several DOM nodes corresponding to a record in the "flacs" table and for a specific user group.
@@ -264,10 +360,17 @@ class PNAccessControlLists(object):
         @param q Query about the "flacs" table positioned in the register to use to build the rules.
         @param d DOM / XML document in which the nodes that describe the access control rules will be inserted.
         @param idgroup Identifier of the user group.
+        @param users Users of the group. If None they are queried.
+        @param acos ACOs of the rule (name, permission, ...). If None they are queried.
         """
         if idgroup == "" or not qry or not dom_document:
             return
 
+        if users is not None:
+            for iduser in users:
+                self.make_rule_user(qry, dom_document, iduser, acos)
+            return
+
         qry_users = pnsqlquery.PNSqlQuery()
 
         qry_users.setTablesList("flusers")
@@ -278,4 +381,4 @@ class PNAccessControlLists(object):
 
         if qry_users.exec_():
             while qry_users.next():
-                self.make_rule_user(qry, dom_document, str(qry_users.value(0)))
+                self.make_rule_user(qry, dom_document, str(qry_users.value(0)), acos)
@@ -464,6 +464,40 @@ class TestACLS(unittest.TestCase):
         self.assertTrue(field.editable())
         self.assertTrue(field.visible())
 
+    def test_install_preloaded(self) -> None:
+        """Test acl.xml is the same reading flacos and flusers once."""
+        from PyQt5 import QtXml
+        from pineboolib.application.database import pnsqlquery
+
+        acl = pnaccesscontrollists.PNAccessControlLists()
+        acl.install_acl("primera")
+        content = flapplication.aqApp.db().managerModules().content("acl.xml")
+
+        doc = QtXml.QDomDocument("ACL")
+        root = doc.createElement("ACL")
+        doc.appendChild(root)
+        name = doc.createElement("name")
+        root.appendChild(name)
+        name.appendChild(doc.createTextNode("primera"))
+        qry = pnsqlquery.PNSqlQuery()
+        self.assertTrue(
+            qry.exec_(
+                "SELECT idac,tipo,nombre,iduser,idgroup,degrupo,permiso FROM flacs"
+                " WHERE idacl='primera' ORDER BY prioridad DESC, tipo"
+            )
+        )
+        while qry.next():
+            acl.make_rule(qry, doc)
+        self.assertEqual(content, doc.toString())
+
+        acl.init(content)
+        rule = acl._user_rules["memory_user"]["table"]["flgroups"]
+        self.assertTrue(rule is acl._access_control_list["table::flgroups::memory_user"])
+        acl.process(flapplication.aqApp.db().manager().metadata("flgroups"))
+        self.assertTrue(rule._compiled)
+        rule.setPerm("r-")
+        self.assertEqual(rule._compiled, None)
+
     @classmethod
     def tearDownClass(cls) -> None:
         """Ensure test clear all data."""
@@ -12,7 +12,7 @@ import copy
 import datetime
 import decimal
 
-from typing import Dict, List, Union, Optional, Any, TYPE_CHECKING
+from typing import Dict, List, Tuple, Union, Optional, Any, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pineboolib.interfaces import ifieldmetadata, isqlcursor
@@ -184,6 +184,8 @@ class PNBuffer(object):
     """
 
     field_dict_: Dict[str, FieldStruct]
+    _fields_list: Optional[Tuple[FieldStruct, ...]]
+    _field_pos: Dict[str, int]
 
     def __init__(self, cursor: "isqlcursor.ISqlCursor") -> None:
         """Create a Buffer from the specified PNSqlCursor."""
@@ -192,6 +194,8 @@ class PNBuffer(object):
             raise Exception("Missing cursor")
         self.cursor_ = cursor
         self.field_dict_ = {}
+        self._fields_list = None
+        self._field_pos = {}
         self.line_: int = -1
         self.inicialized_: bool = False
 
@@ -482,17 +486,24 @@ class PNBuffer(object):
         @param name = field name.
         @return field position.
         """
-        for i, field in enumerate(self.fieldsList()):
-            if field.name == name:
-                return i
+        if self._fields_list is None:
+            self.fieldsList()
+
+        pos = self._field_pos.get(name)
+        if pos is not None:
+            return pos
         LOGGER.warning("indexField: %s not found", name)
         return None
 
-    def fieldsList(self) -> List[FieldStruct]:
+    def fieldsList(self) -> Tuple[FieldStruct, ...]:
         """
         List of fields that contain the buffer."""
 
-        return list(self.field_dict_.values())
+        if self._fields_list is None:
+            self._fields_list = tuple(self.field_dict_.values())
+            self._field_pos = {field.name: pos for pos, field in enumerate(self._fields_list)}
+
+        return self._fields_list
 
     def field(self, field_name: Union[str, int]) -> Optional[FieldStruct]:
         """
@@ -517,8 +528,9 @@ class PNBuffer(object):
             else:
                 mtd_field = self.cursor_.metadata().field(name)
         elif isinstance(field_name_or_index, int):
-            if field_name_or_index > 0 and field_name_or_index < len(self.fieldsList()):
-                return self.fieldsList()[field_name_or_index]
+            fields_list = self.fieldsList()
+            if field_name_or_index >= 0 and field_name_or_index < len(fields_list):
+                return fields_list[field_name_or_index]
             else:
                 mtd_field = self.cursor_.metadata().indexFieldObject(field_name_or_index)
 
@@ -530,5 +542,6 @@ class PNBuffer(object):
         if mtd_field is not None:
             new_field_struct = FieldStruct(mtd_field)
             self.field_dict_[new_field_struct.name] = new_field_struct
+            self._fields_list = None
 
         return new_field_struct
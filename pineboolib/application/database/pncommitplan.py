@@ -0,0 +1,115 @@
+"""
+PNCommitPlan module.
+
+Keep what PNSqlCursor.commitBuffer needs to know about a table.
+"""
+
+from pineboolib import application
+
+import threading
+
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pineboolib.interfaces import isqlcursor, itablemetadata  # noqa: F401
+    from pineboolib.interfaces import ifieldmetadata  # noqa: F401
+
+
+class PNCommitPlan(object):
+    """
+    PNCommitPlan class.
+
+    Commit hooks of the module script and the fields that commitBuffer has to look at.
+    """
+
+    metadata: "itablemetadata.ITableMetaData"
+    id_module: str
+    action: Any
+    module_script: Any
+    before_commit: Optional[Callable]
+    after_commit: Optional[Callable]
+    check_fields: List["ifieldmetadata.IFieldMetaData"]
+    calculated_fields: List["ifieldmetadata.IFieldMetaData"]
+    relation_fields: List["ifieldmetadata.IFieldMetaData"]
+
+    def __init__(self, cursor: "isqlcursor.ISqlCursor") -> None:
+        """Inicialize."""
+
+        metadata = cursor.metadata()
+        table_name = metadata.name()
+        self.metadata = metadata
+        self.id_module = (
+            cursor.db().connManager().managerModules().idModuleOfFile("%s.mtd" % table_name)
+        )
+        # FIXME: module_script is FLFormDB
+        self.action = self._action()
+        self.module_script = self.action.load()
+        module_iface: Any = getattr(self.module_script, "iface", None)
+        self.before_commit = getattr(module_iface, "beforeCommit_%s" % table_name, None)
+        self.after_commit = getattr(module_iface, "afterCommit_%s" % table_name, None)
+
+        field_list = metadata.fieldList()
+        self.check_fields = [field for field in field_list if field.isCheck()]
+        self.calculated_fields = [
+            field for field in field_list if field.calculated() and not field.isCheck()
+        ]
+        self.relation_fields = [field for field in field_list if field.relationList()]
+
+    def _action(self) -> Any:
+        """Return the action that holds the module script."""
+
+        actions = application.PROJECT.actions
+        return actions[self.id_module] if self.id_module in actions.keys() else actions["sys"]
+
+    def is_valid(self, metadata: "itablemetadata.ITableMetaData") -> bool:
+        """Return if the plan is still valid: same metadata and same loaded module script."""
+
+        return (
+            metadata is self.metadata
+            and self._action() is self.action
+            and self.action.mainform_widget is self.module_script
+            and getattr(self.module_script, "_loaded", False)
+        )
+
+
+class PNCommitPlans(object):
+    """
+    PNCommitPlans class.
+
+    Plans are kept by (connection, table) and are rebuilt when the metadata of the cursor or
+    the module script (reloaded modules) are not the ones they were resolved with.
+    """
+
+    _plans: Dict[Tuple[str, str], PNCommitPlan]
+
+    def __init__(self) -> None:
+        """Inicialize."""
+
+        self._lock = threading.Lock()
+        self._plans = {}
+
+    def plan(self, cursor: "isqlcursor.ISqlCursor") -> PNCommitPlan:
+        """Return the commit plan of the table of a cursor."""
+
+        metadata = cursor.metadata()
+        key = (cursor.db().connectionName(), metadata.name())
+        plan = self._plans.get(key)
+        if plan is None or not plan.is_valid(metadata):
+            plan = PNCommitPlan(cursor)
+            with self._lock:
+                self._plans[key] = plan
+
+        return plan
+
+    def clear(self, table_name: Optional[str] = None) -> None:
+        """Forget the plans of a table, or all of them."""
+
+        with self._lock:
+            if table_name is None:
+                self._plans = {}
+            else:
+                for key in [key for key in self._plans.keys() if key[1] == table_name]:
+                    del self._plans[key]
+
+
+COMMIT_PLANS = PNCommitPlans()
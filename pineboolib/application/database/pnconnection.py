@@ -6,13 +6,14 @@ from PyQt5 import QtCore, QtWidgets
 
 from pineboolib.core import settings, decorators, utils
 from pineboolib.interfaces import iconnection
-from . import pnsqldrivers
+from . import pnsqldrivers, pnsizecache, pnsqlstats
 from pineboolib import application
 
 # from .pnsqlsavepoint import PNSqlSavePoint
 from . import DB_SIGNALS
-from typing import Dict, List, Optional, Any, Union, TYPE_CHECKING
+from typing import Dict, List, Optional, Any, Union, Sequence, TYPE_CHECKING
 
+import threading
 import time
 
 if TYPE_CHECKING:
@@ -36,6 +37,7 @@ class PNConnection(QtCore.QObject, iconnection.IConnection):
     _driver_sql: "pnsqldrivers.PNSqlDrivers"
     _transaction: int
     _driver_name: str
+    _select_memo: Optional[Dict[str, Any]]
     # currentSavePoint_: Optional[PNSqlSavePoint]
     # stackSavePoints_: List[PNSqlSavePoint]
     # queueSavePoints_: List[PNSqlSavePoint]
@@ -47,6 +49,7 @@ class PNConnection(QtCore.QObject, iconnection.IConnection):
     connections_dict: Dict[str, "iconnection.IConnection"] = {}
     _conn_manager: "pnconnectionmanager.PNConnectionManager"
     _last_activity_time: float
+    _released: bool
 
     def __init__(
         self,
@@ -60,6 +63,8 @@ class PNConnection(QtCore.QObject, iconnection.IConnection):
         """Database connection through a sql driver."""
 
         super().__init__()
+        self._activity_lock = threading.RLock()
+        self._released = False
         self.update_activity_time()
         self.conn = None
         self._driver = None
@@ -91,6 +96,7 @@ class PNConnection(QtCore.QObject, iconnection.IConnection):
         self._driver_name = self._driver_sql.aliasToName(driver_alias)
 
         self._transaction = 0
+        self._select_memo = None
         # self.stackSavePoints_ = []
         # self.queueSavePoints_ = []
         self._interactive_gui = True
@@ -153,6 +159,8 @@ class PNConnection(QtCore.QObject, iconnection.IConnection):
     def driver(self) -> Any:
         """Return the instance of the driver that is using the connection."""
         if self._driver is None:
+            if self._released:
+                raise Exception("driver. Connection %s was released" % self.connectionName())
             self._driver = self._driver_sql.driver()
 
         self.update_activity_time()
@@ -587,7 +595,10 @@ class PNConnection(QtCore.QObject, iconnection.IConnection):
     def commit(self) -> bool:
         """Send the commit order to the database."""
 
-        return self.driver().commitTransaction()
+        result = self.driver().commitTransaction()
+        pnsizecache.SIZE_CACHE.transaction_end(self)
+        self._clear_select_memo()
+        return result
 
     def canOverPartition(self) -> bool:
         """Return True if the database supports the OVER statement."""
@@ -612,7 +623,10 @@ class PNConnection(QtCore.QObject, iconnection.IConnection):
     def rollbackSavePoint(self, save_point: int) -> bool:
         """Roll back a save point."""
 
-        return self.driver().rollbackSavePoint(save_point)
+        result = self.driver().rollbackSavePoint(save_point)
+        pnsizecache.SIZE_CACHE.transaction_end(self, False)
+        self._clear_select_memo()
+        return result
 
     def transaction(self) -> bool:
         """Create a transaction."""
@@ -622,12 +636,18 @@ class PNConnection(QtCore.QObject, iconnection.IConnection):
     def commitTransaction(self) -> bool:
         """Release a transaction."""
 
-        return self.driver().commitTransaction()
+        result = self.driver().commitTransaction()
+        pnsizecache.SIZE_CACHE.transaction_end(self)
+        self._clear_select_memo()
+        return result
 
     def rollbackTransaction(self) -> bool:
         """Roll back a transaction."""
 
-        return self.driver().rollbackTransaction()
+        result = self.driver().rollbackTransaction()
+        pnsizecache.SIZE_CACHE.transaction_end(self)
+        self._clear_select_memo()
+        return result
 
     def nextSerialVal(self, table: str, field: str) -> Any:
         """Indicate next available value of a serial type field."""
@@ -694,7 +714,77 @@ class PNConnection(QtCore.QObject, iconnection.IConnection):
     def execute_query(self, qry, cursor: Any = None) -> Any:
         """Execute a query in a database cursor."""
 
-        return self.driver().execute_query(qry, cursor)
+        start = pnsqlstats.SQL_STATS.start()
+        result = self.driver().execute_query(qry, cursor)
+        if start:
+            pnsqlstats.SQL_STATS.record(self, qry, start, getattr(result, "rowcount", None))
+        pnsizecache.SIZE_CACHE.invalidate_sql(qry, self)
+        if self._select_memo and qry.lstrip()[:6].lower() != "select":
+            self._clear_select_memo()
+        return result
+
+    def insertBulk(
+        self,
+        table_name: str,
+        fields: List[str],
+        rows: List[List[str]],
+        chunk_size: Optional[int] = None,
+    ) -> bool:
+        """Insert several rows with formatted values into a table."""
+
+        start = pnsqlstats.SQL_STATS.start()
+        result = self.driver().insertBulk(table_name, fields, rows, chunk_size)
+        if start:
+            pnsqlstats.SQL_STATS.record(
+                self, "INSERT INTO %s (%s) BULK" % (table_name, ", ".join(fields)), start, len(rows)
+            )
+        pnsizecache.SIZE_CACHE.invalidate(table_name, self)
+        self._clear_select_memo()
+        return result
+
+    def execute_params(
+        self, qry: str, params: Union[Sequence[Any], Dict[str, Any]], cursor: Any = None
+    ) -> Any:
+        """Execute a query with bound parameters in a database cursor."""
+
+        start = pnsqlstats.SQL_STATS.start()
+        result = self.driver().execute_params(qry, params, cursor)
+        if start:
+            pnsqlstats.SQL_STATS.record(self, qry, start, getattr(result, "rowcount", None))
+        pnsizecache.SIZE_CACHE.invalidate_sql(qry, self)
+        if self._select_memo and qry.lstrip()[:6].lower() != "select":
+            self._clear_select_memo()
+        return result
+
+    def prepared_stats(self) -> Dict[str, int]:
+        """Return the prepared statements cache counters."""
+
+        return self.driver().prepared_stats()
+
+    def sql_stats(self, order_by: str = "total_ms", limit: int = 0) -> List[Dict[str, Any]]:
+        """Return the timing statistics of the statements launched by this connection."""
+
+        return pnsqlstats.SQL_STATS.summary(self.connectionName(), order_by, limit)
+
+    def setSelectMemo(self, enabled: bool = True) -> None:
+        """
+        Remember the results of sqlSelect inside the transactions of this connection.
+
+        The results are forgotten when the transaction ends or something is modified.
+        """
+
+        self._select_memo = {} if enabled else None
+
+    def selectMemo(self) -> Optional[Dict[str, Any]]:
+        """Return the sqlSelect results of the current transaction, or None if not used."""
+
+        return self._select_memo if self._transaction > 0 else None
+
+    def _clear_select_memo(self) -> None:
+        """Forget the sqlSelect results."""
+
+        if self._select_memo:
+            self._select_memo = {}
 
     def alterTable(
         self,
@@ -725,7 +815,8 @@ class PNConnection(QtCore.QObject, iconnection.IConnection):
 
     def update_activity_time(self):
         """Update activity time."""
-        self._last_activity_time = time.time()
+        with self._activity_lock:
+            self._last_activity_time = time.time()
 
     def getTimeStamp(self) -> str:
         """Return timestamp."""
@@ -4,9 +4,11 @@ from PyQt5 import QtCore
 from pineboolib.core.utils import logging
 from pineboolib import application
 from pineboolib.interfaces import iconnection
-from . import pnconnection
+from . import pnconnection, pnconnectionpool, pnsizecache
 
-from typing import Dict, Union, TYPE_CHECKING
+import threading
+
+from typing import Dict, Optional, Union, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pineboolib.fllegacy import flmanager
@@ -23,16 +25,26 @@ class PNConnectionManager(QtCore.QObject):
     connections_dict: Dict[str, "pnconnection.PNConnection"] = {}
     limit_connections: int = 10  # Limit of connections to use.
     connections_time_out: int = 0  # Seconds to wait to eliminate the inactive connections.
+    connections_wait_time: int = 10  # Seconds to wait for a free connection when limit is reached.
+    _pool: "pnconnectionpool.PNConnectionPool"
+    _sessions: Dict[str, Dict[str, "pnconnection.PNConnection"]]
+    _reaper: Optional[threading.Thread]
 
     def __init__(self):
         """Initialize."""
 
         super().__init__()
         self.connections_dict = {}
+        self._sessions = {}
+        self._pool = pnconnectionpool.PNConnectionPool()
+        self._lock = threading.RLock()
+        self._reaper = None
+        self._reaper_stop = threading.Event()
 
         LOGGER.info("Initializing PNConnection Manager:")
         LOGGER.info("LIMIT CONNECTIONS = %s.", self.limit_connections)
         LOGGER.info("CONNECTIONS TIME OUT = %s. (0 disabled)", self.connections_time_out)
+        LOGGER.info("CONNECTIONS WAIT TIME = %s.", self.connections_wait_time)
 
     def setMainConn(self, main_conn: "pnconnection.PNConnection") -> bool:
         """Set main connection."""
@@ -71,6 +83,9 @@ class PNConnectionManager(QtCore.QObject):
     def finish(self) -> None:
         """Set the connection as terminated."""
 
+        self._reaper_stop.set()
+        self._pool.clear()
+        pnsizecache.SIZE_CACHE.clear()
         for key in list(self.connections_dict.keys()):
             if self.connections_dict[key] is None:
                 continue
@@ -82,6 +97,7 @@ class PNConnectionManager(QtCore.QObject):
             del self.connections_dict[key]
 
         self.connections_dict = {}
+        self._sessions = {}
         del self._manager
         del self._manager_modules
         del self
@@ -100,57 +116,67 @@ class PNConnectionManager(QtCore.QObject):
         else:
             name = name_or_conn
 
-        name_conn_: str = "%s|%s" % (application.PROJECT.session_id(), name)
-        # if name in ("default", None):
-        #    return self
-        self.check_alive_connections()
-
-        if name_conn_ in self.connections_dict.keys():
-            connection_ = self.connections_dict[name_conn_]
-        else:
-            if len(self.connections_dict.keys()) > self.limit_connections:
-                raise Exception("Connections limit reached!")
-            # if self._driver_sql is None:
-            #    raise Exception("No driver selected")
-
-            main_conn = self.mainConn()
-            if main_conn is None:
-                raise Exception("main_conn is empty!!")
-            connection_ = pnconnection.PNConnection(main_conn._db_name)
+        session_id = application.PROJECT.session_id()
+        session_ = self._sessions.get(session_id)
+        connection_ = session_.get(name) if session_ is not None else None
+        if connection_ is not None:
+            with connection_._activity_lock:  # El reaper no la libera mientras la tomamos.
+                if session_ is self._sessions.get(session_id) and session_.get(name) is connection_:
+                    if connection_._is_open or connection_.conn is None:
+                        connection_.update_activity_time()
+                        return connection_
+
+                    self.removeConn("%s|%s" % (session_id, name))  # Conexión cerrada.
+
+        main_conn = self.mainConn()
+        if main_conn is None:
+            raise Exception("main_conn is empty!!")
+
+        if name in ["default", "dbAux"]:  # Se toman del pool de conexiones abiertas.
+            connection_ = self._pool.lease(
+                self._pool.key(main_conn),
+                lambda: self._open_connection(name),
+                self.limit_connections,
+                self.connections_wait_time,
+            )
             connection_._name = name
+        else:
+            connection_ = self._open_connection(name)
+
+        if connection_.conn is None:
+            LOGGER.warning("Connection %s is closed!", name)
 
-            if name in ["default", "dbAux"]:  # Las abrimos automáticamene!
-                if connection_._driver_name and connection_._driver_sql.loadDriver(
-                    connection_._driver_name
-                ):
-                    connection_.conn = connection_.conectar(
-                        connection_._db_name,
-                        connection_._db_host,
-                        connection_._db_port,
-                        connection_._db_user_name,
-                        connection_._db_password,
-                    )
-                    connection_._is_open = True
+        with self._lock:
+            self.connections_dict["%s|%s" % (session_id, name)] = connection_
+            self._sessions.setdefault(session_id, {})[name] = connection_
 
-            if connection_.conn is None:
-                LOGGER.warning("Connection %s is closed!", name)
+        return connection_
 
-            self.connections_dict[name_conn_] = connection_
+    def _open_connection(self, name: str) -> "pnconnection.PNConnection":
+        """Create a new connection like main_conn."""
+
+        connection_ = pnconnection.PNConnection(self.mainConn()._db_name)
+        connection_._name = name
+
+        if name in ["default", "dbAux"]:  # Las abrimos automáticamene!
+            if connection_._driver_name and connection_._driver_sql.loadDriver(
+                connection_._driver_name
+            ):
+                connection_.conn = connection_.conectar(
+                    connection_._db_name,
+                    connection_._db_host,
+                    connection_._db_port,
+                    connection_._db_user_name,
+                    connection_._db_password,
+                )
+                connection_._is_open = True
 
         return connection_
 
     def dictDatabases(self) -> Dict[str, "pnconnection.PNConnection"]:
         """Return dict with own database connections."""
 
-        dict_ = {}
-        session_name = application.PROJECT.session_id()
-        for key in self.connections_dict.keys():
-            if key.find("|") > -1:
-                connection_data = key.split("|")
-                if connection_data[0] == session_name:
-                    dict_[connection_data[1]] = self.connections_dict[key]
-
-        return dict_
+        return dict(self._sessions.get(application.PROJECT.session_id(), {}))
 
     def removeConn(self, name="default") -> bool:
         """Delete a connection specified by name."""
@@ -158,17 +184,67 @@ class PNConnectionManager(QtCore.QObject):
         if name.find("|") == -1:
             name_conn_ = "%s|%s" % (application.PROJECT.session_id(), name)
 
-        if name_conn_ in self.connections_dict.keys():
-            self.connections_dict[name_conn_]._is_open = False
-            if self.connections_dict[name_conn_].conn not in [None, self.mainConn().conn]:
-                self.connections_dict[name_conn_].close()
+        with self._lock:
+            connection_ = self.connections_dict.pop(name_conn_, None)
+            if connection_ is not None:
+                session_id, _, conn_name = name_conn_.partition("|")
+                session_ = self._sessions.get(session_id)
+                if session_ is not None:
+                    session_.pop(conn_name, None)
+                    if not session_:
+                        del self._sessions[session_id]
+
+        if connection_ is not None:
+            if self._pool.isLeased(connection_):
+                self._pool.release(connection_)
+            else:
+                connection_._is_open = False
+                if connection_.conn not in [None, self.mainConn().conn]:
+                    connection_.close()
 
-            del self.connections_dict[name_conn_]
             return True
         else:
             LOGGER.warning("An attempt was made to delete an invalid connection named %s" % name)
             return False
 
+    def removeSession(self, session_id: Optional[str] = None) -> None:
+        """Remove the connections of a session. The opened ones are kept to be reused."""
+
+        if session_id is None:
+            session_id = application.PROJECT.session_id()
+
+        for conn_name in list(self._sessions.get(session_id, {}).keys()):
+            self.removeConn("%s|%s" % (session_id, conn_name))
+
+    def leaseConn(self, name: str, timeout: float = 0) -> "pnconnection.PNConnection":
+        """
+        Return an opened connection of the pool that does not belong to any session.
+
+        It can be used from other thread (one thread at a time) and must be given back with
+        releaseConn.
+        @param name. Name of the connection.
+        @param timeout. Seconds to wait when the limit of connections is reached.
+        """
+
+        connection_ = self._pool.lease(
+            self._pool.key(self.mainConn()),
+            lambda: self._open_connection("dbAux"),
+            self.limit_connections,
+            timeout,
+        )
+        connection_._name = name
+        return connection_
+
+    def releaseConn(self, connection_: "pnconnection.PNConnection") -> None:
+        """Give back to the pool a connection of leaseConn."""
+
+        self._pool.release(connection_)
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Return the counters of the pool of connections."""
+
+        return self._pool.stats()
+
     def manager(self) -> "flmanager.FLManager":
         """
         Flmanager instance that manages the connection.
@@ -215,17 +291,48 @@ class PNConnectionManager(QtCore.QObject):
     def check_alive_connections(self):
         """Check alive connections."""
 
-        for conn_name in list(self.connections_dict.keys()):
-            if conn_name.find("|") > -1:
-                if (
-                    not self.connections_dict[conn_name]._is_open  # Closed connections
-                    and self.connections_dict[conn_name].conn
-                    is not None  # Only initialized connections.
-                ) or (
-                    self.connections_time_out
-                    and self.connections_dict[conn_name].idle_time() > self.connections_time_out
-                ):
-                    self.removeConn(conn_name)
+        for session_id, session_ in list(self._sessions.items()):
+            for conn_name, connection_ in list(session_.items()):
+                # The activity check and the release are done under the connection lock, so the
+                # owner thread can not take it again meanwhile.
+                with connection_._activity_lock:
+                    if self._sessions.get(session_id, {}).get(conn_name) is not connection_:
+                        continue  # Ya eliminada.
+
+                    if (
+                        not connection_._is_open  # Closed connections
+                        and connection_.conn is not None  # Only initialized connections.
+                    ) or (
+                        self.connections_time_out
+                        and connection_.idle_time() > self.connections_time_out
+                    ):
+                        self.removeConn("%s|%s" % (session_id, conn_name))
+
+    def _start_reaper(self) -> None:
+        """Launch the thread that removes the inactive connections periodically."""
+
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+
+        self._reaper_stop = threading.Event()
+        self._reaper = threading.Thread(
+            target=self._reap_connections,
+            args=(self._reaper_stop,),
+            name="pnconnection_reaper",
+            daemon=True,
+        )
+        self._reaper.start()
+
+    def _reap_connections(self, stop: threading.Event) -> None:
+        """Remove the inactive connections until the manager is finished."""
+
+        while not stop.wait(max(1, min(60, self.connections_time_out / 2))):
+            if not self.connections_time_out:
+                continue
+            try:
+                self.check_alive_connections()
+            except Exception:
+                LOGGER.warning("Error checking alive connections", exc_info=True)
 
     def set_max_connections_limit(self, limit: int) -> None:
         """Set maximum connections limit."""
@@ -236,6 +343,13 @@ class PNConnectionManager(QtCore.QObject):
         """Set maximum connections time idle."""
         LOGGER.info("New max connections idle time %s.", limit)
         self.connections_time_out = limit  # noqa: F841
+        if limit:
+            self._start_reaper()
+
+    def set_max_wait_time(self, seconds: int) -> None:
+        """Set seconds to wait for a free connection when the limit is reached."""
+        LOGGER.info("New max connections wait time %s.", seconds)
+        self.connections_wait_time = seconds  # noqa: F841
 
     def __getattr__(self, name):
         """Return attributer from main_conn pnconnection."""
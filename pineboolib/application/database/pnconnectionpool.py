@@ -0,0 +1,262 @@
+"""
+PNConnectionPool module.
+
+Keep the driver connections opened for the sessions, so that other sessions can reuse them.
+"""
+
+from pineboolib.core.utils import logging
+
+import threading
+import time
+
+from typing import Any, Callable, Dict, List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from . import pnconnection  # noqa: F401
+
+LOGGER = logging.getLogger(__name__)
+
+
+class PNConnectionPool(object):
+    """
+    PNConnectionPool class.
+
+    Connections are grouped by (driver, host, port, database, user). A session leases a
+    connection and releases it when it is removed from the manager; opened transactions are
+    rolled back and the driver connection is kept, wrapped in a new PNConnection, for the next
+    session. The released PNConnection is invalidated, so cursors still holding it fail instead
+    of sharing the driver connection with other session. When every connection of a group is in
+    use, lease waits for a released one until the timeout expires.
+    """
+
+    check_time: int = 30  # Seconds idle before checking a connection again.
+
+    _idle: Dict[Tuple, List["pnconnection.PNConnection"]]
+    _in_use: Dict[Tuple, int]
+    _leased: Dict[int, Tuple]
+
+    def __init__(self) -> None:
+        """Inicialize."""
+
+        self._cond = threading.Condition()
+        self._idle = {}
+        self._in_use = {}
+        self._leased = {}
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+        self.discarded = 0
+        self.waits = 0
+        self.timeouts = 0
+
+    def key(self, conn: "pnconnection.PNConnection") -> Tuple:
+        """Return the group of a connection."""
+
+        return (
+            conn._driver_name,
+            conn._db_host,
+            conn._db_port,
+            conn._db_name,
+            conn._db_user_name,
+        )
+
+    def lease(
+        self,
+        key: Tuple,
+        factory: Callable[[], "pnconnection.PNConnection"],
+        max_size: int = 0,
+        timeout: float = 0,
+    ) -> "pnconnection.PNConnection":
+        """
+        Return a connection of a group, reusing an idle one when possible.
+
+        @param key. group of the connection.
+        @param factory. function that opens a new connection.
+        @param max_size. connections of the group that can be in use. 0 is unlimited.
+        @param timeout. seconds to wait for a released connection.
+        """
+
+        deadline = None
+        while True:
+            conn = None
+            with self._cond:
+                idle = self._idle.get(key)
+                if idle:
+                    conn = idle.pop()
+                elif max_size and self._in_use.get(key, 0) >= max_size:
+                    if deadline is None:
+                        deadline = time.time() + timeout
+                        self.waits += 1
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise Exception(
+                            "Connections limit reached! (%s in use, %s seconds waiting)"
+                            % (self._in_use.get(key, 0), timeout)
+                        )
+                    self._cond.wait(remaining)
+                    continue
+
+                self._in_use[key] = self._in_use.get(key, 0) + 1
+
+            if conn is None:
+                try:
+                    conn = factory()
+                except Exception:
+                    self._free_slot(key)
+                    raise
+
+                self.created += 1
+                break
+
+            if self._alive(conn):
+                self.reused += 1
+                break
+
+            self._free_slot(key)
+            self.discarded += 1
+            self._close(conn)
+
+        with self._cond:
+            self._leased[id(conn)] = key
+
+        return conn
+
+    def isLeased(self, conn: Any) -> bool:
+        """Return if a connection was leased from the pool."""
+
+        return id(conn) in self._leased
+
+    def release(self, conn: "pnconnection.PNConnection") -> None:
+        """Return a leased connection to the pool."""
+
+        with self._cond:
+            key = self._leased.pop(id(conn), None)
+        if key is None:
+            return
+
+        reusable = conn._is_open and conn.conn is not None and self._reset(conn)
+        if reusable:
+            conn = self._rewrap(conn)
+        with self._cond:
+            if reusable:
+                self._idle.setdefault(key, []).append(conn)
+                self.released += 1
+            else:
+                self.discarded += 1
+            self._in_use[key] -= 1
+            self._cond.notify()
+
+        if not reusable:
+            self._close(conn)
+
+    def stats(self) -> Dict[str, int]:
+        """Return the pool counters."""
+
+        with self._cond:
+            return {
+                "created": self.created,
+                "reused": self.reused,
+                "released": self.released,
+                "discarded": self.discarded,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "idle": sum(len(idle) for idle in self._idle.values()),
+                "in_use": sum(self._in_use.values()),
+            }
+
+    def clear(self) -> None:
+        """Close the idle connections."""
+
+        with self._cond:
+            idle_list = [conn for idle in self._idle.values() for conn in idle]
+            self._idle = {}
+
+        for conn in idle_list:
+            self._close(conn)
+
+    def _free_slot(self, key: Tuple) -> None:
+        """Forget a connection in use of a group."""
+
+        with self._cond:
+            self._in_use[key] -= 1
+            self._cond.notify()
+
+    def _reset(self, conn: "pnconnection.PNConnection") -> bool:
+        """Roll back the opened transactions and reset the session of the driver connection."""
+
+        try:
+            if conn._transaction > 0:
+                LOGGER.warning(
+                    "Connection %s released with %s opened transactions. Rolling back",
+                    conn.connectionName(),
+                    conn._transaction,
+                )
+                conn.rollbackTransaction()
+                conn._transaction = 0
+            conn.driver().reset_session()
+        except Exception:
+            LOGGER.warning("Connection %s can not be reset", conn.connectionName(), exc_info=True)
+            return False
+
+        return True
+
+    def _rewrap(self, conn: "pnconnection.PNConnection") -> "pnconnection.PNConnection":
+        """Move the driver connection to a new PNConnection and driver. Close the released ones."""
+
+        from . import pnconnection
+
+        with conn._activity_lock:
+            driver = type(conn._driver)()
+            driver.take_over(conn._driver)
+            new_conn = pnconnection.PNConnection(
+                conn._db_name,
+                conn._db_host,
+                conn._db_port,
+                conn._db_user_name,
+                conn._db_password,
+                driver.alias_,
+            )
+            new_conn._name = conn._name
+            new_conn._driver = driver
+            new_conn.conn = conn.conn
+            new_conn._is_open = True
+            driver.db_ = new_conn
+
+            conn._released = True
+            conn._is_open = False
+            conn._driver = None
+            conn.conn = None
+
+        return new_conn
+
+    def _alive(self, conn: "pnconnection.PNConnection") -> bool:
+        """Return if an idle connection still works."""
+
+        if not conn._is_open or conn.conn is None:
+            return False
+
+        if conn.idle_time() < self.check_time:
+            return True
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+            cursor.close()
+        except Exception:
+            LOGGER.warning("Pooled connection lost: %s", conn.connectionName(), exc_info=True)
+            return False
+
+        conn.update_activity_time()
+        return True
+
+    def _close(self, conn: "pnconnection.PNConnection") -> None:
+        """Close a connection that is not reused. Connections sharing main_conn are kept."""
+
+        conn._is_open = False
+        try:
+            if conn.conn is not None and conn.conn is not conn.connManager().mainConn().conn:
+                conn.close()
+        except Exception:
+            LOGGER.warning("Error closing connection %s", conn.connectionName(), exc_info=True)
@@ -0,0 +1,292 @@
+"""
+PNCounters module.
+
+Allocate the values of the counter fields (nextCounter) using the flseqs table.
+"""
+
+from pineboolib.core import settings
+from pineboolib.core.utils import logging
+
+import threading
+
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pineboolib.interfaces import iconnection  # noqa: F401
+
+LOGGER = logging.getLogger(__name__)
+
+
+class PNCounters(object):
+    """
+    PNCounters class.
+
+    Each counter (table, field, series) keeps in flseqs the highest number known to be used.
+    The row is seeded once from MAX() and the next number is checked against the table by
+    its value, so asking for a counter does not depend on the size of the table.
+
+    By default the counter is only advanced when a number is found in the table, so numbers
+    that are asked for but not saved are offered again, like the classic nextCounter.
+    With ebcomportamiento/counter_reserve the numbers are handed out atomically, reserving
+    ebcomportamiento/counter_block numbers each time (numbers not used are lost).
+
+    flseqs is read and written through dbAux, out of the transaction of the caller, like a
+    sequence: its rows are not locked until the caller commits and a rollback does not undo
+    a reserved block.
+    """
+
+    _blocks: Dict[str, List[int]]
+
+    def __init__(self) -> None:
+        """Inicialize."""
+
+        self._lock = threading.RLock()
+        self._blocks = {}
+        self.load_settings()
+
+    def load_settings(self) -> None:
+        """Read the configuration."""
+
+        self.enabled = settings.config.value("ebcomportamiento/counter_seqs", True) in (
+            True,
+            "true",
+        )
+        self.reserve = settings.config.value("ebcomportamiento/counter_reserve", False) in (
+            True,
+            "true",
+        )
+        self.block_size = max(1, int(settings.config.value("ebcomportamiento/counter_block", 1)))
+
+    def key(self, table: str, field: str, serie: str = "") -> str:
+        """Return the flseqs.tabla value of a counter."""
+
+        # flseqs.tabla es la clave primaria, así que el contador completo va en ese campo.
+        return "%s:%s:%s" % (table, field, serie)
+
+    def next_value(
+        self,
+        conn: "iconnection.IConnection",
+        table: str,
+        field: str,
+        length: int,
+        serie: str = "",
+        where: Optional[str] = None,
+    ) -> Optional[int]:
+        """
+        Return the next number of a counter.
+
+        @param conn. Connection of the table.
+        @param table. Table name.
+        @param field. Counter field name.
+        @param length. Digits of the number, without the series.
+        @param serie. Prefix of the values.
+        @param where. Filter of the values of the counter, used to seed it.
+        @return number or None if it can not be allocated.
+        """
+
+        if where is None:
+            where = "LENGTH(%s)=%d" % (field, length + len(serie))
+
+        max_range = 10 ** length
+        key = self.key(table, field, serie)
+        block_key = "%s:%s" % (conn.DBName(), key)
+        seqs = conn.connManager().dbAux()
+
+        with self._lock:
+            for retry in range(20):
+                if self.reserve:
+                    number = self._reserve(conn, seqs, key, block_key, table, field, serie, where)
+                else:
+                    number = self._peek(conn, seqs, key, table, field, length, serie, where)
+
+                if number is None:
+                    return None
+
+                if number >= max_range:
+                    LOGGER.warning("El contador %s ha alcanzado su valor máximo", key)
+                    return None
+
+                if not self._exists(conn, table, field, self._value(number, length, serie)):
+                    return number
+
+                if self.reserve:
+                    self._blocks.pop(block_key, None)
+                    if retry:
+                        self._advance(seqs, key, self._seed(conn, table, field, serie, where))
+                else:
+                    # Se ha usado fuera de nextCounter. Tras varios saltos se resiembra.
+                    self._advance(
+                        seqs,
+                        key,
+                        self._seed(conn, table, field, serie, where) if retry > 2 else number,
+                    )
+
+        LOGGER.warning("No se ha podido obtener el siguiente valor del contador %s", key)
+        return None
+
+    def reset(self) -> None:
+        """Forget the reserved blocks."""
+
+        with self._lock:
+            self._blocks = {}
+
+    def _peek(
+        self,
+        conn: "iconnection.IConnection",
+        seqs: "iconnection.IConnection",
+        key: str,
+        table: str,
+        field: str,
+        length: int,
+        serie: str,
+        where: str,
+    ) -> Optional[int]:
+        """Return the number after the last used, without reserving it."""
+
+        current = self._current(conn, seqs, key, table, field, serie, where)
+        if current and not self._exists(conn, table, field, self._value(current, length, serie)):
+            # El último número ya no está (se ha borrado). Se vuelve a ofrecer, como MAX + 1.
+            seed = self._seed(conn, table, field, serie, where)
+            if seed is None:
+                return None
+
+            seqs.execute_query("UPDATE flseqs SET seq = %d WHERE tabla = '%s'" % (seed, key))
+            current = seed
+
+        return None if current is None else current + 1
+
+    def _reserve(
+        self,
+        conn: "iconnection.IConnection",
+        seqs: "iconnection.IConnection",
+        key: str,
+        block_key: str,
+        table: str,
+        field: str,
+        serie: str,
+        where: str,
+    ) -> Optional[int]:
+        """Return a number from the reserved block, reserving a new block if needed."""
+
+        block = self._blocks.get(block_key)
+        if block is None or block[0] > block[1]:
+            block = None
+            for attempt in range(20):
+                current = self._current(conn, seqs, key, table, field, serie, where)
+                if current is None:
+                    return None
+
+                cursor = seqs.execute_query(
+                    "UPDATE flseqs SET seq = %d WHERE tabla = '%s' AND seq = %d"
+                    % (current + self.block_size, key, current)
+                )
+                if not seqs.lastError() and getattr(cursor, "rowcount", 0) == 1:
+                    block = [current + 1, current + self.block_size]
+                    break
+
+            if block is None:
+                return None
+
+            self._blocks[block_key] = block
+
+        number = block[0]
+        block[0] += 1
+        return number
+
+    def _current(
+        self,
+        conn: "iconnection.IConnection",
+        seqs: "iconnection.IConnection",
+        key: str,
+        table: str,
+        field: str,
+        serie: str,
+        where: str,
+    ) -> Optional[int]:
+        """Return the last number used of a counter, creating the flseqs row if needed."""
+
+        for attempt in range(2):
+            cursor = seqs.execute_query("SELECT seq FROM flseqs WHERE tabla = '%s'" % key)
+            if seqs.lastError():
+                return None
+
+            row = cursor.fetchone()
+            if row is not None:
+                return int(row[0] or 0)
+
+            seed = self._seed(conn, table, field, serie, where)
+            if seed is None:
+                return None
+
+            # Si otro proceso lo ha creado a la vez, falla y se lee en la siguiente vuelta.
+            seqs.execute_query(
+                "INSERT INTO flseqs (tabla, campo, seq) VALUES ('%s', '%s', %d)"
+                % (key, field, seed)
+            )
+
+        return None
+
+    def _advance(self, seqs: "iconnection.IConnection", key: str, number: Optional[int]) -> None:
+        """Set the last number used of a counter, if it is greater than the stored one."""
+
+        if number is not None:
+            seqs.execute_query(
+                "UPDATE flseqs SET seq = %d WHERE tabla = '%s' AND seq < %d" % (number, key, number)
+            )
+
+    def _seed(
+        self, conn: "iconnection.IConnection", table: str, field: str, serie: str, where: str
+    ) -> Optional[int]:
+        """Return the greatest number used in the table."""
+
+        cursor = conn.execute_query("SELECT MAX(%s) FROM %s WHERE %s" % (field, table, where))
+        if conn.lastError():
+            return None
+
+        row = cursor.fetchone()
+        value = row[0] if row else None
+        if value is None:
+            return 0
+
+        try:
+            return int(str(value)[len(serie) :])
+        except ValueError:
+            pass
+
+        # Hay valores no numéricos por encima. Se recorren una sola vez, al sembrar.
+        cursor = conn.execute_query(
+            "SELECT %s FROM %s WHERE %s ORDER BY %s DESC" % (field, table, where, field)
+        )
+        if conn.lastError():
+            return None
+
+        while True:
+            rows = cursor.fetchmany(100)
+            if not rows:
+                return 0
+
+            for row in rows:
+                try:
+                    return int(str(row[0])[len(serie) :])
+                except ValueError:
+                    continue
+
+    def _value(self, number: int, length: int, serie: str) -> str:
+        """Return the value of a number of a counter."""
+
+        return "%s%s" % (serie, str(number).rjust(length, "0"))
+
+    def _exists(self, conn: "iconnection.IConnection", table: str, field: str, value: str) -> bool:
+        """Return if a value of the counter is already used."""
+
+        cursor = conn.execute_query(
+            "SELECT 1 FROM %s WHERE %s = %s"
+            % (table, field, conn.connManager().manager().formatValue("string", value))
+        )
+        if conn.lastError():
+            return False
+
+        return cursor.fetchone() is not None
+
+
+COUNTERS = PNCounters()
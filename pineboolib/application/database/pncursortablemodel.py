@@ -7,13 +7,18 @@ Defines PNCursorTableModel class.
 from PyQt5 import QtCore, QtGui, Qt, QtWidgets
 
 from pineboolib.core.utils import logging, utils_base
+from pineboolib.core import settings
 
 
 from pineboolib.application.utils import date_conversion, xpm
 
+from . import pnsizecache, pnsqlstats
+
 import itertools
 import locale
 import os
+import sys
+import threading
 import datetime
 
 
@@ -62,13 +67,26 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
 
     _data: List[List[Any]]
     _vdata: List[Optional[List[Any]]]
+    _declared_rows: int
+    _inserted_rows: List[List[Any]]
+    _last_inserted_row: Optional[List[Any]]
+    _pk_pos: Optional[int]
+    _pk_prefetch: bool
+    _pk_index_complete: bool
+    _estimated_count: bool
+    _exact_count: bool
+    _size_cached: bool
+    _lazy_count: bool
+    _lazy_more: bool
+    _lazy_pending: bool
+    _lazy_generation: int
 
     sql_fields: List[str]
     sql_fields_omited: List[str]
     sql_fields_without_check: List[str]
     pkpos: List[int]
     ckpos: List[int]
-    pkidx: Dict[Tuple, int]
+    pkidx: Dict[Tuple, int]  # (pk value,) -> row
     ckidx: Dict[Tuple, int]
     _column_hints: List[int]
     _cursor_db: "iapicursor.IApiCursor"
@@ -78,6 +96,8 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
     _order: str
     grid_row_tmp: Dict[int, List[Any]]
 
+    _lazy_count_ready = QtCore.pyqtSignal(int, int)
+
     def __init__(self, conn: "iconnection.IConnection", parent: "isqlcursor.ISqlCursor") -> None:
         """
         Constructor.
@@ -98,6 +118,22 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
         self.rows = 0
         self.cols = 0
         self._metadata = None
+        # Filas insertadas desde el último refresh, se sirven a continuación de las del cursor declarado.
+        self._declared_rows = 0
+        self._inserted_rows = []
+        self._last_inserted_row = None
+        self._pk_pos = None
+        self._pk_prefetch = False
+        self._pk_index_complete = False
+        self._estimated_count = False
+        self._exact_count = False
+        self._size_cached = False
+        # Modo lazy count: filas cargadas por bloques y COUNT en segundo plano.
+        self._lazy_count = False
+        self._lazy_more = False
+        self._lazy_pending = False
+        self._lazy_generation = 0
+        self._lazy_count_ready.connect(self._set_lazy_size)
 
         if not metadata:
             return
@@ -133,6 +169,7 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
         # Como valor del IDX tenemos la posicion de la fila.
         # Si se hace alguna operación en _data como borrar filas intermedias hay
         # que invalidar los indices. Opcionalmente, regenerarlos.
+        # pkidx se va rellenando según se leen filas del cursor (ver _get_row).
         self.pkpos = []
         self.ckpos = []
         self.pkidx = {}
@@ -183,6 +220,51 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
         else:
             self._tablename = self.metadata().name()
 
+    def set_pk_prefetch(self, enable: bool) -> None:
+        """
+        Enable or disable the primary key prefetch mode.
+
+        When enabled, the first findPKRow miss loads the primary key column of the whole
+        result set in a single query, so next lookups are resolved from the index.
+        The rows are sorted using the primary key as last criterion to keep both queries
+        in the same order.
+        @param enable. True or False
+        """
+        self._pk_prefetch = enable
+
+    def set_estimated_count(self, enable: bool) -> None:
+        """
+        Enable or disable the estimated count mode.
+
+        When enabled, size() uses the planner estimation of the database (if the driver
+        supports it) for tables bigger than ebcomportamiento/estimated_count_min_rows rows.
+        The grid can show a few blank or missing rows at the end, use it only on huge tables.
+        @param enable. True or False
+        """
+        self._estimated_count = enable
+
+    def set_lazy_count(self, enable: bool) -> None:
+        """
+        Enable or disable the lazy count mode.
+
+        When enabled (or when the table metadata has the lazyCount flag), refresh() does not
+        wait for the COUNT query. The cursor is declared at once, the rows are offered in blocks
+        of ebcomportamiento/lazy_count_block rows through canFetchMore/fetchMore and the exact
+        count is computed in background, updating the row count when it completes.
+        @param enable. True or False
+        """
+        self._lazy_count = enable
+
+    def lazy_count(self) -> bool:
+        """Return if the lazy count mode is enabled."""
+
+        return self._lazy_count or self.metadata().lazyCount()
+
+    def lazy_count_pending(self) -> bool:
+        """Return if the exact count of the last refresh is not known yet."""
+
+        return self._lazy_pending
+
     def disable_refresh(self, disable: bool) -> None:
         """
         Disable refresh.
@@ -287,10 +369,11 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
             result: Any = None
             if row not in self.grid_row_tmp.keys():
                 self.grid_row_tmp = {}
-                self.grid_row_tmp[row] = self.driver_sql().getRow(
-                    row, self._curname, self.cursorDB()
-                )
+                self.grid_row_tmp[row] = self._get_row(row)
                 if not self.grid_row_tmp[row]:  # refresh grid if cursor is deleted.
+                    # El tamaño cacheado o estimado puede ser mayor que el real.
+                    pnsizecache.SIZE_CACHE.invalidate(self._tablename)
+                    self._exact_count = True
                     self.refresh()
                     return
 
@@ -655,6 +738,16 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
                 self.where_filter = self.where_filter.replace(";", " ORDER BY %s;" % self._order)
             else:
                 self.where_filter = "%s ORDER BY %s" % (self.where_filter, self._order)
+
+        if self._pk_prefetch and not self.metadata().isQuery():
+            where_, order_ = self.where_filter.replace(";", ""), ""
+            if where_.find("ORDER BY") > -1:
+                order_ = where_[where_.find("ORDER BY") + 8 :]
+                where_ = where_[: where_.find("ORDER BY")]
+            order_list = [order.strip() for order in order_.split(",") if order.strip()]
+            if self.pK() not in [order.split(" ")[0] for order in order_list]:
+                order_list.append(self.pK())
+            self.where_filter = "%s ORDER BY %s" % (where_.strip(), ", ".join(order_list))
         """ FIN """
 
         parent = QtCore.QModelIndex()
@@ -667,11 +760,22 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
         self.rows = 0
         self._rows_loaded = 0
         self._fetched_rows = 0
+        self._declared_rows = 0
+        self._lazy_more = False
+        self._lazy_pending = False
+        self._lazy_generation += 1
+        self._inserted_rows = []
+        self._last_inserted_row = None
+        self.pkidx = {}
+        self._pk_index_complete = False
         self.sql_fields = []
         self.sql_fields_without_check = []
 
         self._refresh_field_info()
 
+        row_fields = self.sql_fields_without_check or self.sql_fields
+        self._pk_pos = row_fields.index(self.pK()) if self.pK() in row_fields else None
+
         if self.sql_fields_without_check:
             self.sql_str = ", ".join(self.sql_fields_without_check)
         else:
@@ -685,10 +789,95 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
 
         self._curname = "cur_%s_%08d" % (self.metadata().name(), next(CURSOR_COUNT))
 
-        self.rows = self.size()
-        if not self.rows:  # Si no hay tamaño, no declara/crea el cursor/consulta
+        cached_size = None
+        if self.lazy_count():
+            cached_size = pnsizecache.SIZE_CACHE.get(
+                self.db(), self._tablename, self._count_where()
+            )
+            if cached_size is None:
+                self._refresh_lazy()
+                return
+
+        self.rows = self.size() if cached_size is None else cached_size
+        size_cached = cached_size is not None or self._size_cached
+        if not self.rows and not size_cached:
+            # Si no hay tamaño, no declara/crea el cursor/consulta
+            self._declared_rows = self.rows
             return
 
+        self._declare_cursor()
+        if size_cached and not self._check_cached_size():
+            pnsizecache.SIZE_CACHE.invalidate(self._tablename)
+            self._exact_count = True
+            self.rows = self.size()
+
+        self._declared_rows = self.rows
+        if not self.rows:
+            return
+
+        self.grid_row_tmp = {}
+
+        self.need_update = False
+        self._column_hints = [120] * len(self.sql_fields)
+        self.updateRows()
+
+    def _check_cached_size(self) -> bool:
+        """Return if the declared cursor ends at the cached size (changes of other processes)."""
+
+        if self.driver_sql().getRow(self.rows, self._curname, self.cursorDB()):
+            return False
+
+        return not self.rows or bool(
+            self.driver_sql().getRow(self.rows - 1, self._curname, self.cursorDB())
+        )
+
+    def _refresh_lazy(self) -> None:
+        """Declare the cursor without counting the rows and load the first block."""
+
+        self._declare_cursor()
+        self.grid_row_tmp = {}
+        self.need_update = False
+        self._column_hints = [120] * len(self.sql_fields)
+        # Hasta conocer el total, todas las filas se piden al cursor declarado.
+        self._declared_rows = sys.maxsize
+        self._lazy_pending = True
+        self._fetch_lazy_block()
+        if not self._lazy_pending:
+            return
+
+        sql = "SELECT COUNT(%s) FROM %s WHERE %s" % (
+            self.pK(),
+            self._tablename,
+            self._count_where(),
+        )
+        generation = self._lazy_generation
+        count_conn = self._lease_count_conn()
+        if count_conn is not None:
+            threading.Thread(
+                target=self._lazy_count_thread, args=(generation, sql, count_conn)
+            ).start()
+        else:
+            # Se cuenta en el hilo principal, tras pintar el grid.
+            QtCore.QTimer.singleShot(0, lambda: self._lazy_count_deferred(generation))
+
+    def _lease_count_conn(self) -> Optional["iconnection.IConnection"]:
+        """Return a connection of its own for the background count, or None to count here."""
+
+        if not self.driver_sql().useThreads() or self.db().transactionLevel():
+            # Con una transacción abierta el conteo tiene que ver sus registros.
+            return None
+
+        try:
+            # Se toma en el hilo principal, que es donde se abren las conexiones.
+            return self.db().connManager().leaseConn("lazy_count")
+        except Exception as error:
+            self.logger.warning("lazy count: %s", error)
+            return None
+
+    def _declare_cursor(self) -> None:
+        """Declare the database cursor for the current filter."""
+
+        start = pnsqlstats.SQL_STATS.start()
         self.driver_sql().declareCursor(
             self._curname,
             self.sql_str,
@@ -697,11 +886,112 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
             self.cursorDB(),
             self.db(),
         )
-        self.grid_row_tmp = {}
+        if start:
+            pnsqlstats.SQL_STATS.record(
+                self.db(),
+                "DECLARE %s FOR SELECT %s FROM %s WHERE %s"
+                % (self._curname, self.sql_str, self._tablename, self.where_filter),
+                start,
+            )
 
-        self.need_update = False
-        self._column_hints = [120] * len(self.sql_fields)
-        self.updateRows()
+    def _fetch_lazy_block(self) -> None:
+        """Load the next block of rows while the exact count is unknown."""
+
+        block = max(int(settings.config.value("ebcomportamiento/lazy_count_block", 200)), 1)
+        start = self.rows
+        loaded = start
+        if self._get_row(start + block - 1):
+            loaded = start + block
+        else:
+            while loaded < start + block and self._get_row(loaded):
+                loaded += 1
+
+        if loaded > start:
+            self.beginInsertRows(QtCore.QModelIndex(), start, loaded - 1)
+            self.rows = loaded
+            self._rows_loaded = loaded
+            self.endInsertRows()
+
+        self._lazy_more = loaded == start + block
+        if not self._lazy_more:  # Fin del cursor, el total ya es conocido.
+            self._lazy_generation += 1
+            self._set_lazy_size(self._lazy_generation, loaded)
+
+    def _lazy_count_thread(
+        self, generation: int, sql: str, count_conn: "iconnection.IConnection"
+    ) -> None:
+        """Count the rows in a connection of its own, so the grid can fetch meanwhile. Threaded."""
+
+        size = -1
+        try:
+            cursor = count_conn.cursor()
+            cursor.execute(sql)
+            result = cursor.fetchone()
+            cursor.close()
+            if result is not None:
+                size = int(result[0])
+        except Exception as error:
+            self.logger.warning("lazy count: %s", error)
+        finally:
+            count_conn.connManager().releaseConn(count_conn)
+
+        try:
+            self._lazy_count_ready.emit(generation, size)
+        except RuntimeError:  # El modelo ya no existe.
+            pass
+
+    def _lazy_count_deferred(self, generation: int) -> None:
+        """Count the rows in the main thread, if the refresh is still current."""
+
+        if generation == self._lazy_generation and self._lazy_pending:
+            self.fetch_count()
+
+    def fetch_count(self) -> int:
+        """
+        Return the exact row count, counting synchronously if it is still pending.
+
+        @return number of rows.
+        """
+        if self._lazy_pending:
+            self._lazy_generation += 1
+            self._set_lazy_size(self._lazy_generation, self.size())
+
+        return self.rows
+
+    @QtCore.pyqtSlot(int, int)
+    def _set_lazy_size(self, generation: int, size: int) -> None:
+        """Set the exact count of a lazy refresh."""
+
+        if generation != self._lazy_generation or not self._lazy_pending:
+            return
+
+        if size < 0:  # Falló el conteo en segundo plano.
+            self.fetch_count()
+            return
+
+        self._lazy_pending = False
+        self._lazy_more = False
+        size = max(size, self.rows)
+        self._declared_rows = size
+        if size > self.rows:
+            self.beginInsertRows(QtCore.QModelIndex(), self.rows, size - 1)
+            self.rows = size
+            self._rows_loaded = size
+            self.endInsertRows()
+
+        pnsizecache.SIZE_CACHE.set(self.db(), self._tablename, self._count_where(), size)
+        self.indexes_valid = True
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:
+        """Return if there are more rows to load while the count is pending."""
+
+        return self._lazy_more and not parent.isValid()
+
+    def fetchMore(self, parent: QtCore.QModelIndex) -> None:
+        """Load the next block of rows."""
+
+        if self.canFetchMore(parent):
+            self._fetch_lazy_block()
 
     def value(self, row: Optional[int], field_name: str) -> Any:
         """
@@ -756,7 +1046,7 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
             return False
 
         if row != self._current_row_index:
-            result = self.driver_sql().getRow(row, self._curname, self.cursorDB())
+            result = self._get_row(row)
             if not result:
                 return False
 
@@ -764,6 +1054,22 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
             self._current_row_data = list(result)
         return True
 
+    def _get_row(self, row: int) -> List[Any]:
+        """Return the data of a row, from the declared cursor or from the inserted rows."""
+
+        if row >= self._declared_rows:
+            pos = row - self._declared_rows
+            return self._inserted_rows[pos] if pos < len(self._inserted_rows) else []
+
+        start = pnsqlstats.SQL_STATS.start()
+        result = self.driver_sql().getRow(row, self._curname, self.cursorDB())
+        if start:
+            pnsqlstats.SQL_STATS.record(self.db(), "FETCH FROM %s" % self._curname, start, 1)
+        if result and self._pk_pos is not None:
+            self.pkidx[(result[self._pk_pos],)] = row
+
+        return result
+
     def setValuesDict(self, row: int, update_dict: Dict[str, Any]) -> None:
         """
         Set value to a row using a Dict.
@@ -793,6 +1099,11 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
                 self.logger.warning(
                     "CursorTableModel.setValuesDict:: columns not found: %r", colsnotfound
                 )
+            if row >= self._declared_rows and row - self._declared_rows < len(self._inserted_rows):
+                self._inserted_rows[row - self._declared_rows] = self._current_row_data
+            if self.pK() in update_dict:
+                self.pkidx = {}
+                self._pk_index_complete = False
             # self.indexUpdateRow(row)
 
         except Exception:
@@ -828,6 +1139,8 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
             raise Exception("Cursor has no buffer")
         campos = ""
         valores = ""
+        inserted_values: Dict[str, Any] = {}
+        self._last_inserted_row = None
         for buffer_field in buffer.fieldsList():
             value: Any = None
             if buffer.value(buffer_field.name) is None:
@@ -841,6 +1154,7 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
             if value is not None:  # si el campo se rellena o hay valor default
                 # if b.name == fl_cursor.metadata().primaryKey():
                 #    pKValue = value
+                inserted_values[buffer_field.name] = value
                 if buffer_field.type_ in ("string", "stringlist") and isinstance(value, str):
                     value = self.db().normalizeValue(value)
                 value = (
@@ -853,16 +1167,27 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
                     campos = u"%s,%s" % (campos, buffer_field.name)
                     valores = u"%s,%s" % (valores, value)
         if campos:
-            sql = """INSERT INTO %s (%s) VALUES (%s)""" % (fl_cursor.curName(), campos, valores)
+            returning = self.sql_str if not self.metadata().isQuery() else None
+            sql = self.driver_sql().queryInsert(fl_cursor.curName(), campos, valores, returning)
             # conn = self._cursor_connection.db()
             try:
                 # print(sql)
-                self.db().execute_query(sql)
+                cursor = self.db().execute_query(sql)
                 # self.refresh()
                 # if pKValue is not None:
                 #    fl_cursor.move(self.findPKRow((pKValue,)))
 
                 self.need_update = True
+                if returning and not self.db().lastError():
+                    if cursor is not None and cursor.description:
+                        row_data = cursor.fetchone()
+                        if row_data:
+                            self._last_inserted_row = list(row_data)
+                    else:
+                        self._last_inserted_row = [
+                            inserted_values.get(field_name)
+                            for field_name in (self.sql_fields_without_check or self.sql_fields)
+                        ]
             except Exception:
                 self.logger.exception(
                     "CursorTableModel.%s.Insert() :: SQL: %s", self.metadata().name(), sql
@@ -1000,14 +1325,118 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
         if not pklist or pklist[0] is None:
             raise ValueError("Primary Key can't be null")
 
+        if self._pk_pos is None:
+            return None
+
+        key = (pklist[0],)
+        if key in self.pkidx:
+            return self.pkidx[key]
+
+        if self._pk_prefetch and not self._pk_index_complete and not self.metadata().isQuery():
+            self._prefetch_pk_index()
+            if key in self.pkidx:
+                return self.pkidx[key]
+
+        if self._pk_index_complete:
+            return None
+
         ret = None
-        if self.pK():
-            ret = self.driver_sql().findRow(
-                self.cursorDB(), self._curname, self.sql_fields.index(self.pK()), pklist[0]
-            )
+        if self._declared_rows:
+            ret = self.driver_sql().findRow(self.cursorDB(), self._curname, self._pk_pos, key[0])
+            if ret is not None:
+                self.pkidx[key] = ret
 
         return ret
 
+    def _prefetch_pk_index(self) -> None:
+        """Load the primary key index of the declared rows with a single query."""
+
+        sql = "SELECT %s FROM %s WHERE %s" % (
+            self.pK(),
+            self._tablename,
+            self.driver_sql().fix_query(self.where_filter),
+        )
+        cursor = self.db().execute_query(sql)
+        if self.db().lastError():
+            return
+
+        for number, row_data in enumerate(cursor.fetchall()):
+            if number >= self._declared_rows:
+                break
+            self.pkidx[(row_data[0],)] = number
+
+        self._pk_index_complete = True
+
+    def append_inserted_row(self) -> Optional[int]:
+        """
+        Add the last inserted record to the model without a full refresh.
+
+        The record is placed after the last row, so it is only added when the current
+        order and filter allow to know its position without asking the database again.
+
+        @return row index of the new record or None if a refresh is needed to locate it.
+        """
+        row_data = self._last_inserted_row
+        self._last_inserted_row = None
+        if row_data is None or self._initialized is not False or self.metadata().isQuery():
+            return None
+
+        if self._lazy_pending:
+            return None
+
+        pk_name = self.pK()
+        if self._pk_pos is None:
+            return None
+
+        pk_value = row_data[self._pk_pos]
+        if pk_value is None:
+            return None
+
+        where_ = self.where_filter
+        order_ = ""
+        if where_.find("ORDER BY") > -1:
+            order_ = where_[where_.find("ORDER BY") + 8 :].replace(";", "").strip()
+            where_ = where_[: where_.find("ORDER BY")]
+        where_ = where_.replace(";", "").strip()
+
+        if order_:
+            # Sólo se conoce la posición si se ordena por una clave numérica ascendente.
+            if order_.lower() not in (pk_name.lower(), "%s asc" % pk_name.lower()):
+                return None
+            if self.fieldType(pk_name) not in ("serial", "uint", "int"):
+                return None
+            if self.rows:
+                last_value = self.value(self.rows - 1, pk_name)
+                if last_value is None or int(pk_value) <= int(last_value):
+                    return None
+
+        if where_ and where_.replace(" ", "") != "1=1":
+            pk_value_formatted = (
+                self.db().connManager().manager().formatValue(self.fieldType(pk_name), pk_value)
+            )
+            sql = "SELECT COUNT(%s) FROM %s WHERE (%s) AND %s = %s" % (
+                pk_name,
+                self._tablename,
+                self.driver_sql().fix_query(where_),
+                pk_name,
+                pk_value_formatted,
+            )
+            cursor = self.db().execute_query(sql)
+            result = cursor.fetchone() if not self.db().lastError() else None
+            if not result or not result[0]:
+                return None
+
+        row = self.rows
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self._inserted_rows.append(row_data)
+        self.pkidx[(pk_value,)] = row
+        self.rows += 1
+        self._rows_loaded = self.rows
+        self.endInsertRows()
+        self.grid_row_tmp = {}
+
+        return row
+
     def pK(self) -> str:
         """
         Get field name of the primary key.
@@ -1075,8 +1504,10 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
         """
         size = 0
         mtd = self.metadata()
+        exact_count = self._exact_count
+        self._exact_count = False
+        self._size_cached = False
         if mtd and self.db().isOpen():
-            where_ = self.where_filter
             # from_ = self.metadata().name()
 
             # if mtd.isQuery():
@@ -1085,21 +1516,40 @@ class PNCursorTableModel(QtCore.QAbstractTableModel):
             #        raise Exception("Query not found")
             #    from_ = qry.from_()
 
-            if self.where_filter.find("ORDER BY") > -1:
-                where_ = self.where_filter[: self.where_filter.find("ORDER BY")]
+            where_ = self._count_where()
+            cached_size = pnsizecache.SIZE_CACHE.get(self.db(), self._tablename, where_)
+            if cached_size is not None and not exact_count:
+                self._size_cached = True
+                return cached_size
+
+            if self._estimated_count and not exact_count and not mtd.isQuery():
+                estimated = self.driver_sql().estimatedCount(self._tablename, where_)
+                if estimated is not None and estimated >= int(
+                    settings.config.value("ebcomportamiento/estimated_count_min_rows", 100000)
+                ):
+                    return estimated
 
-            where_ = self.driver_sql().fix_query(where_)
             # q = pnsqlquery.PNSqlQuery(None, self.db())
             sql = "SELECT COUNT(%s) FROM %s WHERE %s" % (self.pK(), self._tablename, where_)
-            cursor = self.driver_sql().execute_query(sql)
+            cursor = self.db().execute_query(sql)
             result = cursor.fetchone()
             if result is not None:
                 size = result[0]
+                pnsizecache.SIZE_CACHE.set(self.db(), self._tablename, where_, size)
             # q.exec_(sql)
             # if q.first():
             #    size = q.value(0)
         return size
 
+    def _count_where(self) -> str:
+        """Return the where filter without the ORDER BY clause."""
+
+        where_ = self.where_filter
+        if where_.find("ORDER BY") > -1:
+            where_ = where_[: where_.find("ORDER BY")]
+
+        return self.driver_sql().fix_query(where_)
+
     def headerData(
         self, section: int, orientation: QtCore.Qt.Orientation, role: int = QtCore.Qt.DisplayRole
     ) -> Any:
@@ -0,0 +1,93 @@
+"""
+PNLargeValues module.
+
+Keep the content of the large values (fllarge) already read.
+"""
+
+from pineboolib.core import settings
+
+import collections
+import threading
+
+from typing import Dict, Optional
+
+
+class PNLargeValues(object):
+    """
+    PNLargeValues class.
+
+    Contents are kept by their reference key (RK@table@sha), which depends on the content, so an
+    entry is never outdated. The least recently used entries are dropped when the contents
+    take more than ebcomportamiento/large_value_cache_kb kilobytes.
+    """
+
+    _entries: Dict[str, str]
+    hits: int
+    misses: int
+
+    def __init__(self) -> None:
+        """Inicialize."""
+
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def max_bytes(self) -> int:
+        """Return the size limit of the contents. 0 disables the cache."""
+
+        return int(settings.config.value("ebcomportamiento/large_value_cache_kb", 16384)) * 1024
+
+    def get(self, ref_key: str) -> Optional[str]:
+        """Return the content of a reference key or None."""
+
+        with self._lock:
+            content = self._entries.get(ref_key)
+            if content is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(ref_key)  # type: ignore [attr-defined]
+            self.hits += 1
+            return content
+
+    def contains(self, ref_key: str) -> bool:
+        """Return if the content of a reference key is kept."""
+
+        return ref_key in self._entries
+
+    def set(self, ref_key: str, content: str) -> None:
+        """Keep the content of a reference key."""
+
+        max_bytes = self.max_bytes()
+        if not max_bytes or len(content) > max_bytes:
+            return
+
+        with self._lock:
+            old_content = self._entries.pop(ref_key, None)
+            if old_content is not None:
+                self._bytes -= len(old_content)
+
+            self._entries[ref_key] = content
+            self._bytes += len(content)
+            while self._bytes > max_bytes:
+                _, removed = self._entries.popitem(last=False)  # type: ignore [call-arg]
+                self._bytes -= len(removed)
+
+    def size(self) -> int:
+        """Return the size of the kept contents."""
+
+        return self._bytes
+
+    def clear(self) -> None:
+        """Forget every content."""
+
+        with self._lock:
+            self._entries = collections.OrderedDict()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+LARGE_VALUES = PNLargeValues()
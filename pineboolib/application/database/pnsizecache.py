@@ -0,0 +1,138 @@
+"""
+PNSizeCache module.
+
+Keep the result of the COUNT queries launched by PNCursorTableModel.size.
+"""
+
+from pineboolib.core import settings
+from pineboolib import application
+
+import re
+import threading
+import time
+
+from typing import Any, Dict, Optional, Set, Tuple
+
+WORD_RE = re.compile(r"\w+")
+DML_RE = re.compile(r"^\s*(?:insert\s+into|update|delete\s+from)\s+([\w.]+)", re.IGNORECASE)
+
+
+class PNSizeCache(object):
+    """
+    PNSizeCache class.
+
+    Entries are keyed by (session, connection name, table, where filter) and are dropped when
+    a table referenced by the table or the filter is modified, or when they are older than
+    ebcomportamiento/size_cache_ttl seconds (changes made by other applications). Before that,
+    PNCursorTableModel.refresh counts again if the declared cursor has more rows than cached.
+    Tables modified inside a transaction are invalidated again when it ends, because other
+    connections could have cached the count before the commit.
+    """
+
+    _entries: Dict[Tuple[Tuple[str, str], str, str], Tuple[int, float, Set[str]]]
+    _dirty: Dict[Tuple[str, str], Set[str]]
+    hits: int
+    misses: int
+
+    def __init__(self) -> None:
+        """Inicialize."""
+
+        self._entries = {}
+        self._dirty = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def conn_key(self, conn: Any) -> Tuple[str, str]:
+        """Return the key of a connection. Not id(conn): the pool wraps the connections again."""
+
+        return (application.PROJECT.session_id(), conn.connectionName())
+
+    def ttl(self) -> float:
+        """Return the seconds an entry is valid. 0 disables the cache."""
+
+        return float(settings.config.value("ebcomportamiento/size_cache_ttl", 5))
+
+    def get(self, conn: Any, table: str, where: str) -> Optional[int]:
+        """Return the cached size or None."""
+
+        ttl = self.ttl()
+        if not ttl:
+            return None
+
+        key = (self.conn_key(conn), table, " ".join(where.split()))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[1] < ttl:
+                self.hits += 1
+                return entry[0]
+
+            self.misses += 1
+            if entry is not None:
+                del self._entries[key]
+
+        return None
+
+    def set(self, conn: Any, table: str, where: str, size: int) -> None:
+        """Store a size."""
+
+        if not self.ttl():
+            return
+
+        words = set(WORD_RE.findall(("%s %s" % (table, where)).lower()))
+        with self._lock:
+            self._entries[(self.conn_key(conn), table, " ".join(where.split()))] = (
+                size,
+                time.time(),
+                words,
+            )
+
+    def invalidate(self, table: str, conn: Any = None) -> None:
+        """
+        Drop the entries that reference a table.
+
+        @param table. Modified table.
+        @param conn. Connection that modified the table, if it is inside a transaction.
+        """
+
+        table = table.lower().split(".")[-1]
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if table in entry[2]]:
+                del self._entries[key]
+
+            if conn is not None and getattr(conn, "_transaction", 0):
+                self._dirty.setdefault(self.conn_key(conn), set()).add(table)
+
+    def invalidate_sql(self, sql: str, conn: Any = None) -> None:
+        """Drop the entries of the table modified by a INSERT, UPDATE or DELETE sentence."""
+
+        match = DML_RE.match(sql)
+        if match:
+            self.invalidate(match.group(1), conn)
+
+    def transaction_end(self, conn: Any, finished: bool = True) -> None:
+        """
+        Invalidate again the tables modified by a connection during a transaction.
+
+        @param conn. Connection.
+        @param finished. False if only a savepoint was rolled back.
+        """
+
+        with self._lock:
+            if finished:
+                tables = self._dirty.pop(self.conn_key(conn), set())
+            else:
+                tables = set(self._dirty.get(self.conn_key(conn), set()))
+
+        for table in tables:
+            self.invalidate(table)
+
+    def clear(self) -> None:
+        """Clear the cache."""
+
+        with self._lock:
+            self._entries = {}
+            self._dirty = {}
+
+
+SIZE_CACHE = PNSizeCache()
@@ -17,13 +17,14 @@ from pineboolib import application
 from pineboolib.interfaces import isqlcursor
 
 from . import pnbuffer
+from . import pncommitplan
 from . import pncursortablemodel
 
 
 import weakref
 import traceback
 
-from typing import Any, Optional, List, Union, cast, TYPE_CHECKING
+from typing import Any, Dict, Optional, List, Tuple, Union, cast, TYPE_CHECKING
 
 
 from pineboolib.application.acls import pnboolflagstate
@@ -812,6 +813,8 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
     def size(self) -> int:
         """Get number of records in the cursor."""
         model = self.model()
+        if model.lazy_count_pending():
+            return model.fetch_count()
         return model.rows
 
     def openFormInMode(self, m: int, wait: bool = True, cont: bool = True) -> None:
@@ -1237,11 +1240,10 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
                         checked_compound_key = True
 
         elif self.private_cursor.mode_access_ == self.Del:
-            field_list = self.private_cursor.metadata_.fieldList()
             # field_name = None
             value = None
 
-            for field in field_list:
+            for field in pncommitplan.COMMIT_PLANS.plan(self).relation_fields:
                 # field_name = field.name()
                 if not self.private_cursor.buffer_.isGenerated(field.name()):
                     continue
@@ -1701,21 +1703,20 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
         @return True if seek the position else False.
         """
 
-        # if value is None:
-        #     return False
+        if value is None:
+            return False
 
         if not self.private_cursor.buffer_:
             raise Exception("Buffer not set")
 
-        for i in range(self.private_cursor._model.rowCount()):
-            pk_value = self.private_cursor.buffer_.pK()
-            if pk_value is None:
-                raise ValueError("pk_value is empty!")
+        if self.private_cursor.buffer_.pK() is None:
+            raise ValueError("pk_value is empty!")
 
-            if self.private_cursor._model.value(i, pk_value) == value:
-                return self.move(i) if self.at() != i else True
+        row = self.private_cursor._model.findPKRow([value])
+        if row is None:
+            return False
 
-        return False
+        return self.move(row) if self.at() != row else True
 
     def at(self) -> int:
         """
@@ -1732,7 +1733,7 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
         if row < 0:
             return -1
 
-        if row >= self.size():
+        if row >= self.model().rows and row >= self.size():
             return -2
         # LOGGER.debug("%s.Row %s ----> %s" % (self.curName(), row, self))
         return row
@@ -2130,7 +2131,7 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
             raise Exception("Call setAction first.")
         self._selection.select(new_selection, QtCore.QItemSelectionModel.ClearAndSelect)
         # self.private_cursor._current_changed.emit(self.at())
-        if row < self.size() and row >= 0:
+        if row >= 0 and (row < model.rows or row < self.size()):
             self.private_cursor._currentregister = row
             return True
         else:
@@ -2585,27 +2586,23 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
         if not self.checkIntegrity():
             return False
 
+        # Ganchos y campos a revisar de la tabla, resueltos una vez por conexión y tabla.
+        plan = pncommitplan.COMMIT_PLANS.plan(self)
+
         field_name_check = None
         if self.modeAccess() in [self.Edit, self.Insert]:
-            field_list = self.private_cursor.metadata_.fieldList()
-
-            for field in field_list:
-                if field.isCheck():
-                    field_name_check = field.name()
-                    self.private_cursor.buffer_.setGenerated(field, False)
+            for field in plan.check_fields:
+                field_name_check = field.name()
+                self.private_cursor.buffer_.setGenerated(field, False)
 
-                    if self.private_cursor._buffer_copy:
-                        self.private_cursor._buffer_copy.setGenerated(field, False)
-                    continue
+                if self.private_cursor._buffer_copy:
+                    self.private_cursor._buffer_copy.setGenerated(field, False)
 
-                if not self.private_cursor.buffer_.isGenerated(field.name()):
-                    continue
+            if plan.calculated_fields and hasattr(self.context(), "calculateField"):
+                for field in plan.calculated_fields:
+                    if not self.private_cursor.buffer_.isGenerated(field.name()):
+                        continue
 
-                if (
-                    self.context()
-                    and hasattr(self.context(), "calculateField")
-                    and field.calculated()
-                ):
                     value = application.PROJECT.call(
                         "calculateField", [field.name()], self.context(), False
                     )
@@ -2613,40 +2610,20 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
                     if value not in (True, False, None):
                         self.setValueBuffer(field.name(), value)
 
-        function_before = None
-        function_after = None
-
-        id_module = self.db().connManager().managerModules().idModuleOfFile("%s.mtd" % self.table())
-
-        # FIXME: module_script is FLFormDB
-        module_script = (
-            application.PROJECT.actions[id_module].load()
-            if id_module in application.PROJECT.actions.keys()
-            else application.PROJECT.actions["sys"].load()
-        )
-        module_iface: Any = getattr(module_script, "iface", None)
-
         if not self.modeAccess() == PNSqlCursor.Browse and self.activatedCommitActions():
 
-            function_before = "beforeCommit_%s" % (self.table())
-            function_after = "afterCommit_%s" % (self.table())
-
-            if function_before:
-                field_name = getattr(module_iface, function_before, None)
+            if plan.before_commit is not None:
                 value = None
-                if field_name is not None:
-                    try:
-                        value = field_name(self)
-                    except Exception:
-                        QtWidgets.QMessageBox.warning(
-                            QtWidgets.QApplication.focusWidget(),
-                            "Error",
-                            error_manager.error_manager(
-                                traceback.format_exc(limit=-6, chain=False)
-                            ),
-                        )
-                    if value and not isinstance(value, bool) or value is False:
-                        return False
+                try:
+                    value = plan.before_commit(self)
+                except Exception:
+                    QtWidgets.QMessageBox.warning(
+                        QtWidgets.QApplication.focusWidget(),
+                        "Error",
+                        error_manager.error_manager(traceback.format_exc(limit=-6, chain=False)),
+                    )
+                if value and not isinstance(value, bool) or value is False:
+                    return False
 
         # primary_key = self.private_cursor.metadata_.primaryKey()
         updated = False
@@ -2672,12 +2649,15 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
 
             if not (self.private_cursor._model.insert(self)):
                 return False
-            self.selection().currentRowChanged.disconnect(
-                self.selection_currentRowChanged
-            )  # Evita vaciado de buffer al hacer removeRows
-            self.private_cursor._model.refresh()
-            self.selection().currentRowChanged.connect(self.selection_currentRowChanged)
-            pk_row = self.private_cursor._model.findPKRow((pk_value,))
+            # Si el orden y el filtro lo permiten, se añade la fila sin refrescar todo el modelo.
+            pk_row = self.private_cursor._model.append_inserted_row()
+            if pk_row is None:
+                self.selection().currentRowChanged.disconnect(
+                    self.selection_currentRowChanged
+                )  # Evita vaciado de buffer al hacer removeRows
+                self.private_cursor._model.refresh()
+                self.selection().currentRowChanged.connect(self.selection_currentRowChanged)
+                pk_row = self.private_cursor._model.findPKRow((pk_value,))
 
             if pk_row is not None:
                 self.move(pk_row)
@@ -2731,9 +2711,7 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
             if not self.private_cursor.buffer_:
                 self.primeUpdate()
 
-            field_list = self.private_cursor.metadata_.fieldList()
-
-            for field in field_list:
+            for field in plan.relation_fields:
 
                 field_name = field.name()
                 if not self.private_cursor.buffer_.isGenerated(field_name):
@@ -2791,23 +2769,18 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
 
         if not self.modeAccess() == self.Browse and self.activatedCommitActions():
 
-            if function_after:
-                field_name = getattr(module_script.iface, function_after, None)
-
-                if field_name is not None:
-                    value = None
-                    try:
-                        value = field_name(self)
-                    except Exception:
-                        QtWidgets.QMessageBox.warning(
-                            QtWidgets.QApplication.focusWidget(),
-                            "Error",
-                            error_manager.error_manager(
-                                traceback.format_exc(limit=-6, chain=False)
-                            ),
-                        )
-                    if value and not isinstance(value, bool) or value is False:
-                        return False
+            if plan.after_commit is not None:
+                value = None
+                try:
+                    value = plan.after_commit(self)
+                except Exception:
+                    QtWidgets.QMessageBox.warning(
+                        QtWidgets.QApplication.focusWidget(),
+                        "Error",
+                        error_manager.error_manager(traceback.format_exc(limit=-6, chain=False)),
+                    )
+                if value and not isinstance(value, bool) or value is False:
+                    return False
 
         if self.modeAccess() in (self.Del, self.Edit):
             self.setModeAccess(self.Browse)
@@ -2831,6 +2804,115 @@ class PNSqlCursor(isqlcursor.ISqlCursor):
         self.bufferCommited.emit()
         return True
 
+    def insertBulk(self, records: List[Dict[str, Any]], chunk_size: Optional[int] = None) -> bool:
+        """
+        Insert several records at once.
+
+        Default values, timestamps, counters and the relation with the master cursor are
+        resolved as refreshBuffer does, and serial fields not provided are left to the database.
+        Commit hooks (beforeCommit_*, afterCommit_*) and integrity checks are not run.
+
+        @param records List of dicts {field_name: value}.
+        @param chunk_size Number of records sent to the database per sentence.
+        @return True if all records were inserted, False otherwise.
+        """
+        if not self.private_cursor.metadata_:
+            raise Exception("Not initialized")
+
+        metadata = self.private_cursor.metadata_
+        if metadata.isQuery():
+            LOGGER.warning("insertBulk: %s is a query", metadata.name())
+            return False
+
+        if not records:
+            return True
+
+        relation_field = None
+        relation_value = None
+        if (
+            self.private_cursor.cursor_relation_ is not None
+            and self.private_cursor.relation_ is not None
+            and self.private_cursor.cursor_relation_.metadata()
+        ):
+            relation_field = self.private_cursor.relation_.field()
+            relation_value = self.private_cursor.cursor_relation_.valueBuffer(
+                self.private_cursor.relation_.foreignField()
+            )
+
+        # Se resuelve una sola vez por columna lo que refreshBuffer calcula por registro.
+        columns: List[Tuple[str, str, Any, bool]] = []
+        timestamp = None
+        for field in metadata.fieldList():
+            if not field.generated():
+                continue
+            type_ = field.type()
+            default_value = field.defaultValue()
+            if field.name() == relation_field:
+                default_value = relation_value
+            elif type_ == "timestamp" and not field.allowNull() and default_value is None:
+                if timestamp is None:
+                    timestamp = self.db().getTimeStamp()
+                default_value = timestamp
+            columns.append(
+                (field.name(), type_, default_value, field.isCounter() and type_ != "serial")
+            )
+
+        unknown_fields = set().union(*records) - set(column[0] for column in columns)
+        if unknown_fields:
+            LOGGER.warning(
+                "insertBulk: fields %s not found in %s", sorted(unknown_fields), metadata.name()
+            )
+
+        manager = self.db().connManager().manager()
+        counters: Dict[str, Any] = {}
+        fields_list: List[str] = []
+        rows: List[List[str]] = []
+        for record in records:
+            fields: List[str] = []
+            values: List[str] = []
+            for field_name, type_, default_value, is_counter in columns:
+                value = record.get(field_name, default_value)
+                if value is None and is_counter:
+                    value = counters[field_name] = self._next_bulk_counter(
+                        field_name, counters.get(field_name)
+                    )
+                if value is None:
+                    continue
+                if type_ in ("string", "stringlist") and isinstance(value, str):
+                    value = self.db().normalizeValue(value)
+                fields.append(field_name)
+                values.append(manager.formatValue(type_, value, False))
+
+            if fields != fields_list:
+                if rows and not self.db().insertBulk(
+                    metadata.name(), fields_list, rows, chunk_size
+                ):
+                    return False
+                fields_list = fields
+                rows = []
+            rows.append(values)
+
+        if not self.db().insertBulk(metadata.name(), fields_list, rows, chunk_size):
+            return False
+
+        if self.private_cursor._model._initialized is False:
+            self.refresh()
+
+        return True
+
+    def _next_bulk_counter(self, field_name: str, last_value: Any) -> Any:
+        """Return the next counter value for insertBulk."""
+
+        if last_value is None:
+            from pineboolib.application.database import utils
+
+            return utils.next_counter(field_name, self)
+
+        if isinstance(last_value, str):
+            return str(int(last_value) + 1).rjust(len(last_value), "0")
+
+        return last_value + 1
+
     @decorators.pyqtSlot()
     def commitBufferCursorRelation(self) -> bool:
         """
@@ -3491,6 +3573,7 @@ class PNCursorPrivate(isqlcursor.ICursorPrivate):
 
             return
 
+        # acl_table_ y metadata_ son compartidos, otro cursor puede haber aplicado la ACL.
         self.undoAcl()
 
     def undoAcl(self) -> None:
@@ -4,6 +4,7 @@ Module for PNSqlQuery class.
 """
 
 from pineboolib.core.utils import logging
+from pineboolib.core import settings
 
 from pineboolib.application.utils import sql_tools
 from pineboolib import application
@@ -11,8 +12,9 @@ from pineboolib.application import types
 
 from PyQt5 import QtWidgets
 
+import re
 
-from typing import Any, Union, List, Dict, Optional, TYPE_CHECKING
+from typing import Any, Union, List, Dict, Iterator, Optional, Sequence, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pineboolib.interfaces.ifieldmetadata import IFieldMetaData  # noqa: F401
@@ -24,6 +26,8 @@ if TYPE_CHECKING:
 
 LOGGER = logging.getLogger(__name__)
 
+ORDER_BY_RE = re.compile(r"\s+order\s+by\s+[^()]*$", re.IGNORECASE)
+
 
 class PNSqlQueryPrivate(object):
     """
@@ -77,6 +81,7 @@ class PNSqlQueryPrivate(object):
 
     _last_query: Union[bool, str]
     _forward_only: bool
+    _streaming: bool
     _limit: Optional[int]
     _offset: Optional[int]
 
@@ -94,6 +99,7 @@ class PNSqlQueryPrivate(object):
         self._from = None
         self._last_query = False
         self._forward_only = False
+        self._streaming = False
         self._limit = None
         self._offset = None
 
@@ -115,6 +121,12 @@ class PNSqlQuery(object):
     _datos: List[Any]
     _posicion: int
     _cursor: Optional["IApiCursor"]
+    _last_params: Optional[Union[Sequence[Any], Dict[str, Any]]]
+    _stream: bool
+    _stream_start: int
+    _stream_done: bool
+    _stream_size: Optional[int]
+    _large_values_window: Tuple[int, int]
     private_query: PNSqlQueryPrivate
 
     def __init__(self, cx=None, connection_name: Union[str, "IConnection"] = "default") -> None:
@@ -138,6 +150,12 @@ class PNSqlQuery(object):
         self.private_query._field_list = []
         self._is_active = False
         self._cursor = None
+        self._last_params = None
+        self._stream = False
+        self._stream_start = 0
+        self._stream_done = True
+        self._stream_size = None
+        self._large_values_window = (0, 0)
 
         retorno_qry = None
         if cx:
@@ -152,6 +170,7 @@ class PNSqlQuery(object):
         """
 
         try:
+            self._close_stream()
             if self._cursor is not None:
                 self._cursor.close()
             del self._sql_inspector
@@ -172,12 +191,17 @@ class PNSqlQuery(object):
 
         return self._sql_inspector
 
-    def exec_(self, sql: Optional[str] = None) -> bool:
+    def exec_(
+        self,
+        sql: Optional[str] = None,
+        params: Optional[Union[Sequence[Any], Dict[str, Any]]] = None,
+    ) -> bool:
         """
         Run a query.
 
         This can be specified or calculated from the values ​​previously provided.
         @param sql. query text.
+        @param params. values for "?" (list) or ":name" (dict) placeholders of the query.
         @return True or False return if the execution is successful.
         """
         self._is_active = False
@@ -204,15 +228,32 @@ class PNSqlQuery(object):
             raise Exception("The query is empty!")
 
         self._last_query = sql
+        self._last_params = params
+        self._close_stream()
+        self._stream = self.isStreaming() and sql.lstrip()[:6].lower() == "select"
         try:
 
-            self._cursor = self.db().cursor()
+            if self._stream and params is None and self.private_query._streaming:
+                self._cursor = self.db().driver().streamCursor(True)
+            else:
+                self._cursor = self.db().cursor()
             if self._cursor is None:
                 raise Exception("self._cursor is empty!")
             LOGGER.trace("exec_: Ejecutando consulta: <%s> en <%s>", sql, self._cursor)
-            self.db().execute_query(sql, self._cursor)
-            self._datos = self._cursor.fetchall()
+            if params is None:
+                self.db().execute_query(sql, self._cursor)
+            else:
+                self.db().execute_params(sql, params, self._cursor)
             self._posicion = -1
+            if self._stream:
+                self._datos = []
+                self._stream_start = 0
+                self._stream_done = False
+                self._stream_size = None
+                self._fetch_batch()
+            else:
+                self._datos = self._cursor.fetchall()
+                self._large_values_batch()
         except Exception as exc:
             LOGGER.error(exc)
             LOGGER.info("Error ejecutando consulta: <%s>", sql)
@@ -655,6 +696,10 @@ class PNSqlQuery(object):
 
         if self._row:
             ret = self._row[pos]
+            if not raw and isinstance(ret, str) and ret[0:3] == "RK@":
+                row_index = self._posicion - (self._stream_start if self._stream else 0)
+                if not self._large_values_window[0] <= row_index < self._large_values_window[1]:
+                    self._prefetch_large_values(row_index)
 
         if ret in (None, "None"):
             ret = self.sql_inspector.resolve_empty_value(pos)
@@ -666,6 +711,69 @@ class PNSqlQuery(object):
 
         return ret
 
+    def values_batch(self, raw: bool = False) -> List[List[Any]]:
+        """
+        Return the values of the rows read, converted as value() does.
+
+        For a streamed result these are the rows of the current batch.
+        @param raw If TRUE the pixmap fields return the reference instead of the content.
+        @return list with a list of values per row.
+        """
+
+        inspector = self.sql_inspector
+        converters = inspector.converters(raw)
+        size = len(converters)
+        result: List[List[Any]] = []
+        for row_index, row in enumerate(self._datos):
+            if not raw and row_index >= self._large_values_window[1]:
+                self._prefetch_large_values(row_index)
+            values: List[Any] = []
+            for pos, value in enumerate(row):
+                if value in (None, "None"):
+                    values.append(inspector.resolve_empty_value(pos))
+                    continue
+                try:
+                    values.append(
+                        converters[pos](value)
+                        if pos < size
+                        else inspector.resolve_value(pos, value, raw)
+                    )
+                except Exception:
+                    LOGGER.exception("values_batch::error retrieving row position %s", pos)
+                    values.append(value)
+
+            result.append(values)
+
+        return result
+
+    def rows(self, raw: bool = False) -> Iterator[List[Any]]:
+        """
+        Iterate over the values of every row of the result, converted as value() does.
+
+        A streamed result is read to the end, so the query is positioned after the last row.
+        @param raw If TRUE the pixmap fields return the reference instead of the content.
+        """
+
+        if not self._cursor:
+            return
+
+        if not self._stream:
+            yield from self.values_batch(raw)
+            return
+
+        if self._stream_start > 0 and not self._stream_seek(0):
+            return
+
+        while True:
+            yield from self.values_batch(raw)
+            if self._stream_done:
+                break
+            self._stream_start += len(self._datos)
+            self._fetch_batch()
+
+        self._posicion = self._stream_start + len(self._datos)
+        self._row = []
+
     def isNull(self, field_name: str) -> bool:
         """
         Indicate whether a query field is null or not.
@@ -794,6 +902,9 @@ class PNSqlQuery(object):
 
         @return number of results.
         """
+        if self._stream:
+            return self._stream_count()
+
         return len(self._datos)
 
     def fieldMetaDataList(self) -> List["IFieldMetaData"]:
@@ -858,7 +969,7 @@ class PNSqlQuery(object):
 
         @return number of lines.
         """
-        return len(self._datos)
+        return self.size()
 
     def lastError(self) -> str:
         """Return last error if exists , empty elsewhere."""
@@ -875,9 +986,27 @@ class PNSqlQuery(object):
         return self.private_query._forward_only
 
     def setForwardOnly(self, forward: bool) -> None:
-        """Set forward only option value."""
+        """Set forward only option value. Forward only queries are read in batches."""
         self.private_query._forward_only = forward
 
+    def isStreaming(self) -> bool:
+        """
+        Return if the result is read in batches instead of being loaded at once.
+
+        Forward only queries are read in batches from a normal cursor. Only setStreaming uses
+        a server side cursor.
+        """
+        return self.private_query._streaming or self.private_query._forward_only
+
+    def setStreaming(self, streaming: bool = True) -> None:
+        """
+        Read the result in batches, using a server side cursor where available.
+
+        While the result is being read the connection could not be able to run
+        other queries (MySQL), so it is better to not nest queries in the loop.
+        """
+        self.private_query._streaming = streaming
+
     def seek(self, postition: int, relative=False) -> bool:
         """
         Position the cursor on a given result.
@@ -894,6 +1023,9 @@ class PNSqlQuery(object):
         if relative:
             pos = postition + self._posicion
 
+        if self._stream:
+            return self._stream_seek(pos)
+
         if self._datos:
             if pos >= 0 and pos <= len(self._datos) - 1:
                 self._posicion = pos
@@ -911,6 +1043,9 @@ class PNSqlQuery(object):
         if not self._cursor:
             return False
 
+        if self._stream:
+            return self._stream_seek(self._posicion + 1)
+
         if self._datos:
             self._posicion += 1
             if self._posicion < len(self._datos):
@@ -928,6 +1063,9 @@ class PNSqlQuery(object):
         if not self._cursor:
             return False
 
+        if self._stream:
+            return self._stream_seek(self._posicion - 1)
+
         if self._datos:
             self._posicion -= 1
             if self._posicion >= 0:
@@ -945,6 +1083,9 @@ class PNSqlQuery(object):
         if not self._cursor:
             return False
 
+        if self._stream:
+            return self._stream_seek(0)
+
         if self._datos:
             self._posicion = 0
             self._row = self._datos[self._posicion]
@@ -961,6 +1102,12 @@ class PNSqlQuery(object):
         if not self._cursor:
             return False
 
+        if self._stream:
+            while not self._stream_done:
+                self._stream_start += len(self._datos)
+                self._fetch_batch()
+            return self._stream_seek(self._stream_start + len(self._datos) - 1)
+
         if self._datos:
             self._posicion = len(self._datos) - 1
             self._row = self._datos[self._posicion]
@@ -968,6 +1115,122 @@ class PNSqlQuery(object):
 
         return False
 
+    def _fetch_batch(self) -> None:
+        """Read the next batch of rows of a streamed result."""
+
+        if self._stream_done or self._cursor is None:
+            self._datos = []
+            return
+
+        batch_size = int(settings.config.value("ebcomportamiento/query_stream_batch", 500))
+        self._datos = self._cursor.fetchmany(batch_size)
+        if len(self._datos) < batch_size:
+            self._close_stream()
+            self._stream_size = self._stream_start + len(self._datos)
+
+        self._large_values_batch()
+
+    def _large_values_batch(self) -> None:
+        """Prepare the resolution of the large values (pixmaps) of the rows just read."""
+
+        self._large_values_window = (0, 0)
+        defer = settings.config.value("ebcomportamiento/large_value_defer", True) in (True, "true")
+        if self._datos and not defer:
+            self._prefetch_large_values(0)
+
+    def _prefetch_large_values(self, start: int) -> None:
+        """
+        Read with one query the large values referenced by the pixmap fields of a window of rows.
+
+        @param start. Index in the rows read of the first row of the window. The window has
+            ebcomportamiento/large_value_window rows.
+        """
+
+        window = max(int(settings.config.value("ebcomportamiento/large_value_window", 50)), 1)
+        start = max(start, 0)
+        self._large_values_window = (start, start + window)
+        positions = [
+            pos
+            for pos, mtd in self.sql_inspector.mtd_fields().items()
+            if mtd is not None and mtd.type() == "pixmap"
+        ]
+        if positions:
+            self.db().connManager().manager().prefetchLargeValues(
+                row[pos]
+                for row in self._datos[start : start + window]
+                for pos in positions
+                if pos < len(row)
+            )
+
+    def _stream_seek(self, pos: int) -> bool:
+        """Position a streamed result, reading forward or executing the query again."""
+
+        if pos < 0:
+            self._posicion = -1
+            self._row = []
+            return False
+
+        if pos < self._stream_start:
+            # Sólo se puede avanzar, así que se relanza la consulta.
+            if not self.exec_(
+                self._last_query if isinstance(self._last_query, str) else None, self._last_params
+            ):
+                return False
+
+        while pos >= self._stream_start + len(self._datos) and not self._stream_done:
+            self._stream_start += len(self._datos)
+            self._fetch_batch()
+
+        if pos >= self._stream_start + len(self._datos):
+            self._posicion = self._stream_start + len(self._datos)
+            self._row = []
+            return False
+
+        self._posicion = pos
+        self._row = self._datos[pos - self._stream_start]
+        return True
+
+    def _stream_count(self) -> int:
+        """
+        Return the size of a streamed result.
+
+        A forward only result is read to the end. Only a result of a server side cursor not read
+        yet is counted in the database.
+        """
+
+        if self._stream_size is None and not self.private_query._streaming:
+            if self._cursor is not None:
+                self._datos = list(self._datos) + list(self._cursor.fetchall())
+            self._close_stream()
+            self._stream_size = self._stream_start + len(self._datos)
+            self._large_values_batch()
+
+        if self._stream_size is None:
+            sql = self._last_query if isinstance(self._last_query, str) else self.sql()
+            count_qry = PNSqlQuery(None, self.db())
+            if (
+                count_qry.exec_(
+                    "SELECT COUNT(*) FROM (%s) pnstream_count" % ORDER_BY_RE.sub("", sql.strip())
+                )
+                and count_qry.next()
+            ):
+                self._stream_size = int(count_qry.value(0))
+            else:
+                return -1
+
+        return self._stream_size
+
+    def _close_stream(self) -> None:
+        """Release the server side cursor of a streamed result."""
+
+        if self._stream and self._cursor is not None and not self._stream_done:
+            try:
+                self._cursor.close()
+            except Exception:
+                pass
+
+            self._stream_done = True
+
     def setLimit(self, limit: int) -> None:
         """Set limit."""
 
@@ -0,0 +1,271 @@
+"""
+PNSqlStats module.
+
+Keep timing statistics of the SQL statements launched through PNConnection.
+"""
+
+from pineboolib.core import settings
+from pineboolib.core.utils import logging
+
+import collections
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+from typing import Any, Deque, Dict, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pineboolib.interfaces import iconnection  # noqa: F401
+
+LOGGER = logging.getLogger(__name__)
+
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+CURSOR_NAME_RE = re.compile(r"\bcur_(\w+?)_\d+\b")
+WHITESPACE_RE = re.compile(r"\s+")
+
+PINEBOO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Módulos que lanzan sentencias en nombre de quien los llama.
+SQL_LAYER = tuple(
+    os.path.join(PINEBOO_DIR, *path)
+    for path in (
+        ("application", "database"),
+        ("plugins", "sql"),
+        ("fllegacy", "aqsobjects", "aqsql.py"),
+        ("fllegacy", "flsqlcursor.py"),
+        ("fllegacy", "flsqlquery.py"),
+        ("fllegacy", "flutil.py"),
+    )
+)
+TESTS_DIR = "%stests%s" % (os.sep, os.sep)
+
+
+class PNSqlStatement(object):
+    """PNSqlStatement class. Aggregated values of a statement fingerprint."""
+
+    connection: str
+    fingerprint: str
+    count: int
+    total: float
+    max: float
+    rows: int
+    samples: Deque[float]
+    callers: Dict[str, int]
+
+    def __init__(self, connection: str, fingerprint: str, samples: int) -> None:
+        """Inicialize."""
+
+        self.connection = connection
+        self.fingerprint = fingerprint
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.samples = collections.deque(maxlen=samples)
+        self.callers = {}
+
+    def percentile(self, percent: float) -> float:
+        """Return a percentile of the last samples, in milliseconds."""
+
+        if not self.samples:
+            return 0.0
+
+        values = sorted(self.samples)
+        return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the aggregated values."""
+
+        return {
+            "connection": self.connection,
+            "fingerprint": self.fingerprint,
+            "count": self.count,
+            "total_ms": round(self.total, 3),
+            "avg_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max, 3),
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "rows": self.rows,
+            "callers": dict(self.callers),
+        }
+
+
+class PNSqlStats(object):
+    """
+    PNSqlStats class.
+
+    Statements are grouped by connection and fingerprint (the SQL with the literals replaced
+    by "?"). ebcomportamiento/sql_stats enables the aggregates and statements slower than
+    ebcomportamiento/slow_query_ms milliseconds are written to ebcomportamiento/slow_query_log
+    (slow_queries.log in the temp dir by default). Both are disabled by default.
+    """
+
+    enabled: bool
+    slow_ms: float
+    log_file: str
+    max_samples: int
+    _statements: Dict[Any, PNSqlStatement]
+    _fingerprints: Dict[str, str]
+
+    def __init__(self) -> None:
+        """Inicialize."""
+
+        self._lock = threading.Lock()
+        self._statements = {}
+        self._fingerprints = {}
+        self.load_settings()
+
+    def load_settings(self) -> None:
+        """Read the configuration."""
+
+        self.enabled = settings.config.value("ebcomportamiento/sql_stats", False) in (True, "true",)
+        self.slow_ms = float(settings.config.value("ebcomportamiento/slow_query_ms", 0))
+        self.log_file = settings.config.value("ebcomportamiento/slow_query_log", "")
+        self.max_samples = int(settings.config.value("ebcomportamiento/sql_stats_samples", 200))
+
+    def start(self) -> float:
+        """Return the start time of a statement or 0 if nothing is measured."""
+
+        return time.perf_counter() if self.enabled or self.slow_ms else 0.0
+
+    def fingerprint(self, sql: str) -> str:
+        """Return the normalized SQL of a statement."""
+
+        result = self._fingerprints.get(sql)
+        if result is None:
+            result = STRING_RE.sub("?", sql)
+            result = NUMBER_RE.sub("?", result)
+            result = IN_LIST_RE.sub("(?)", result)
+            result = CURSOR_NAME_RE.sub(r"cur_\1", result)
+            result = WHITESPACE_RE.sub(" ", result).strip()
+            if len(self._fingerprints) > 1000:
+                self._fingerprints = {}
+            self._fingerprints[sql] = result
+
+        return result
+
+    def caller(self) -> str:
+        """Return the module and function that launched the statement."""
+
+        frame: Any = sys._getframe(2)
+        while frame is not None:
+            file_name = frame.f_code.co_filename
+            if not file_name.startswith(SQL_LAYER) or TESTS_DIR in file_name:
+                break
+            frame = frame.f_back
+
+        if frame is None:
+            return ""
+
+        return "%s:%s" % (
+            os.path.basename(frame.f_code.co_filename).split(".")[0],
+            frame.f_code.co_name,
+        )
+
+    def record(
+        self, conn: "iconnection.IConnection", sql: str, start: float, rows: Optional[int] = None
+    ) -> None:
+        """
+        Register a statement.
+
+        @param conn. Connection used.
+        @param sql. Statement.
+        @param start. Value returned by start().
+        @param rows. Rows returned or affected, if known.
+        """
+        elapsed = (time.perf_counter() - start) * 1000
+        caller = self.caller()
+        name = conn.connectionName()
+        if self.enabled:
+            fingerprint = self.fingerprint(sql)
+            with self._lock:
+                statement = self._statements.get((name, fingerprint))
+                if statement is None:
+                    statement = PNSqlStatement(name, fingerprint, self.max_samples)
+                    self._statements[(name, fingerprint)] = statement
+
+                statement.count += 1
+                statement.total += elapsed
+                statement.max = max(statement.max, elapsed)
+                statement.samples.append(elapsed)
+                if rows is not None and rows > 0:
+                    statement.rows += rows
+                statement.callers[caller] = statement.callers.get(caller, 0) + 1
+
+        if self.slow_ms and elapsed >= self.slow_ms:
+            self.log_slow(name, sql, elapsed, rows, caller)
+
+    def log_slow(
+        self, name: str, sql: str, elapsed: float, rows: Optional[int], caller: str
+    ) -> None:
+        """Write a statement to the slow query log."""
+
+        log_file = self.log_file
+        if not log_file:
+            from pineboolib import application
+
+            tmp_dir = getattr(application.PROJECT, "tmpdir", None)
+            if not tmp_dir:
+                return
+            log_file = os.path.join(tmp_dir, "slow_queries.log")
+
+        line = "%s\t%s\t%.3f ms\trows=%s\t%s\t%s\n" % (
+            time.strftime("%Y-%m-%d %H:%M:%S"),
+            name,
+            elapsed,
+            "?" if rows is None or rows < 0 else rows,
+            caller,
+            WHITESPACE_RE.sub(" ", sql).strip(),
+        )
+        try:
+            with self._lock:
+                with open(log_file, "a", encoding="UTF-8") as file_:
+                    file_.write(line)
+        except Exception as error:
+            LOGGER.warning("No se pudo escribir en %s: %s", log_file, error)
+
+    def summary(
+        self, connection: Optional[str] = None, order_by: str = "total_ms", limit: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the aggregated values of the statements.
+
+        @param connection. Connection name or None for all the connections.
+        @param order_by. Key used to sort the result, descending.
+        @param limit. Maximum number of statements, 0 for all.
+        """
+
+        with self._lock:
+            result = [
+                statement.to_dict()
+                for statement in self._statements.values()
+                if connection is None or statement.connection == connection
+            ]
+
+        result.sort(key=lambda item: item[order_by], reverse=True)
+        return result[:limit] if limit else result
+
+    def dump_json(self, connection: Optional[str] = None, limit: int = 0) -> str:
+        """Return the aggregated values as a JSON document."""
+
+        return json.dumps(
+            {
+                "enabled": self.enabled,
+                "slow_query_ms": self.slow_ms,
+                "statements": self.summary(connection, limit=limit),
+            }
+        )
+
+    def reset(self) -> None:
+        """Clear the statistics."""
+
+        with self._lock:
+            self._statements = {}
+
+
+SQL_STATS = PNSqlStats()
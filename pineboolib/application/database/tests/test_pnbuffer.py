@@ -182,6 +182,27 @@ class TestPNBuffer(unittest.TestCase):
 
         self.assertFalse(buffer_.field("new_field"))
 
+    def test_basic5(self) -> None:
+        """Basic test 5."""
+
+        cursor = pnsqlcursor.PNSqlCursor("fltest")
+        cursor.select()
+        cursor.first()
+
+        buffer_ = cursor.buffer()
+
+        if buffer_ is None:
+            raise Exception("buffer is empty!.")
+
+        fields_list = buffer_.fieldsList()
+        self.assertTrue(buffer_.fieldsList() is fields_list)
+        self.assertEqual(len(fields_list), buffer_.count())
+        for pos, field in enumerate(fields_list):
+            self.assertEqual(buffer_.indexField(field.name), pos)
+
+        self.assertTrue(buffer_.field(0) is fields_list[0])
+        self.assertEqual(buffer_.indexField("new_field"), None)
+
     @classmethod
     def tearDownClass(cls) -> None:
         """Ensure test clear all data."""
@@ -0,0 +1,52 @@
+"""Test_pncommitplan module."""
+
+import unittest
+from pineboolib.loader.main import init_testing, finish_testing
+from pineboolib.application.database import pnsqlcursor, pncommitplan
+
+
+class TestPNCommitPlan(unittest.TestCase):
+    """TestPNCommitPlan Class."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Ensure pineboo is initialized for testing."""
+        init_testing()
+
+    def test_basic_1(self) -> None:
+        """Plans are reused between commits."""
+
+        plans = pncommitplan.COMMIT_PLANS
+        plans.clear()
+        cursor = pnsqlcursor.PNSqlCursor("fltest")
+        cursor.setModeAccess(cursor.Insert)
+        cursor.refreshBuffer()
+        cursor.setValueBuffer("string_field", "commit plan")
+        self.assertTrue(cursor.commitBuffer())
+        plan = plans.plan(cursor)
+        self.assertEqual(plan.before_commit, None)
+        self.assertEqual(plan.after_commit, None)
+
+        cursor.setModeAccess(cursor.Del)
+        cursor.refreshBuffer()
+        self.assertTrue(cursor.commitBuffer())
+        self.assertTrue(plans.plan(cursor) is plan)
+
+        plans.clear("fltest")
+        self.assertFalse(plans.plan(cursor) is plan)
+
+    def test_basic_2(self) -> None:
+        """Hooks and relations are resolved."""
+
+        plan = pncommitplan.COMMIT_PLANS.plan(pnsqlcursor.PNSqlCursor("flfiles"))
+        self.assertEqual(plan.id_module, "sys")
+        self.assertTrue(plan.after_commit is not None)
+        self.assertEqual(plan.before_commit, None)
+
+        plan = pncommitplan.COMMIT_PLANS.plan(pnsqlcursor.PNSqlCursor("flareas"))
+        self.assertEqual([field.name() for field in plan.relation_fields], ["idarea"])
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Ensure test clear all data."""
+        finish_testing()
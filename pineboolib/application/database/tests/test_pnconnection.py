@@ -163,6 +163,42 @@ class TestPNConnection(unittest.TestCase):
         self.assertTrue(conn_default.doTransaction(cursor))
         self.assertTrue(conn_default.doRollback(cursor))
 
+    def test_sessions(self) -> None:
+        """Test connections are indexed by session and inactive ones are removed."""
+
+        import time
+
+        conn_manager = application.PROJECT.conn_manager
+        session = ["session_1"]
+        application.PROJECT.set_session_function(lambda: session[0])
+        try:
+            conn_1 = conn_manager.useConn("default")
+            self.assertTrue(conn_manager.useConn("default") is conn_1)
+            session[0] = "session_2"
+            conn_2 = conn_manager.useConn("default")
+            conn_manager.useConn("conn_test")
+            self.assertFalse(conn_1 is conn_2)
+            self.assertEqual([*conn_manager.dictDatabases()], ["default", "conn_test"])
+            self.assertTrue(conn_manager.dictDatabases()["default"] is conn_2)
+            self.assertTrue("session_1|default" in conn_manager.connections_dict.keys())
+
+            conn_manager.set_max_idle_connections(2)
+            conn_1._last_activity_time -= 100
+            for _ in range(30):
+                if "session_1|default" not in conn_manager.connections_dict.keys():
+                    break
+                time.sleep(0.1)
+            self.assertFalse("session_1|default" in conn_manager.connections_dict.keys())
+            self.assertFalse(conn_1.isOpen())
+            self.assertTrue(conn_manager.useConn("default") is conn_2)
+
+            conn_manager.removeSession()
+            self.assertFalse(conn_manager.dictDatabases())
+            self.assertFalse("session_2|conn_test" in conn_manager.connections_dict.keys())
+        finally:
+            conn_manager.set_max_idle_connections(0)
+            application.PROJECT._session_func_ = None
+
     @classmethod
     def tearDown(cls) -> None:
         """Ensure test clear all data."""
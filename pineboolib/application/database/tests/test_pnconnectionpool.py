@@ -0,0 +1,100 @@
+"""Test_pnconnectionpool module."""
+
+import threading
+import unittest
+from pineboolib.loader.main import init_testing, finish_testing
+from pineboolib.application.database import pnsqlcursor, utils
+from pineboolib import application
+
+
+class TestPNConnectionPool(unittest.TestCase):
+    """TestPNConnectionPool Class."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Ensure pineboo is initialized for testing."""
+        init_testing()
+
+    def setUp(self) -> None:
+        """Use a session per test."""
+        self.session = "pool_1"
+        application.PROJECT.set_session_function(lambda: self.session)
+
+    def test_basic_1(self) -> None:
+        """Released connections are reset and reused by other sessions."""
+
+        conn_manager = application.PROJECT.conn_manager
+        conn_default = conn_manager.useConn("default")
+        self.assertTrue(conn_default.isOpen())
+        cursor = pnsqlcursor.PNSqlCursor("flsettings", True, "default")
+        self.assertTrue(conn_default.doTransaction(cursor))
+        self.assertEqual(conn_default.transactionLevel(), 1)
+        self.assertTrue(utils.sql_insert("flsettings", "flkey,valor", "pool_test,1"))
+        self.assertTrue(cursor.select())
+        model = cursor.model()
+        self.assertTrue(model.driver_sql().getRow(0, model._curname, model.cursorDB()))
+        stats = conn_manager.pool_stats()
+        opened = list(conn_manager.dictDatabases().values())
+        drivers = [conn.driver() for conn in opened]
+
+        conn_manager.removeSession()
+        self.assertFalse(conn_manager.dictDatabases())
+        new_stats = conn_manager.pool_stats()
+        self.assertEqual(new_stats["released"], stats["released"] + len(opened))
+        self.assertEqual(new_stats["in_use"], stats["in_use"] - len(opened))
+        self.assertEqual(conn_default.transactionLevel(), 0)
+        self.assertFalse(conn_default.isOpen())
+        with self.assertRaises(Exception):  # La conexión liberada no se puede seguir usando.
+            conn_default.driver()
+        with self.assertRaises(Exception):
+            conn_default.cursor()
+        self.assertTrue(all(driver.conn_ is None for driver in drivers))
+        with self.assertRaises(Exception):  # Ni los modelos de la sesión.
+            model.driver_sql().getRow(0, model._curname, model.cursorDB())
+
+        self.session = "pool_2"
+        conn_default_2 = conn_manager.useConn("default")
+        self.assertFalse(any(conn_default_2 is conn for conn in opened))
+        self.assertFalse(any(conn_default_2.driver() is driver for driver in drivers))
+        self.assertTrue(conn_default_2.driver().db_ is conn_default_2)
+        self.assertTrue(conn_default_2.isOpen())
+        self.assertEqual(conn_default_2.connectionName(), "default")
+        self.assertEqual(conn_manager.pool_stats()["reused"], stats["reused"] + 1)
+        conn_manager.removeSession()
+
+    def test_basic_2(self) -> None:
+        """When every connection is in use, the next session waits for one."""
+
+        conn_manager = application.PROJECT.conn_manager
+        conn_manager._pool.clear()
+        conn_manager.useConn("default")
+        limit = conn_manager.limit_connections
+        wait_time = conn_manager.connections_wait_time
+        conn_manager.set_max_connections_limit(conn_manager.pool_stats()["in_use"])
+        conn_manager.set_max_wait_time(1)
+        try:
+            self.session = "pool_3"
+            with self.assertRaises(Exception):
+                conn_manager.useConn("dbAux")
+            self.assertEqual(conn_manager.pool_stats()["timeouts"], 1)
+
+            timer = threading.Timer(0.2, conn_manager.removeSession, ["pool_1"])
+            timer.start()
+            conn_aux = conn_manager.useConn("dbAux")
+            timer.join()
+            self.assertTrue(conn_aux.isOpen())
+            self.assertEqual(conn_aux.connectionName(), "dbAux")
+            self.assertEqual(conn_manager.pool_stats()["waits"], 2)
+            conn_manager.removeSession()
+        finally:
+            conn_manager.set_max_connections_limit(limit)
+            conn_manager.set_max_wait_time(wait_time)
+
+    def tearDown(self) -> None:
+        """Restore the session."""
+        application.PROJECT._session_func_ = None
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Ensure test clear all data."""
+        finish_testing()
@@ -0,0 +1,98 @@
+"""Test_pncounters module."""
+
+import unittest
+from unittest import mock
+from pineboolib.loader.main import init_testing, finish_testing
+from pineboolib.application.database import pnsqlcursor, pncounters, utils
+
+from typing import Any, Callable, List
+
+
+class TestPNCounters(unittest.TestCase):
+    """TestPNCounters Class."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Ensure pineboo is initialized for testing."""
+        init_testing()
+
+    def test_basic_1(self) -> None:
+        """Numbers not saved are offered again."""
+
+        cursor = pnsqlcursor.PNSqlCursor("fltest3")
+        self.assertEqual(utils.next_counter("Y", "counter", cursor), "00001")
+        self.assertEqual(utils.next_counter("Y", "counter", cursor), "00001")
+        utils.sql_insert("fltest3", "counter,string_field", "Y00001,Contador 1")
+        self.assertEqual(utils.next_counter("Y", "counter", cursor), "00002")
+
+        # Valores grabados sin pasar por nextCounter.
+        utils.sql_insert("fltest3", "counter,string_field", "Y00002,Contador 2")
+        utils.sql_insert("fltest3", "counter,string_field", "Y00003,Contador 3")
+        self.assertEqual(utils.next_counter("Y", "counter", cursor), "00004")
+        self.assertEqual(
+            utils.sql_select("flseqs", "seq", "tabla = 'fltest3:counter:Y'", "flseqs"), 3
+        )
+
+        # Si se borra el último, se vuelve a ofrecer su número.
+        self.assertTrue(utils.sql_delete("fltest3", "counter = 'Y00003'"))
+        self.assertEqual(utils.next_counter("Y", "counter", cursor), "00003")
+        self.assertEqual(
+            utils.sql_select("flseqs", "seq", "tabla = 'fltest3:counter:Y'", "flseqs"), 2
+        )
+        self.assertTrue(utils.sql_delete("fltest3", "counter LIKE 'Y%'"))
+        self.assertEqual(utils.next_counter("Y", "counter", cursor), "00001")
+
+    def test_basic_2(self) -> None:
+        """Numbers are reserved in blocks."""
+
+        counters = pncounters.COUNTERS
+        cursor = pnsqlcursor.PNSqlCursor("fltest3")
+        utils.sql_insert("fltest3", "counter,string_field", "Z00007,Contador 7")
+        counters.reserve = True
+        counters.block_size = 3
+        try:
+            self.assertEqual(utils.next_counter("Z", "counter", cursor), "00008")
+            self.assertEqual(utils.next_counter("Z", "counter", cursor), "00009")
+            self.assertEqual(
+                utils.sql_select("flseqs", "seq", "tabla = 'fltest3:counter:Z'", "flseqs"), 10
+            )
+            utils.sql_insert("fltest3", "counter,string_field", "Z00010,Contador 10")
+            self.assertEqual(utils.next_counter("Z", "counter", cursor), "00011")
+            self.assertEqual(
+                utils.sql_select("flseqs", "seq", "tabla = 'fltest3:counter:Z'", "flseqs"), 13
+            )
+        finally:
+            counters.load_settings()
+            counters.reset()
+
+        self.assertTrue(utils.sql_delete("fltest3", "counter LIKE 'Z%'"))
+
+    def test_basic_3(self) -> None:
+        """flseqs is used through dbAux, out of the transaction of the cursor."""
+
+        cursor = pnsqlcursor.PNSqlCursor("fltest3")
+        conn_aux = cursor.db().connManager().dbAux()
+        queries: List[str] = []
+        with mock.patch.object(
+            conn_aux, "execute_query", side_effect=self._record(conn_aux, queries)
+        ):
+            self.assertEqual(utils.next_counter("W", "counter", cursor), "00001")
+
+        self.assertTrue(queries)
+        self.assertTrue(all("flseqs" in query for query in queries))
+
+    def _record(self, conn: Any, queries: List[str]) -> Callable[..., Any]:
+        """Return a function that records the queries and executes them."""
+
+        execute_query = conn.execute_query
+
+        def record(qry: str, *args: Any) -> Any:
+            queries.append(qry)
+            return execute_query(qry, *args)
+
+        return record
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Ensure test clear all data."""
+        finish_testing()
@@ -1,8 +1,13 @@
 """Test_pncursortablemodel module."""
 
 import unittest
+from unittest import mock
+from PyQt5 import QtCore, QtWidgets
 from pineboolib.loader.main import init_testing, finish_testing
-from pineboolib.application.database import pnsqlcursor
+from pineboolib.application.database import pnsqlcursor, pnsizecache, pncursortablemodel
+from pineboolib.core import settings
+
+from typing import Any, Callable, List
 
 
 class TestPNCursorTableModel(unittest.TestCase):
@@ -217,3 +222,245 @@ class TestFetchMore(unittest.TestCase):
     def tearDownClass(cls) -> None:
         """Ensure test clear all data."""
         finish_testing()
+
+
+class TestIncrementalInsert(unittest.TestCase):
+    """TestIncrementalInsert Class."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Ensure pineboo is initialized for testing."""
+        init_testing()
+
+    def test_basic_1(self) -> None:
+        """Inserted rows are added to the model without refresh."""
+
+        cursor = pnsqlcursor.PNSqlCursor("fltest")
+        cursor.select()
+        model = cursor.model()
+        size = cursor.size()
+        for number in range(3):
+            cursor.setModeAccess(cursor.Insert)
+            self.assertTrue(cursor.refreshBuffer())
+            cursor.setValueBuffer("string_field", "Incremental %s" % number)
+            self.assertTrue(cursor.commitBuffer())
+            self.assertEqual(cursor.at(), size + number)
+            self.assertEqual(cursor.valueBuffer("string_field"), "Incremental %s" % number)
+
+        self.assertEqual(model._declared_rows, size)
+        self.assertEqual(len(model._inserted_rows), 3)
+        self.assertEqual(cursor.size(), size + 3)
+        self.assertEqual(model.findPKRow([cursor.valueBuffer("id")]), size + 2)
+        self.assertTrue(cursor.first())
+        self.assertTrue(cursor.last())
+        self.assertEqual(cursor.valueBuffer("string_field"), "Incremental 2")
+
+        cursor.select()
+        self.assertEqual(model._inserted_rows, [])
+        self.assertEqual(cursor.size(), size + 3)
+
+    def test_basic_2(self) -> None:
+        """Filtered and sorted cursors."""
+
+        cursor = pnsqlcursor.PNSqlCursor("fltest")
+        cursor.select("string_field LIKE 'Incremental%'")
+        model = cursor.model()
+        cursor.setModeAccess(cursor.Insert)
+        self.assertTrue(cursor.refreshBuffer())
+        cursor.setValueBuffer("string_field", "Incremental 3")
+        self.assertTrue(cursor.commitBuffer())
+        self.assertEqual(len(model._inserted_rows), 1)
+        self.assertEqual(cursor.size(), 4)
+
+        cursor.setSort("string_field DESC")
+        cursor.select("string_field LIKE 'Incremental%'")
+        cursor.setModeAccess(cursor.Insert)
+        self.assertTrue(cursor.refreshBuffer())
+        cursor.setValueBuffer("string_field", "Incremental 4")
+        self.assertTrue(cursor.commitBuffer())
+        self.assertEqual(model._inserted_rows, [])
+        self.assertEqual(cursor.size(), 5)
+        self.assertEqual(cursor.at(), 0)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Ensure test clear all data."""
+        finish_testing()
+
+
+class TestPKIndex(unittest.TestCase):
+    """TestPKIndex Class."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Ensure pineboo is initialized for testing."""
+        init_testing()
+
+    def test_basic_1(self) -> None:
+        """Rows read are indexed by primary key."""
+
+        cursor = pnsqlcursor.PNSqlCursor("fltest")
+        for number in range(5):
+            cursor.setModeAccess(cursor.Insert)
+            cursor.refreshBuffer()
+            cursor.setValueBuffer("string_field", "PK index %s" % number)
+            self.assertTrue(cursor.commitBuffer())
+
+        cursor.select("string_field LIKE 'PK index%'")
+        model = cursor.model()
+        self.assertEqual(model.pkidx, {})
+        pk_list = []
+        while cursor.next():
+            pk_list.append(cursor.valueBuffer("id"))
+
+        self.assertEqual(len(pk_list), 5)
+        for number, pk_value in enumerate(pk_list):
+            self.assertEqual(model.pkidx[(pk_value,)], number)
+            self.assertEqual(model.findPKRow([pk_value]), number)
+
+        self.assertTrue(cursor.selection_pk(pk_list[2]))
+        self.assertEqual(cursor.at(), 2)
+        self.assertFalse(cursor.selection_pk(-1))
+        self.assertFalse(cursor.selection_pk(None))
+
+    def test_basic_2(self) -> None:
+        """Prefetch mode loads the whole index in one query."""
+
+        cursor = pnsqlcursor.PNSqlCursor("fltest")
+        model = cursor.model()
+        model.set_pk_prefetch(True)
+        cursor.setSort("string_field DESC")
+        cursor.select("string_field LIKE 'PK index%'")
+        self.assertTrue(model.where_filter.endswith("ORDER BY string_field DESC, id"))
+        self.assertEqual(model.pkidx, {})
+
+        cursor.last()
+        pk_value = cursor.valueBuffer("id")
+        self.assertEqual(cursor.valueBuffer("string_field"), "PK index 0")
+        model.pkidx = {}
+        self.assertEqual(model.findPKRow([pk_value]), 4)
+        self.assertTrue(model._pk_index_complete)
+        self.assertEqual(len(model.pkidx), 5)
+        self.assertEqual(model.findPKRow([-1]), None)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Ensure test clear all data."""
+        finish_testing()
+
+
+class FakeThread(object):
+    """FakeThread class. Run the target when started, in the same thread."""
+
+    def __init__(self, target: Callable[..., Any], args: Any) -> None:
+        """Inicialize."""
+        self._target = target
+        self._args = args
+
+    def start(self) -> None:
+        """Run the target."""
+        self._target(*self._args)
+
+
+class TestLazyCount(unittest.TestCase):
+    """TestLazyCount Class."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Ensure pineboo is initialized for testing."""
+        init_testing()
+        settings.config.set_value("ebcomportamiento/lazy_count_block", 2)
+
+    def test_basic_1(self) -> None:
+        """Rows are offered in blocks until the count arrives."""
+
+        cursor = pnsqlcursor.PNSqlCursor("fltest")
+        for number in range(5):
+            cursor.setModeAccess(cursor.Insert)
+            cursor.refreshBuffer()
+            cursor.setValueBuffer("string_field", "lazy %s" % number)
+            self.assertTrue(cursor.commitBuffer())
+
+        model = cursor.model()
+        model.set_lazy_count(True)
+        cursor.select("string_field LIKE 'lazy%'")
+        self.assertTrue(model.lazy_count_pending())
+        self.assertEqual(model.rowCount(), 2)
+        self.assertTrue(model.canFetchMore(QtCore.QModelIndex()))
+        model.fetchMore(QtCore.QModelIndex())
+        self.assertEqual(model.rowCount(), 4)
+        self.assertTrue(cursor.seek(3))
+        self.assertEqual(cursor.valueBuffer("string_field"), "lazy 3")
+        self.assertTrue(model.lazy_count_pending())
+
+        QtWidgets.QApplication.processEvents()
+        self.assertFalse(model.lazy_count_pending())
+        self.assertFalse(model.canFetchMore(QtCore.QModelIndex()))
+        self.assertEqual(model.rowCount(), 5)
+
+        model.refresh()
+        self.assertFalse(model.lazy_count_pending())
+        self.assertEqual(model.rowCount(), 5)
+
+    def test_basic_2(self) -> None:
+        """size() forces the count and the end of the cursor finishes it."""
+
+        cursor = pnsqlcursor.PNSqlCursor("fltest")
+        model = cursor.model()
+        model.set_lazy_count(True)
+        pnsizecache.SIZE_CACHE.clear()
+        cursor.select("string_field LIKE 'lazy%'")
+        self.assertEqual(model.rowCount(), 2)
+        self.assertEqual(cursor.size(), 5)
+        self.assertEqual(model.rowCount(), 5)
+        self.assertFalse(model.canFetchMore(QtCore.QModelIndex()))
+        self.assertTrue(cursor.last())
+        self.assertEqual(cursor.valueBuffer("string_field"), "lazy 4")
+
+        pnsizecache.SIZE_CACHE.clear()
+        cursor.select("string_field = 'lazy 1'")
+        self.assertFalse(model.lazy_count_pending())
+        self.assertEqual(model.rowCount(), 1)
+
+    def test_basic_3(self) -> None:
+        """The background count uses a connection of its own, unless a transaction is open."""
+
+        cursor = pnsqlcursor.PNSqlCursor("fltest")
+        model = cursor.model()
+        model.set_lazy_count(True)
+        conn_manager = cursor.db().connManager()
+        leased: List[Any] = []
+        lease_conn = conn_manager.leaseConn
+
+        def lease(name: str, timeout: float = 0) -> Any:
+            leased.append(lease_conn(name, timeout))
+            return leased[-1]
+
+        with mock.patch.object(
+            model.driver_sql(), "useThreads", return_value=True
+        ), mock.patch.object(conn_manager, "leaseConn", side_effect=lease), mock.patch.object(
+            pncursortablemodel.threading, "Thread", FakeThread
+        ):
+            in_use = conn_manager.pool_stats()["in_use"]
+            pnsizecache.SIZE_CACHE.clear()
+            cursor.select("string_field LIKE 'lazy%'")
+            self.assertFalse(model.lazy_count_pending())
+            self.assertEqual(model.rowCount(), 5)
+            self.assertEqual(len(leased), 1)
+            self.assertFalse(leased[0] is cursor.db())
+            self.assertEqual(conn_manager.pool_stats()["in_use"], in_use)
+
+            self.assertTrue(cursor.db().doTransaction(cursor))
+            try:
+                pnsizecache.SIZE_CACHE.clear()
+                cursor.select("string_field LIKE 'lazy%'")
+                self.assertTrue(model.lazy_count_pending())
+                self.assertEqual(len(leased), 1)
+            finally:
+                self.assertTrue(cursor.db().doRollback(cursor))
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Ensure test clear all data."""
+        settings.config.set_value("ebcomportamiento/lazy_count_block", 200)
+        finish_testing()
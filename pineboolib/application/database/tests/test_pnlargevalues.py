@@ -0,0 +1,107 @@
+"""Test_pnlargevalues module."""
+
+import unittest
+from pineboolib.loader.main import init_testing, finish_testing
+from pineboolib.application.database import pnlargevalues, pnsqlquery
+from pineboolib.core import settings
+from pineboolib import application
+
+XPM = '/* XPM */\nstatic char * prueba_%s_xpm[] = {\n"1 1 1 1",\n"  c None",\n" "};\n'
+
+
+class TestPNLargeValues(unittest.TestCase):
+    """TestPNLargeValues Class."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Ensure pineboo is initialized for testing."""
+        init_testing()
+
+    def test_basic_1(self) -> None:
+        """The least recently used contents are dropped."""
+
+        large_values = pnlargevalues.LARGE_VALUES
+        large_values.clear()
+        settings.config.set_value("ebcomportamiento/large_value_cache_kb", 1)
+        try:
+            large_values.set("RK@a", "a" * 400)
+            large_values.set("RK@b", "b" * 400)
+            self.assertEqual(large_values.get("RK@a"), "a" * 400)
+            large_values.set("RK@c", "c" * 400)
+            self.assertEqual(large_values.size(), 800)
+            self.assertFalse(large_values.contains("RK@b"))
+            self.assertTrue(large_values.contains("RK@a"))
+            large_values.set("RK@d", "d" * 2000)
+            self.assertFalse(large_values.contains("RK@d"))
+        finally:
+            settings.config.set_value("ebcomportamiento/large_value_cache_kb", 16384)
+            large_values.clear()
+
+    def test_basic_2(self) -> None:
+        """Several large values are read with one query."""
+
+        manager = application.PROJECT.conn_manager.manager()
+        large_values = pnlargevalues.LARGE_VALUES
+        mtd = manager.metadata("fltest")
+        self.assertTrue(mtd)
+        ref_keys = [manager.storeLargeValue(mtd, XPM % number) for number in range(5)]  # type: ignore
+        large_values.clear()
+
+        self.assertEqual(manager.prefetchLargeValues(ref_keys + [None, "texto"]), 5)
+        self.assertEqual(manager.prefetchLargeValues(ref_keys), 0)
+        file_name = manager.fetchLargeValue(ref_keys[3])
+        self.assertTrue(file_name.endswith("prueba_3_xpm.xpm"))  # type: ignore
+        self.assertEqual(large_values.hits, 1)
+
+        # La lectura de un pixmap resuelve las referencias de las filas siguientes.
+        large_values.clear()
+        conn = application.PROJECT.conn_manager.useConn("default")
+        for number, ref_key in enumerate(ref_keys):
+            conn.execute_query(
+                "INSERT INTO flmodules (idmodulo, idarea, descripcion, version, icono, bloqueo) "
+                "VALUES ('lv%s', 'sys', 'Prueba', '0.0', '%s', %s)"
+                % (number, ref_key, conn.driver().formatValue("bool", True, False))
+            )
+            self.assertFalse(conn.lastError())
+
+        qry = pnsqlquery.PNSqlQuery()
+        qry.setTablesList("flmodules")
+        qry.setSelect("idmodulo,icono")
+        qry.setFrom("flmodules")
+        qry.setWhere("idmodulo LIKE 'lv%'")
+        qry.setOrderBy("idmodulo")
+        settings.config.set_value("ebcomportamiento/large_value_window", 2)
+        try:
+            self.assertTrue(qry.exec_())
+            self.assertTrue(qry.next())
+            self.assertEqual(large_values.size(), 0)
+            qry.value("icono", True)  # Sin lectura anticipada.
+            cached = [large_values.contains(ref_key) for ref_key in ref_keys]  # type: ignore
+            self.assertEqual(cached, [True, False, False, False, False])
+            qry.value("icono")
+            cached = [large_values.contains(ref_key) for ref_key in ref_keys]  # type: ignore
+            self.assertEqual(cached, [True, True, False, False, False])
+            self.assertTrue(qry.seek(3))
+            qry.value("icono")
+            cached = [large_values.contains(ref_key) for ref_key in ref_keys]  # type: ignore
+            self.assertEqual(cached, [True, True, False, True, True])
+
+            # No se leen más contenidos de los que caben en la caché.
+            big_keys = [
+                manager.storeLargeValue(mtd, XPM % ("big%s_" % number + "x" * 400))  # type: ignore
+                for number in range(4)
+            ]
+            large_values.clear()
+            settings.config.set_value("ebcomportamiento/large_value_cache_kb", 1)
+            self.assertEqual(manager.prefetchLargeValues(big_keys), 2)
+        finally:
+            settings.config.set_value("ebcomportamiento/large_value_window", 50)
+            settings.config.set_value("ebcomportamiento/large_value_cache_kb", 16384)
+
+        conn.execute_query("DELETE FROM flmodules WHERE idmodulo LIKE 'lv%'")
+        large_values.clear()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Ensure test clear all data."""
+        finish_testing()
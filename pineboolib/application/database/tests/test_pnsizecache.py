@@ -0,0 +1,96 @@
+"""Test_pnsizecache module."""
+
+import unittest
+from pineboolib.loader.main import init_testing, finish_testing
+from pineboolib.application.database import pnsqlcursor, pnsqlquery, pnsizecache
+from pineboolib import application
+
+
+class TestPNSizeCache(unittest.TestCase):
+    """TestPNSizeCache Class."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Ensure pineboo is initialized for testing."""
+        init_testing()
+
+    def test_basic_1(self) -> None:
+        """Sizes are reused until the table is modified."""
+
+        cache = pnsizecache.SIZE_CACHE
+        cursor = pnsqlcursor.PNSqlCursor("fltest")
+        cursor.select()
+        size = cursor.size()
+        hits = cache.hits
+        cursor.refresh()
+        self.assertEqual(cache.hits, hits + 1)
+        self.assertEqual(cursor.size(), size)
+
+        cursor.setModeAccess(cursor.Insert)
+        cursor.refreshBuffer()
+        cursor.setValueBuffer("string_field", "size cache")
+        self.assertTrue(cursor.commitBuffer())
+        cursor.refresh()
+        self.assertEqual(cache.hits, hits + 1)
+        self.assertEqual(cursor.size(), size + 1)
+
+        qry = pnsqlquery.PNSqlQuery()
+        self.assertTrue(qry.exec_("DELETE FROM fltest WHERE string_field = 'size cache'"))
+        cursor.refresh()
+        self.assertEqual(cursor.size(), size)
+
+    def test_basic_2(self) -> None:
+        """Filters referencing other tables."""
+
+        cache = pnsizecache.SIZE_CACHE
+        conn = pnsqlcursor.PNSqlCursor("fltest").db()
+        cache.set(conn, "fltest", "id IN (SELECT id FROM fltest2)", 10)
+        cache.set(conn, "fltest", "1 = 1", 20)
+        self.assertEqual(cache.get(conn, "fltest", "id IN  (SELECT id FROM fltest2)"), 10)
+        cache.invalidate_sql("update fltest2 set string_field = 'x'")
+        self.assertEqual(cache.get(conn, "fltest", "id IN (SELECT id FROM fltest2)"), None)
+        self.assertEqual(cache.get(conn, "fltest", "1 = 1"), 20)
+        cache.invalidate("FLTEST")
+        self.assertEqual(cache.get(conn, "fltest", "1 = 1"), None)
+
+    def test_basic_3(self) -> None:
+        """A stale size is counted again when the declared cursor does not end there."""
+
+        cache = pnsizecache.SIZE_CACHE
+        cursor = pnsqlcursor.PNSqlCursor("fltest")
+        cursor.select()
+        size = cursor.size()
+        model = cursor.model()
+        cache.set(cursor.db(), "fltest", model._count_where(), size + 3)
+        model.refresh()
+        self.assertEqual(model.rows, size)
+        self.assertEqual(cache.get(cursor.db(), "fltest", model._count_where()), size)
+
+        # Filas insertadas por otro proceso, sin invalidar la caché.
+        cache.set(cursor.db(), "fltest", model._count_where(), size)
+        raw_cursor = cursor.db().cursor()
+        raw_cursor.execute("INSERT INTO fltest (string_field, bloqueo) VALUES ('size cache 1', 0)")
+        raw_cursor.execute("INSERT INTO fltest (string_field, bloqueo) VALUES ('size cache 2', 0)")
+        model.refresh()
+        self.assertEqual(model.rows, size + 2)
+
+        cache.set(cursor.db(), "fltest", model._count_where(), size + 2)
+        raw_cursor.execute("DELETE FROM fltest WHERE string_field LIKE 'size cache %'")
+        model.refresh()
+        self.assertEqual(model.rows, size)
+        self.assertEqual(cache.get(cursor.db(), "fltest", model._count_where()), size)
+
+    def test_basic_4(self) -> None:
+        """Connections are identified by session and name, not by the wrapper object."""
+
+        cache = pnsizecache.SIZE_CACHE
+        conn = pnsqlcursor.PNSqlCursor("fltest").db()
+        cache.set(conn, "fltest", "1 = 1", 7)
+        self.assertEqual(cache.conn_key(conn), (application.PROJECT.session_id(), "default"))
+        self.assertEqual(cache.get(conn.connManager().useConn("default"), "fltest", "1 = 1"), 7)
+        self.assertEqual(cache.get(conn.connManager().useConn("dbAux"), "fltest", "1 = 1"), None)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Ensure test clear all data."""
+        finish_testing()
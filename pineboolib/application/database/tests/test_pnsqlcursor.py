@@ -909,5 +909,60 @@ class TestCorruption(unittest.TestCase):
         finish_testing()
 
 
+class TestInsertBulk(unittest.TestCase):
+    """TestInsertBulk Class."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Ensure pineboo is initialized for testing."""
+        init_testing()
+
+    def test_basic_1(self) -> None:
+        """Insert records with defaults and serials."""
+
+        cursor = pnsqlcursor.PNSqlCursor("fltest")
+        cursor.select()
+        size = cursor.size()
+        records = [{"string_field": "bulk %s" % number} for number in range(120)]
+        records[5]["string_field"] = "bulk 'quoted'"
+        records[6]["double_field"] = 5.5
+        self.assertTrue(cursor.insertBulk(records, 50))
+        self.assertEqual(cursor.size(), size + 120)
+
+        cursor.select("string_field LIKE 'bulk %quoted%'")
+        self.assertTrue(cursor.first())
+        self.assertEqual(cursor.valueBuffer("double_field"), 0)
+        self.assertFalse(cursor.valueBuffer("bool_field"))
+        cursor.select("double_field = 5.5")
+        self.assertEqual(cursor.size(), 1)
+        self.assertTrue(cursor.first())
+        self.assertEqual(cursor.valueBuffer("string_field"), "bulk 6")
+
+    def test_basic_2(self) -> None:
+        """Insert records with counters."""
+
+        cursor = pnsqlcursor.PNSqlCursor("fltest3")
+        cursor.setModeAccess(cursor.Insert)
+        cursor.refreshBuffer()
+        cursor.setValueBuffer("string_field", "first")
+        self.assertTrue(cursor.commitBuffer())
+        first = cursor.valueBuffer("counter")
+
+        self.assertTrue(cursor.insertBulk([{"string_field": "bulk"}] * 3))
+        cursor.setSort("counter ASC")
+        cursor.select("string_field = 'bulk'")
+        counters = []
+        while cursor.next():
+            counters.append(cursor.valueBuffer("counter"))
+        self.assertEqual(
+            counters, [str(int(first) + number).rjust(6, "0") for number in range(1, 4)]
+        )
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Ensure test clear all data."""
+        finish_testing()
+
+
 if __name__ == "__main__":
     unittest.main()
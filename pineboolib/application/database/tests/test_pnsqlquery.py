@@ -3,8 +3,11 @@
 import unittest
 from pineboolib.loader.main import init_testing, finish_testing
 from pineboolib.application.database import pnsqlquery, pnsqlcursor
+from pineboolib.core import settings
 from . import fixture_path
 
+from typing import List
+
 
 class TestPNSqlQuery1(unittest.TestCase):
     """TestPNSqlDrivers Class."""
@@ -286,6 +289,167 @@ class TestPNSqlQuery1(unittest.TestCase):
         self.assertTrue(sql.lower().find("order by") > -1)
         self.assertEqual(qry_tree.size(), 4)
 
+    def test_compile_query(self) -> None:
+        """Test placeholders translation."""
+        from pineboolib.plugins.sql import pnsqlschema
+
+        driver = pnsqlschema.PNSqlSchema()
+        self.assertEqual(
+            driver.compile_query("SELECT * FROM t WHERE a = :a AND b LIKE '%:b?' AND c = :a"),
+            ("SELECT * FROM t WHERE a = %s AND b LIKE '%%:b?' AND c = %s", ["a", "a"]),
+        )
+        self.assertEqual(
+            driver.compile_query("SELECT a::text FROM t WHERE a = ? OR b = ?", "dollar"),
+            ("SELECT a::text FROM t WHERE a = $1 OR b = $2", [0, 1]),
+        )
+        self.assertEqual(driver.compile_query("SELECT '100%' FROM t"), ("SELECT '100%' FROM t", []))
+        self.assertEqual(
+            driver.normalize_query(" SELECT  a,\n b FROM t WHERE c = 'x  y' "),
+            "SELECT a, b FROM t WHERE c = 'x  y'",
+        )
+        with self.assertRaises(ValueError):
+            driver.compile_query("SELECT * FROM t WHERE a = ? AND b = :b")
+
+    def test_query_params(self) -> None:
+        """Test queries with bound parameters."""
+
+        cursor = pnsqlcursor.PNSqlCursor("fltest")
+        for text in ("bound 'one'", "bound 100%", "bound three"):
+            cursor.setModeAccess(cursor.Insert)
+            cursor.refreshBuffer()
+            cursor.setValueBuffer("string_field", text)
+            self.assertTrue(cursor.commitBuffer())
+
+        conn = cursor.db()
+        stats = conn.prepared_stats()
+        qry = pnsqlquery.PNSqlQuery()
+        self.assertTrue(
+            qry.exec_("SELECT string_field FROM fltest WHERE string_field = ?", ["bound 'one'"])
+        )
+        self.assertTrue(qry.next())
+        self.assertEqual(qry.value(0), "bound 'one'")
+        self.assertTrue(
+            qry.exec_("SELECT  string_field FROM fltest\n WHERE string_field = ?", ["bound 100%"])
+        )
+        self.assertEqual(qry.size(), 1)
+        self.assertTrue(
+            qry.exec_(
+                "SELECT string_field FROM fltest WHERE string_field LIKE 'bound%' "
+                "AND string_field <> :text ORDER BY string_field",
+                {"text": "bound three"},
+            )
+        )
+        self.assertEqual(qry.size(), 2)
+        new_stats = conn.prepared_stats()
+        self.assertEqual(new_stats["misses"], stats["misses"] + 2)
+        self.assertEqual(new_stats["hits"], stats["hits"] + 1)
+
+        self.assertFalse(qry.exec_("SELECT string_field FROM fltest WHERE id = ?", []))
+        conn.execute_params("DELETE FROM fltest WHERE string_field LIKE :text", {"text": "bound%"})
+        self.assertFalse(conn.lastError())
+
+    def test_streaming(self) -> None:
+        """Test forward only queries are read in batches."""
+
+        cursor = pnsqlcursor.PNSqlCursor("fltest")
+        for number in range(5):
+            cursor.setModeAccess(cursor.Insert)
+            cursor.refreshBuffer()
+            cursor.setValueBuffer("string_field", "stream %s" % number)
+            self.assertTrue(cursor.commitBuffer())
+
+        driver = pnsqlquery.PNSqlQuery().db().driver()
+        stream_cursors: List[bool] = []
+        stream_cursor = driver.streamCursor
+        driver.streamCursor = lambda exclusive=False: (  # type: ignore [assignment]
+            stream_cursors.append(exclusive) or stream_cursor(exclusive)
+        )
+        settings.config.set_value("ebcomportamiento/query_stream_batch", 2)
+        try:
+            qry = pnsqlquery.PNSqlQuery()
+            qry.setForwardOnly(True)
+            self.assertTrue(qry.isStreaming())
+            sql = "SELECT string_field FROM fltest WHERE string_field LIKE 'stream%' ORDER BY id"
+            self.assertTrue(qry.exec_(sql))
+            self.assertEqual(len(qry._datos), 2)
+            values = []
+            while qry.next():
+                values.append(qry.value(0))
+                self.assertTrue(len(qry._datos) <= 2)
+            self.assertEqual(values, ["stream %s" % number for number in range(5)])
+            self.assertEqual(qry.size(), 5)
+            self.assertEqual(stream_cursors, [])  # Forward only no usa cursores de servidor.
+            self.assertTrue(qry.exec_(sql))
+            self.assertEqual(qry.size(), 5)  # Se lee el resto, sin SELECT COUNT.
+            self.assertTrue(qry.seek(3))
+            self.assertEqual(qry.value(0), "stream 3")
+            self.assertTrue(qry.seek(1))
+            self.assertEqual(qry.value(0), "stream 1")
+            self.assertTrue(qry.last())
+            self.assertEqual(qry.value(0), "stream 4")
+            self.assertEqual(qry.at(), 4)
+
+            qry_2 = pnsqlquery.PNSqlQuery()
+            qry_2.setStreaming()
+            self.assertTrue(qry_2.exec_(sql.replace("LIKE 'stream%'", "= 'stream 3'")))
+            self.assertEqual(stream_cursors, [True])
+            self.assertEqual(qry_2.size(), 1)
+            self.assertTrue(qry_2.first())
+            self.assertFalse(qry_2.next())
+        finally:
+            del driver.streamCursor
+            settings.config.set_value("ebcomportamiento/query_stream_batch", 500)
+
+        qry = pnsqlquery.PNSqlQuery()
+        self.assertTrue(qry.exec_("DELETE FROM fltest WHERE string_field LIKE 'stream%'"))
+
+    def test_values_batch(self) -> None:
+        """Test rows are converted as value() does."""
+
+        cursor = pnsqlcursor.PNSqlCursor("fltest")
+        for number in range(3):
+            cursor.setModeAccess(cursor.Insert)
+            cursor.refreshBuffer()
+            cursor.setValueBuffer("string_field", "batch %s" % number)
+            cursor.setValueBuffer("double_field", number + 0.5)
+            cursor.setValueBuffer("bool_field", number == 1)
+            if number:
+                cursor.setValueBuffer("date_field", "2020-01-0%s" % number)
+            self.assertTrue(cursor.commitBuffer())
+
+        sql = (
+            "SELECT string_field,double_field,bool_field,date_field FROM fltest"
+            " WHERE string_field LIKE 'batch%' ORDER BY id"
+        )
+        qry = pnsqlquery.PNSqlQuery()
+        self.assertTrue(qry.exec_(sql))
+        self.assertEqual(len(qry.sql_inspector.converters()), 4)
+        values = qry.values_batch()
+        self.assertEqual(len(values), 3)
+        expected = []
+        while qry.next():
+            expected.append([qry.value(pos) for pos in range(4)])
+        self.assertEqual(values, expected)
+        self.assertEqual(values[1][:3], ["batch 1", 1.5, True])
+        self.assertEqual(values[0][3], "")
+        self.assertEqual(str(values[2][3]), "2020-01-02T00:00:00")
+        self.assertEqual(list(qry.rows()), values)
+
+        settings.config.set_value("ebcomportamiento/query_stream_batch", 2)
+        try:
+            qry_2 = pnsqlquery.PNSqlQuery()
+            qry_2.setForwardOnly(True)
+            self.assertTrue(qry_2.exec_(sql))
+            self.assertEqual(len(qry_2.values_batch()), 2)
+            self.assertEqual(list(qry_2.rows()), values)
+            self.assertFalse(qry_2.next())
+            self.assertEqual(list(qry_2.rows()), values)
+        finally:
+            settings.config.set_value("ebcomportamiento/query_stream_batch", 500)
+
+        qry = pnsqlquery.PNSqlQuery()
+        self.assertTrue(qry.exec_("DELETE FROM fltest WHERE string_field LIKE 'batch%'"))
+
     @classmethod
     def tearDownClass(cls) -> None:
         """Ensure test clear all data."""
@@ -0,0 +1,90 @@
+"""Test_pnsqlstats module."""
+
+import json
+import os
+import unittest
+from pineboolib.loader.main import init_testing, finish_testing
+from pineboolib.application.database import pnsqlquery, pnsqlstats
+from pineboolib import application
+
+
+class TestPNSqlStats(unittest.TestCase):
+    """TestPNSqlStats Class."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Ensure pineboo is initialized for testing."""
+        init_testing()
+
+    def test_basic_1(self) -> None:
+        """Statements are grouped by fingerprint."""
+
+        stats = pnsqlstats.SQL_STATS
+        stats.enabled = True
+        stats.reset()
+        try:
+            for value in ("uno", "dos", "it''s"):
+                qry = pnsqlquery.PNSqlQuery()
+                self.assertTrue(
+                    qry.exec_("SELECT id FROM fltest WHERE string_field = '%s'" % value)
+                )
+            qry.exec_("SELECT id FROM fltest WHERE id IN (1, 2, 3) AND double_field > 1.5")
+        finally:
+            stats.enabled = False
+
+        summary = application.PROJECT.conn_manager.useConn("default").sql_stats()
+        fingerprints = {item["fingerprint"]: item for item in summary}
+        item = fingerprints["SELECT id FROM fltest WHERE string_field = ?"]
+        self.assertEqual(item["count"], 3)
+        self.assertEqual(item["callers"], {"test_pnsqlstats:test_basic_1": 3})
+        self.assertTrue(item["p95_ms"] >= item["p50_ms"])
+        self.assertTrue(
+            "SELECT id FROM fltest WHERE id IN (?) AND double_field > ?" in fingerprints
+        )
+
+        data = json.loads(stats.dump_json("default"))
+        self.assertEqual(len(data["statements"]), 2)
+        stats.reset()
+        self.assertEqual(stats.summary(), [])
+
+    def test_basic_2(self) -> None:
+        """Slow statements are written to the log."""
+
+        stats = pnsqlstats.SQL_STATS
+        log_file = os.path.join(application.PROJECT.tmpdir, "slow_test.log")
+        if os.path.exists(log_file):
+            os.remove(log_file)
+
+        stats.slow_ms = 0.000001
+        stats.log_file = log_file
+        try:
+            qry = pnsqlquery.PNSqlQuery()
+            self.assertTrue(qry.exec_("SELECT   id FROM fltest"))
+        finally:
+            stats.slow_ms = 0
+            stats.log_file = ""
+
+        with open(log_file) as file_:
+            lines = file_.read().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(lines[0].endswith("test_pnsqlstats:test_basic_2\tSELECT id FROM fltest"))
+        self.assertEqual(stats.summary(), [])
+        os.remove(log_file)
+
+    def test_fingerprint(self) -> None:
+        """Test fingerprint normalization."""
+
+        stats = pnsqlstats.SQL_STATS
+        self.assertEqual(
+            stats.fingerprint("FETCH FORWARD 200 FROM cur_fltest_00000012"),
+            "FETCH FORWARD ? FROM cur_fltest",
+        )
+        self.assertEqual(
+            stats.fingerprint("select  a1 from t2 where b = -5 and c = 'x' || 'y'"),
+            "select a1 from t2 where b = ? and c = ? || ?",
+        )
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Ensure test clear all data."""
+        finish_testing()
@@ -88,3 +88,72 @@ class TestUtils(unittest.TestCase):
         )
         utils.quick_sql_delete("fltest3", "counter ='%s'" % val_1, "default")
         self.assertTrue(utils.sql_delete("fltest3", "1=1", "dbAux"))
+
+    def test_sql_select(self) -> None:
+        """Test sqlSelect reads one row and remembers results inside transactions."""
+
+        cursor = pnsqlcursor.PNSqlCursor("fltest")
+        for number in range(3):
+            cursor.setModeAccess(cursor.Insert)
+            cursor.refreshBuffer()
+            cursor.setValueBuffer("string_field", "select %s" % number)
+            cursor.setValueBuffer("double_field", number)
+            self.assertTrue(cursor.commitBuffer())
+
+        where = "string_field LIKE 'select%' ORDER BY id DESC"
+        self.assertEqual(utils.sql_select("fltest", "string_field", where), "select 2")
+        self.assertEqual(utils.sql_select("fltest", "double_field", where + " LIMIT 1"), 2.0)
+        self.assertEqual(utils.sql_select("fltest", "double_field", "1 = 0"), False)
+        self.assertEqual(utils.sql_select("fltest", "string_field", where, "no_table"), False)
+        self.assertEqual(utils.quick_sql_select("fltest", "double_field", where), 2.0)
+
+        conn = cursor.db()
+        self.assertEqual(conn.driver().queryLimit("SELECT a FROM t", 1), "SELECT a FROM t LIMIT 1")
+        conn.setSelectMemo(True)
+        try:
+            self.assertTrue(cursor.transaction())
+            self.assertEqual(utils.sql_select("fltest", "string_field", where), "select 2")
+            self.assertEqual(len(conn.selectMemo()), 1)
+            self.assertTrue(
+                utils.sql_update("fltest", "string_field", "select 3", "string_field = 'select 2'")
+            )
+            self.assertEqual(conn.selectMemo(), {})
+            self.assertEqual(utils.sql_select("fltest", "string_field", where), "select 3")
+            self.assertTrue(cursor.commit())
+            self.assertEqual(conn.selectMemo(), None)
+        finally:
+            conn.setSelectMemo(False)
+
+        self.assertTrue(utils.sql_delete("fltest", "string_field LIKE 'select%'"))
+
+    def test_set_based(self) -> None:
+        """Test sqlUpdate and sqlDelete use a single sentence when possible."""
+
+        cursor = pnsqlcursor.PNSqlCursor("fltest")
+        self.assertEqual(utils.set_based_obstacle(cursor), "")
+        self.assertEqual(utils.set_based_obstacle(cursor, {"string_field": "x"}), "")
+        self.assertEqual(utils.set_based_obstacle(cursor, {"id": 1}), "restricciones de id")
+        self.assertEqual(
+            utils.set_based_obstacle(pnsqlcursor.PNSqlCursor("flareas")), "relaciones de idarea"
+        )
+        self.assertEqual(
+            utils.set_based_obstacle(pnsqlcursor.PNSqlCursor("flfiles"), {"contenido": ""}),
+            "afterCommit_flfiles",
+        )
+
+        for number in range(3):
+            cursor.setModeAccess(cursor.Insert)
+            cursor.refreshBuffer()
+            cursor.setValueBuffer("string_field", "set %s" % number)
+            self.assertTrue(cursor.commitBuffer())
+
+        self.assertTrue(
+            utils.sql_update(
+                "fltest", ["double_field", "bool_field"], [1.5, True], "string_field LIKE 'set%'"
+            )
+        )
+        self.assertEqual(
+            utils.sql_select("fltest", "SUM(double_field)", "string_field LIKE 'set%'"), 4.5
+        )
+        self.assertTrue(utils.sql_delete("fltest", "string_field LIKE 'set%'"))
+        self.assertEqual(utils.sql_select("fltest", "COUNT(id)", "string_field LIKE 'set%'"), 0)
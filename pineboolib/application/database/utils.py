@@ -4,11 +4,14 @@ Provide some functions based on data.
 
 from pineboolib.core.utils import logging
 from pineboolib.application import types
+from pineboolib.application.utils import sql_tools
 from pineboolib import application
 
-from . import pnsqlcursor, pnsqlquery
+from . import pnsqlcursor, pnsqlquery, pncounters
 
-from typing import Any, Union, List, Optional, TYPE_CHECKING
+import re
+
+from typing import Any, Dict, Union, List, Optional, Tuple, TYPE_CHECKING
 
 
 if TYPE_CHECKING:
@@ -92,6 +95,11 @@ def _next_counter2(name_: str, cursor_: "isqlcursor.ISqlCursor") -> Optional[Uni
     _len = int(field.length())
     _cadena = None
 
+    if type_ == "string" and pncounters.COUNTERS.enabled:
+        _numero_seq = pncounters.COUNTERS.next_value(cursor_.db(), tmd.name(), name_, _len)
+        if _numero_seq is not None:
+            return str(_numero_seq).rjust(_len, "0")
+
     qry = pnsqlquery.PNSqlQuery(None, cursor_.db().connectionName())
     qry.setForwardOnly(True)
     qry.setTablesList(tmd.name())
@@ -153,6 +161,13 @@ def _next_counter3(serie_: str, name_: str, cursor_: "isqlcursor.ISqlCursor") ->
         cursor_.db().connManager().manager().formatAssignValueLike(name_, "string", serie_, True),
     )
 
+    if _type == "string" and pncounters.COUNTERS.enabled:
+        _numero_seq = pncounters.COUNTERS.next_value(
+            cursor_.db(), tmd.name(), name_, _len, serie_, _where
+        )
+        if _numero_seq is not None:
+            return str(_numero_seq).rjust(_len, "0")
+
     qry = pnsqlquery.PNSqlQuery(None, cursor_.db().connectionName())
     qry.setForwardOnly(True)
     qry.setTablesList(tmd.name())
@@ -208,21 +223,29 @@ def sql_select(
     if where_ is None:
         where_ = "1 = 1"
 
-    _qry = pnsqlquery.PNSqlQuery(None, conn_)
+    conn = _select_conn(conn_)
+    if isinstance(table_list_, list):
+        table_list_ = ",".join(table_list_)
 
-    if table_list_:
-        _qry.setTablesList(table_list_)
-    # else:
-    #    _qry.setTablesList(from_)
+    key = (conn.connectionName(), select_, from_, str(table_list_ or ""))
+    shape = _SELECT_SHAPES.get(key)
+    if shape is None:
+        _qry = pnsqlquery.PNSqlQuery(None, conn)
 
-    _qry.setSelect(select_)
-    _qry.setFrom(from_)
-    _qry.setWhere(where_)
-    # q.setForwardOnly(True)
-    if not _qry.exec_():
-        return False
+        if table_list_:
+            _qry.setTablesList(table_list_)
+        # else:
+        #    _qry.setTablesList(from_)
+
+        _qry.setSelect(select_)
+        _qry.setFrom(from_)
+        if not _qry.isValid():
+            return False
 
-    return _qry.value(0) if _qry.first() else False
+        shape = (_qry.sql(), None)
+        _SELECT_SHAPES[key] = shape
+
+    return _select_first(conn, key, shape[0], where_)
 
 
 def quick_sql_select(
@@ -238,11 +261,79 @@ def quick_sql_select(
     if where_ is None:
         where_ = "1 = 1"
 
-    _qry = pnsqlquery.PNSqlQuery(None, conn_)
-    if not _qry.exec_("SELECT %s FROM %s WHERE %s " % (select_, from_, where_)):
+    conn = _select_conn(conn_)
+    key = (conn.connectionName(), select_, from_, None)
+    return _select_first(conn, key, "SELECT %s FROM %s" % (select_, from_), where_)
+
+
+_SELECT_SHAPES: Dict[Tuple[str, str, str, Optional[str]], Tuple[str, Any]] = {}
+NO_LIMIT_RE = re.compile(r"\b(limit|top|union|for\s+update|fetch\s+first)\b", re.IGNORECASE)
+
+
+def _select_conn(conn_: Union[str, "iconnection.IConnection"]) -> "iconnection.IConnection":
+    """Return the connection of a sqlSelect."""
+
+    if isinstance(conn_, str):
+        return application.PROJECT.conn_manager.useConn(conn_)
+
+    return conn_
+
+
+def _select_first(
+    conn: "iconnection.IConnection", key: Tuple, select_from: str, where_: str
+) -> Any:
+    """
+    Return the first value of a select, reading only one row.
+
+    The fields of the select are resolved by SqlInspector once for each select and from,
+    the where does not change them.
+    """
+
+    sql = "%s WHERE %s" % (select_from, where_)
+    memo = conn.selectMemo()
+    if memo is not None and sql in memo:
+        return memo[sql]
+
+    shape = _SELECT_SHAPES.get(key)
+    if shape is None or shape[1] is None:
+        inspector = sql_tools.SqlInspector()
+        inspector.set_sql(sql)
+        inspector.resolve()
+        if len(_SELECT_SHAPES) > 1000:
+            _SELECT_SHAPES.clear()
+        _SELECT_SHAPES[key] = (select_from, inspector)
+    else:
+        inspector = shape[1]
+
+    limited_sql = sql if NO_LIMIT_RE.search(where_) else conn.driver().queryLimit(sql, 1)
+    cursor = conn.cursor()
+    try:
+        conn.execute_query(limited_sql, cursor)
+        if conn.lastError():
+            LOGGER.warning("Error ejecutando consulta: <%s>\n%s", limited_sql, conn.lastError())
+            return False
+
+        row = cursor.fetchone()
+    finally:
+        cursor.close()
+
+    if not row:
         return False
 
-    return _qry.value(0) if _qry.first() else False
+    value = row[0]
+    if value in (None, "None"):
+        result = inspector.resolve_empty_value(0)
+    else:
+        try:
+            result = inspector.resolve_value(0, value)
+        except Exception:
+            LOGGER.exception("sql_select: error retrieving value of <%s>", sql)
+            result = None
+
+    if memo is not None:
+        memo[sql] = result
+
+    return result
 
 
 def sql_insert(
@@ -302,6 +393,9 @@ def sql_update(
     """
     Modify one or more records in a table using an FLSqlCursor object.
 
+    If the table has no commit actions, calculated fields or relations affected by the
+    change, the records are modified with a single UPDATE.
+
     @param table_ Table name.
     @param field_list_ Comma separated list of field names.
     @param value_list_ Comma separated list of corresponding values.
@@ -311,6 +405,35 @@ def sql_update(
     """
 
     _cursor = pnsqlcursor.PNSqlCursor(table_, True, conn_)
+
+    if isinstance(field_list_, (List, types.Array)):
+        _values = {
+            field_list_[_pos]: value_list_[_pos]
+            if isinstance(value_list_, (List, types.Array))
+            else value_list_
+            for _pos in range(len(field_list_))
+        }
+    else:
+        _values = {field_list_: value_list_}
+
+    _obstacle = set_based_obstacle(_cursor, _values)
+    if not _obstacle:
+        LOGGER.debug("sql_update(%s): una sola sentencia", table_)
+        _manager = _cursor.db().connManager().manager()
+        _tmd = _cursor.metadata()
+        _update_set = []
+        for _name, _value in _values.items():
+            _type = _tmd.field(_name).type()
+            if _type in ("string", "stringlist", "timestamp"):
+                _value = _cursor.db().normalizeValue(_value)
+            _update_set.append("%s = %s" % (_name, _manager.formatValue(_type, _value, False)))
+
+        _cursor.db().execute_query(
+            _cursor.db().driver().queryUpdate(table_, ", ".join(_update_set), where_)
+        )
+        return not _cursor.db().lastError()
+
+    LOGGER.debug("sql_update(%s): registro a registro (%s)", table_, _obstacle)
     _cursor.select(where_)
     _cursor.setForwardOnly(True)
     while _cursor.next():
@@ -318,16 +441,8 @@ def sql_update(
         _cursor.setModeAccess(_cursor.Edit)
         _cursor.refreshBuffer()
 
-        if isinstance(field_list_, (List, types.Array)):
-            for _pos in range(len(field_list_)):
-                _cursor.setValueBuffer(
-                    field_list_[_pos],
-                    value_list_[_pos]
-                    if isinstance(value_list_, (List, types.Array))
-                    else value_list_,
-                )
-        else:
-            _cursor.setValueBuffer(field_list_, value_list_)
+        for _name, _value in _values.items():
+            _cursor.setValueBuffer(_name, _value)
 
         if not _cursor.commitBuffer():
             return False
@@ -341,6 +456,9 @@ def sql_delete(
     """
     Delete one or more records in a table using an FLSqlCursor object.
 
+    If the table has no commit actions or relations to check, the records are deleted with
+    a single DELETE.
+
     @param table_ Table name.
     @param where_ Where statement to identify the records to be deleted.
     @param conn_name_ Connection name.
@@ -349,6 +467,13 @@ def sql_delete(
 
     _cursor = pnsqlcursor.PNSqlCursor(table_, True, conn_)
 
+    _obstacle = set_based_obstacle(_cursor)
+    if not _obstacle:
+        LOGGER.debug("sql_delete(%s): una sola sentencia", table_)
+        _cursor.db().execute_query("DELETE FROM %s WHERE %s" % (table_, where_))
+        return not _cursor.db().lastError()
+
+    LOGGER.debug("sql_delete(%s): registro a registro (%s)", table_, _obstacle)
     # if not c.select(w):
     #     return False
     _cursor.select(where_)
@@ -363,6 +488,70 @@ def sql_delete(
     return True
 
 
+def set_based_obstacle(
+    cursor_: "isqlcursor.ISqlCursor", values_: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Return why the records of a cursor must be modified one by one by commitBuffer.
+
+    @param cursor_ Cursor of the table.
+    @param values_ New values of the fields to update, or None to delete.
+    @return reason, or an empty string if a single UPDATE / DELETE gives the same result.
+    """
+
+    tmd = cursor_.metadata()
+    if tmd is None or tmd.isQuery():
+        return "no es una tabla"
+
+    database = cursor_.db()
+    if database.interactiveGUI() and database.canDetectLocks() and tmd.detectLocks():
+        return "detección de bloqueos"
+
+    if cursor_.activatedCommitActions():
+        id_module = database.connManager().managerModules().idModuleOfFile("%s.mtd" % tmd.name())
+        action = application.PROJECT.actions.get(id_module, application.PROJECT.actions.get("sys"))
+        module_iface = getattr(action.load(), "iface", None) if action is not None else None
+        for function_name in ("beforeCommit_%s" % tmd.name(), "afterCommit_%s" % tmd.name()):
+            if getattr(module_iface, function_name, None) is not None:
+                return function_name
+
+    context = cursor_.context()
+    if values_ is None:
+        for function_name in ("recordDelBefore%s" % tmd.name(), "recordDelAfter%s" % tmd.name()):
+            if context is not None and hasattr(context, function_name):
+                return function_name
+
+        for field in tmd.fieldList():
+            if field.relationList():
+                return "relaciones de %s" % field.name()
+
+        return ""
+
+    if context is not None and hasattr(context, "calculateField"):
+        for field in tmd.fieldList():
+            if field.calculated():
+                return "campo calculado %s" % field.name()
+
+    for field_name, value in values_.items():
+        field = tmd.field(field_name)
+        if field is None:
+            return "no existe el campo %s" % field_name
+
+        if (
+            field.isPrimaryKey()
+            or field.isUnique()
+            or field.relationM1() is not None
+            or field.relationList()
+            or field.associatedField() is not None
+            or field.outTransaction()
+            or field.type() in ("pixmap", "serial")
+            or (value is None and not field.allowNull())
+        ):
+            return "restricciones de %s" % field_name
+
+    return ""
+
+
 def quick_sql_delete(
     table_: str, where_: str, conn_: Union[str, "iconnection.IConnection"] = "default"
 ) -> bool:
@@ -156,6 +156,15 @@ class PNFieldMetaData(IFieldMetaData):
 
         self.private._field_name = name
 
+    def setAlias(self, alias: str) -> None:
+        """
+        Set the alias of the field.
+
+        @param alias Alias Name.
+        """
+
+        self.private.alias_ = alias
+
     def alias(self) -> str:
         """
         Get the alias of the field.
@@ -0,0 +1,194 @@
+"""
+PNMetaDataCache module.
+
+Keep the table definitions already parsed from the .mtd files, serialized, so they are not parsed
+again by other connections or processes of the same database.
+"""
+
+from pineboolib.core import settings
+from pineboolib import application, logging
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+
+from typing import Dict, Optional, Set, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from . import pntablemetadata  # noqa: F401
+
+LOGGER = logging.getLogger(__name__)
+
+# Fuentes que definen el contenido guardado, relativas a pineboolib.
+METADATA_FILES = (
+    "application/metadata/pntablemetadata.py",
+    "application/metadata/pnfieldmetadata.py",
+    "application/metadata/pnrelationmetadata.py",
+    "application/metadata/pncompoundkeymetadata.py",
+    "application/metadata/pnmetadatacache.py",
+    "fllegacy/flmanager.py",
+)
+
+
+class PNMetaDataCache(object):
+    """
+    PNMetaDataCache class.
+
+    Definitions are kept by the sha of the .mtd content, in memory (shared by every FLManager
+    of the process) and in <tmpdir>/cache/<database>/metadata/<signature>. Each load returns new
+    objects, so the definition stored is never modified by the connection that uses it (ACLs).
+    The aliases are stored without translating, the process that loads them translates them.
+    """
+
+    _data: Dict[str, bytes]
+    _misses: Set[str]
+    _signature: Optional[str]
+
+    def __init__(self) -> None:
+        """Inicialize."""
+
+        self._lock = threading.Lock()
+        self._data = {}
+        self._misses = set()
+        self._signature = None
+
+    def enabled(self) -> bool:
+        """Return if the cache is used."""
+
+        return settings.config.value("ebcomportamiento/metadata_cache", True) in (True, "true")
+
+    def key(self, content: str) -> str:
+        """Return the key of a .mtd content."""
+
+        return hashlib.sha1(content.encode("UTF-8")).hexdigest()
+
+    def signature(self) -> str:
+        """Return a hash of the pineboo version and the sources of the metadata classes and parser."""
+
+        if self._signature is None:
+            hash_ = hashlib.sha1()
+            hash_.update(application.PROJECT.load_version().split(" ")[-1].encode("UTF-8"))
+            folder = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+            for file_name in METADATA_FILES:
+                with open(os.path.join(folder, file_name), "rb") as file_:
+                    hash_.update(file_.read())
+
+            self._signature = hash_.hexdigest()[:16]
+
+        return self._signature
+
+    def folder(self, db_name: str) -> str:
+        """Return the folder of the serialized definitions of a database."""
+
+        return os.path.join(
+            application.PROJECT.tmpdir, "cache", db_name, "metadata", self.signature()
+        )
+
+    def load(self, db_name: str, key: str) -> Optional["pntablemetadata.PNTableMetaData"]:
+        """
+        Return a new copy of a stored definition.
+
+        @param db_name. Database name.
+        @param key. Key of the .mtd content.
+        @return PNTableMetaData, with the aliases not translated, or None if it is not stored.
+        """
+
+        if not self.enabled() or key in self._misses:
+            return None
+
+        data = self._data.get(key)
+        if data is None:
+            file_name = os.path.join(self.folder(db_name), "%s.pkl" % key)
+            if not os.path.exists(file_name):
+                self._misses.add(key)
+                return None
+
+            try:
+                with open(file_name, "rb") as file_:
+                    data = file_.read()
+            except Exception as error:
+                LOGGER.warning("No se ha podido leer %s: %s", file_name, error)
+                return None
+
+            with self._lock:
+                self._data[key] = data
+
+        try:
+            alias, field_aliases, metadata = pickle.loads(data)
+        except Exception as error:
+            LOGGER.warning("La definición %s de la caché no es válida: %s", key, error)
+            with self._lock:
+                self._data.pop(key, None)
+                self._misses.add(key)
+            return None
+
+        metadata.setAlias(alias)
+        for field_name, field_alias in field_aliases.items():
+            field = metadata.field(field_name)
+            if field is not None:
+                field.setAlias(field_alias)
+
+        return metadata
+
+    def store(
+        self,
+        db_name: str,
+        key: str,
+        metadata: "pntablemetadata.PNTableMetaData",
+        alias: str,
+        field_aliases: Dict[str, str],
+    ) -> None:
+        """
+        Save a definition.
+
+        @param db_name. Database name.
+        @param key. Key of the .mtd content.
+        @param metadata. PNTableMetaData, without ACLs applied.
+        @param alias. Alias of the table, before translating it.
+        @param field_aliases. Aliases of the fields, before translating them.
+        """
+
+        if not self.enabled():
+            return
+
+        folder = self.folder(db_name)
+        file_name = os.path.join(folder, "%s.pkl" % key)
+        data = self._data.get(key)
+        if data is None:
+            try:
+                data = pickle.dumps((alias, field_aliases, metadata), pickle.HIGHEST_PROTOCOL)
+            except Exception as error:
+                LOGGER.warning("No se ha podido serializar %s: %s", metadata.name(), error)
+                return
+
+            with self._lock:
+                self._data[key] = data
+                self._misses.discard(key)
+
+        elif os.path.exists(file_name):
+            return
+
+        tmp_name = None
+        try:
+            os.makedirs(folder, exist_ok=True)
+            # Se escribe en un temporal y se renombra para que otros procesos no lean un fichero a medias.
+            handle, tmp_name = tempfile.mkstemp(dir=folder, suffix=".tmp")
+            with os.fdopen(handle, "wb") as file_:
+                file_.write(data)
+            os.replace(tmp_name, file_name)
+        except Exception as error:
+            LOGGER.warning("No se ha podido guardar %s en la caché: %s", metadata.name(), error)
+            if tmp_name and os.path.exists(tmp_name):
+                os.remove(tmp_name)
+
+    def clear(self) -> None:
+        """Forget the definitions loaded in memory."""
+
+        with self._lock:
+            self._data = {}
+            self._misses = set()
+
+
+METADATA_CACHE = PNMetaDataCache()
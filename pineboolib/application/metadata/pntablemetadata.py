@@ -183,6 +183,7 @@ class PNTableMetaData(itablemetadata.ITableMetaData):
         if not field_metadata.metadata():
             field_metadata.setMetadata(self)
         self.private._field_list.append(field_metadata)
+        self.private._field_map.setdefault(field_metadata.name(), field_metadata)
         self.private.addFieldName(field_metadata.name())
         self.private.formatAlias(field_metadata)
 
@@ -203,6 +204,7 @@ class PNTableMetaData(itablemetadata.ITableMetaData):
                 break
 
         self.private.removeFieldName(field_name)
+        self.private.buildFieldIndex()
 
     def setCompoundKey(self, cK: Optional["pncompoundkeymetadata.PNCompoundKeyMetaData"]) -> None:
         """
@@ -266,13 +268,9 @@ class PNTableMetaData(itablemetadata.ITableMetaData):
         @param fN Field name
         """
         type_ = None
-        if field_name:
-            field_name = str(field_name)
-
-            for field in self.private._field_list:
-                if field.name() == field_name.lower():
-                    type_ = field.type()
-                    break
+        field = self.field(str(field_name)) if field_name else None
+        if field is not None:
+            type_ = field.type()
 
         ret_ = None
         if type_ is not None:
@@ -311,10 +309,9 @@ class PNTableMetaData(itablemetadata.ITableMetaData):
         @param fN Field name.
         """
 
-        if field_name:
-            for field in self.private._field_list:
-                if field.name() == field_name.lower():
-                    return field.isPrimaryKey()
+        field = self.field(field_name)
+        if field is not None:
+            return field.isPrimaryKey()
 
         return None
 
@@ -325,8 +322,9 @@ class PNTableMetaData(itablemetadata.ITableMetaData):
         @param fN Field name.
         """
         if field_name:
-            if field_name in self.fieldNames():
-                return self.fieldNames().index(field_name)
+            pos = self.private._field_pos.get(field_name)
+            if pos is not None:
+                return pos
 
         LOGGER.warning("FLTableMetaData.fieldIsIndex(%s) No encontrado", field_name)
         return -1
@@ -338,10 +336,9 @@ class PNTableMetaData(itablemetadata.ITableMetaData):
         @param fN Field name.
         @author Andrés Otón Urbano (baxas@eresmas.com)
         """
-        if field_name:
-            for field in self.private._field_list:
-                if field.name() == field_name.lower():
-                    return field.isCounter()
+        field = self.field(field_name)
+        if field is not None:
+            return field.isCounter()
 
         return False
 
@@ -352,10 +349,9 @@ class PNTableMetaData(itablemetadata.ITableMetaData):
         @param fN Field name
         """
 
-        if field_name:
-            for field in self.private._field_list:
-                if field.name() == field_name.lower():
-                    return field.allowNull()
+        field = self.field(field_name)
+        if field is not None:
+            return field.allowNull()
 
         return False
 
@@ -365,10 +361,9 @@ class PNTableMetaData(itablemetadata.ITableMetaData):
 
         @param fN Field name.
         """
-        if field_name:
-            for field in self.private._field_list:
-                if field.name() == field_name.lower():
-                    return field.isUnique()
+        field = self.field(field_name)
+        if field is not None:
+            return field.isUnique()
 
         return False
 
@@ -382,12 +377,11 @@ class PNTableMetaData(itablemetadata.ITableMetaData):
             empty without the field is not related.
         """
 
-        if field_name:
-            for field in self.fieldList():
-                if field.name() == field_name.lower():
-                    relation_ = field.relationM1()
-                    if relation_:
-                        return relation_.foreignTable()
+        field = self.field(field_name)
+        if field is not None:
+            relation_ = field.relationM1()
+            if relation_:
+                return relation_.foreignTable()
 
         return None
 
@@ -400,12 +394,11 @@ class PNTableMetaData(itablemetadata.ITableMetaData):
         @return The name of the foreign field related to the indicated.
         """
 
-        if field_name:
-            for field in self.fieldList():
-                if field.name() == field_name.lower():
-                    relation_ = field.relationM1()
-                    if relation_:
-                        return relation_.foreignField()
+        field = self.field(field_name)
+        if field is not None:
+            relation_ = field.relationM1()
+            if relation_:
+                return relation_.foreignField()
         return None
 
     def relation(
@@ -449,10 +442,9 @@ class PNTableMetaData(itablemetadata.ITableMetaData):
         @return field length.
         """
 
-        if field_name:
-            for field in self.fieldList():
-                if field.name() == field_name.lower():
-                    return field.length()
+        field = self.field(field_name)
+        if field is not None:
+            return field.length()
 
         return None
 
@@ -464,10 +456,9 @@ class PNTableMetaData(itablemetadata.ITableMetaData):
         @return integer length.
         """
 
-        if field_name:
-            for field in self.fieldList():
-                if field.name() == field_name.lower():
-                    return field.partInteger()
+        field = self.field(field_name)
+        if field is not None:
+            return field.partInteger()
 
         return None
 
@@ -479,10 +470,9 @@ class PNTableMetaData(itablemetadata.ITableMetaData):
         @return part decimal length.
         """
 
-        if field_name:
-            for field in self.fieldList():
-                if field.name() == field_name.lower():
-                    return field.partDecimal()
+        field = self.field(field_name)
+        if field is not None:
+            return field.partDecimal()
 
         return None
 
@@ -493,10 +483,9 @@ class PNTableMetaData(itablemetadata.ITableMetaData):
         @param fN Field name.
         """
 
-        if field_name:
-            for field in self.fieldList():
-                if field.name() == field_name.lower():
-                    return field.calculated()
+        field = self.field(field_name)
+        if field is not None:
+            return field.calculated()
 
         return None
 
@@ -507,10 +496,9 @@ class PNTableMetaData(itablemetadata.ITableMetaData):
         @param fN Field name.
         """
 
-        if field_name:
-            for field in self.fieldList():
-                if field.name() == field_name.lower():
-                    return field.visible()
+        field = self.field(field_name)
+        if field is not None:
+            return field.visible()
 
         return None
 
@@ -524,12 +512,7 @@ class PNTableMetaData(itablemetadata.ITableMetaData):
         @return A FLFieldMetaData object with the information or metadata of a given field.
         """
 
-        if field_name:
-            for field in self.private._field_list:
-                if field.name() == field_name.lower():
-                    return field
-
-        return None
+        return self.private._field_map.get(field_name.lower()) if field_name else None
 
     def fieldList(self) -> List["pnfieldmetadata.PNFieldMetaData"]:
         """
@@ -627,6 +610,24 @@ class PNTableMetaData(itablemetadata.ITableMetaData):
 
         self.private._concur_warn = state
 
+    def lazyCount(self) -> bool:
+        """
+        Return lazyCount flag.
+
+        @return True or False
+        """
+
+        return self.private._lazy_count
+
+    def setLazyCount(self, state: bool = True) -> None:
+        """
+        Enable lazyCount flag.
+
+        @param state. True or False.
+        """
+
+        self.private._lazy_count = state
+
     @decorators.BetaImplementation
     def detectLocks(self) -> bool:
         """
@@ -741,6 +742,12 @@ class PNTableMetaDataPrivate:
     """
     _field_names: List[str] = []
 
+    """
+    Índices nombre->campo y nombre->posición, mantenidos por addFieldMD y removeFieldMD
+    """
+    _field_map: Dict[str, "pnfieldmetadata.PNFieldMetaData"]
+    _field_pos: Dict[str, int]
+
     """
     Mapas alias<->nombre
     """
@@ -778,6 +785,14 @@ class PNTableMetaDataPrivate:
     """
     _detect_locks: bool
 
+    """
+    Indica si los grids de esta tabla se muestran sin esperar al COUNT del total de registros.
+
+    Si este flag es true PNCursorTableModel::refresh() carga las filas por bloques y calcula
+    el total en segundo plano.
+    """
+    _lazy_count: bool
+
     """
     Indica el nombre de función a llamar para la búsqueda con Full Text Search
     """
@@ -803,9 +818,12 @@ class PNTableMetaDataPrivate:
         self._field_list = []
         self._field_names = []
         self._field_names_unlock = []
+        self._field_map = {}
+        self._field_pos = {}
         self._alias_field_map = {}
         self._field_alias_map = {}
         self._detect_locks = True
+        self._lazy_count = False
         self._query = ""
         self._in_cache = False
         # print("Vaciando field list ahora",  len(self._field_list))
@@ -859,6 +877,7 @@ class PNTableMetaDataPrivate:
         """
 
         self._field_names.append(name.lower())
+        self._field_pos.setdefault(name.lower(), len(self._field_names) - 1)
 
     def removeFieldName(self, name: str) -> None:
         """
@@ -901,3 +920,18 @@ class PNTableMetaDataPrivate:
 
         self._field_list = []
         self._field_names = []
+        self._field_map = {}
+        self._field_pos = {}
+
+    def buildFieldIndex(self) -> None:
+        """
+        Rebuild the name->field and name->position indexes from the field lists.
+        """
+
+        self._field_map = {}
+        for field in self._field_list:
+            self._field_map.setdefault(field.name(), field)
+
+        self._field_pos = {}
+        for pos, name in enumerate(self._field_names):
+            self._field_pos.setdefault(name, pos)
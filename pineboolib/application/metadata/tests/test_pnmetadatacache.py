@@ -0,0 +1,96 @@
+"""Test_pnmetadatacache module."""
+
+import os
+import unittest
+from pineboolib.loader.main import init_testing, finish_testing
+from pineboolib.application.metadata import pnmetadatacache
+from pineboolib import application
+
+
+class TestPNMetaDataCache(unittest.TestCase):
+    """TestPNMetaDataCache Class."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Ensure pineboo is initialized for testing."""
+        init_testing()
+
+    def test_basic_1(self) -> None:
+        """Definitions are stored on disk and loaded as new objects."""
+
+        conn = application.PROJECT.conn_manager.useConn("default")
+        manager = conn.connManager().manager()
+        metadata_cache = pnmetadatacache.METADATA_CACHE
+        metadata_cache.clear()
+        manager.cache_metadata_.pop("fltest", None)
+        mtd = manager.metadata("fltest")
+        self.assertTrue(mtd)
+
+        key = metadata_cache.key(conn.connManager().managerModules().contentCached("fltest.mtd"))
+        self.assertTrue(
+            os.path.exists(os.path.join(metadata_cache.folder(conn.DBName()), "%s.pkl" % key))
+        )
+
+        metadata_cache.clear()
+        mtd_1 = metadata_cache.load(conn.DBName(), key)
+        mtd_2 = metadata_cache.load(conn.DBName(), key)
+        self.assertTrue(mtd_1 is not None and mtd_2 is not None)
+        self.assertFalse(mtd_1 is mtd_2)
+        self.assertEqual(mtd_1.fieldNames(), mtd.fieldNames())  # type: ignore
+        self.assertEqual(mtd_1.primaryKey(), "id")  # type: ignore
+        self.assertTrue(mtd_1.field("string_field").metadata() is mtd_1)  # type: ignore
+        self.assertEqual(metadata_cache.load(conn.DBName(), "no_existe"), None)
+
+    def test_basic_2(self) -> None:
+        """FLManager uses the stored definition."""
+
+        manager = application.PROJECT.conn_manager.manager()
+        mtd = manager.metadata("fltest2")
+        self.assertTrue(mtd)
+        del manager.cache_metadata_["fltest2"]
+
+        mtd_2 = manager.metadata("fltest2")
+        self.assertFalse(mtd is mtd_2)
+        self.assertEqual(mtd_2.alias(), mtd.alias())  # type: ignore
+        self.assertEqual(mtd_2.fieldNames(), mtd.fieldNames())  # type: ignore
+        self.assertEqual(mtd_2.fieldType("bloqueo"), 200)  # type: ignore
+
+    def test_basic_3(self) -> None:
+        """The aliases are stored without translating."""
+
+        from pineboolib.fllegacy import flutil
+
+        manager = application.PROJECT.conn_manager.manager()
+        metadata_cache = pnmetadatacache.METADATA_CACHE
+        content = application.PROJECT.conn_manager.managerModules().contentCached("fltest3.mtd")
+        file_name = os.path.join(
+            metadata_cache.folder(manager.db_.DBName()), "%s.pkl" % metadata_cache.key(content)
+        )
+        mtd = manager.metadata("fltest3")
+        self.assertTrue(mtd)
+        aliases = [field.alias() for field in mtd.fieldList()]  # type: ignore
+
+        translate = flutil.FLUtil.translate
+        flutil.FLUtil.translate = classmethod(  # type: ignore [assignment]
+            lambda cls, group, text_: "** %s" % text_
+        )
+        try:
+            del manager.cache_metadata_["fltest3"]
+            metadata_cache.clear()
+            if os.path.exists(file_name):
+                os.remove(file_name)
+            mtd_2 = manager.metadata("fltest3")
+            self.assertTrue(mtd_2.field("string_field").alias().startswith("** "))  # type: ignore
+        finally:
+            flutil.FLUtil.translate = translate  # type: ignore [assignment]
+
+        del manager.cache_metadata_["fltest3"]
+        metadata_cache.clear()
+        mtd_3 = manager.metadata("fltest3")
+        self.assertEqual([field.alias() for field in mtd_3.fieldList()], aliases)  # type: ignore
+        self.assertTrue("fllegacy/flmanager.py" in pnmetadatacache.METADATA_FILES)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Ensure test clear all data."""
+        finish_testing()
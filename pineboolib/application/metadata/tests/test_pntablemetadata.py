@@ -54,6 +54,30 @@ class TestCreatePNTableMetaData(unittest.TestCase):
         self.assertTrue(mtd.fieldAllowNull("string_field"))
         self.assertFalse(mtd.fieldAllowNull("bloqueo"))
 
+    def test_basic_3(self) -> None:
+        """Test field indexes."""
+
+        from pineboolib.application.metadata import pnfieldmetadata
+
+        mtd = pntablemetadata.PNTableMetaData("prueba_3", "Alias de prueba_3", None)
+        for number in range(200):
+            mtd.addFieldMD(
+                pnfieldmetadata.PNFieldMetaData(
+                    "campo_%s" % number, "Campo %s" % number, True, number == 0, "string", 10
+                )
+            )
+
+        self.assertEqual(mtd.indexPos("campo_150"), 150)
+        self.assertEqual(mtd.field("CAMPO_199").name(), "campo_199")  # type: ignore
+        self.assertEqual(mtd.fieldLength("campo_10"), 10)
+        self.assertTrue(mtd.fieldIsPrimaryKey("campo_0"))
+
+        mtd.removeFieldMD("campo_100")
+        self.assertEqual(mtd.field("campo_100"), None)
+        self.assertEqual(mtd.indexPos("campo_100"), -1)
+        self.assertEqual(mtd.indexPos("campo_150"), 149)
+        self.assertEqual(len(mtd.fieldList()), 199)
+
     @classmethod
     def tearDownClass(cls) -> None:
         """Ensure test clear all data."""
@@ -0,0 +1,121 @@
+"""
+FormCache module.
+
+Keep the .ui files already parsed, so reopening a form does not parse its XML nor decode its
+images again.
+"""
+
+from pineboolib.core.utils.utils_base import load2xml
+from pineboolib.core import settings
+from pineboolib import logging
+
+from xml.etree import ElementTree
+import hashlib
+import os
+import threading
+
+from typing import Any, Dict, Optional, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+
+class CachedForm(object):
+    """
+    CachedForm class.
+
+    Parsed tree of a .ui file. The tree is shared by every form built from it, so it must not
+    be modified. icons is filled by qt3ui the first time the form is loaded.
+    """
+
+    sha: str
+    tree: "ElementTree.ElementTree"
+    icons: Optional[Dict[str, Any]]
+
+    def __init__(self, sha: str, tree: "ElementTree.ElementTree") -> None:
+        """Inicialize."""
+
+        self.sha = sha
+        self.tree = tree
+        self.icons = None
+
+    def version(self) -> str:
+        """Return the UI version of the form."""
+
+        return self.tree.getroot().get("version") or "1.0"
+
+
+class FormCache(object):
+    """
+    FormCache class.
+
+    Forms are kept by the sha of the file content. The (mtime, size) of each path is checked on
+    every load, so a changed file is read again, and an unchanged one is not even read.
+    """
+
+    _paths: Dict[str, Tuple[int, int, str]]
+    _forms: Dict[str, CachedForm]
+
+    def __init__(self) -> None:
+        """Inicialize."""
+
+        self._lock = threading.Lock()
+        self._paths = {}
+        self._forms = {}
+        self.hits = 0
+        self.misses = 0
+
+    def enabled(self) -> bool:
+        """Return if the cache is used."""
+
+        return settings.config.value("ebcomportamiento/form_cache", True) in (True, "true")
+
+    def load(self, form_path: str) -> Optional[CachedForm]:
+        """
+        Return the parsed form of a .ui file.
+
+        @param form_path. Path of the .ui file.
+        @return CachedForm or None if the file can not be parsed.
+        """
+
+        if not self.enabled():
+            tree = load2xml(form_path)
+            return CachedForm("", tree) if tree else None
+
+        stat_ = os.stat(form_path)
+        stamp = (stat_.st_mtime_ns, stat_.st_size)
+        with self._lock:
+            known = self._paths.get(form_path)
+            if known is not None and known[:2] == stamp and known[2] in self._forms:
+                self.hits += 1
+                return self._forms[known[2]]
+
+        with open(form_path, "rb") as file_:
+            sha = hashlib.sha1(file_.read()).hexdigest()
+
+        with self._lock:
+            self._paths[form_path] = (stamp[0], stamp[1], sha)
+            form = self._forms.get(sha)
+            if form is not None:
+                self.hits += 1
+                return form
+
+        tree = load2xml(form_path)
+        if not tree:
+            return None
+
+        form = CachedForm(sha, tree)
+        with self._lock:
+            self.misses += 1
+            form = self._forms.setdefault(sha, form)
+
+        return form
+
+    def clear(self) -> None:
+        """Forget the parsed forms."""
+
+        with self._lock:
+            self._paths = {}
+            self._forms = {}
+
+
+FORM_CACHE = FormCache()
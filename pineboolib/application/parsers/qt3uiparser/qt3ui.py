@@ -13,7 +13,6 @@ from binascii import unhexlify
 from pineboolib import logging
 import zlib
 
-from pineboolib.core.utils.utils_base import load2xml
 from pineboolib import application
 from pineboolib.application import connections
 
@@ -25,6 +24,8 @@ from pineboolib.q3widgets import qspinbox
 
 from pineboolib.core.settings import config
 
+from . import formcache
+
 
 from typing import Optional, Tuple, Callable, List, Dict, Any, cast, Type, Union
 
@@ -65,13 +66,12 @@ def load_ui(form_path: str, widget: Any, parent: Optional[QWidget] = None) -> No
     #    remove_blank_text=True,
     # )
 
-    tree = load2xml(form_path)
+    form = formcache.FORM_CACHE.load(form_path)
 
-    if not tree:
+    if form is None:
         return
 
-    ROOT = tree.getroot()
-    ICONS = {}
+    ROOT = form.tree.getroot()
 
     if parent is None:
         parent = widget
@@ -79,8 +79,14 @@ def load_ui(form_path: str, widget: Any, parent: Optional[QWidget] = None) -> No
     # if application.PROJECT.DGI.localDesktop():
     widget.hide()
 
-    for xmlimage in ROOT.findall("images//image"):
-        load_icon(xmlimage)
+    # Los iconos decodificados se guardan con el formulario y se reutilizan al volver a abrirlo.
+    if form.icons is None:
+        ICONS = {}
+        for xmlimage in ROOT.findall("images//image"):
+            load_icon(xmlimage)
+        form.icons = ICONS
+    else:
+        ICONS = form.icons
 
     for xmlwidget in ROOT.findall("widget"):
         LoadWidget(xmlwidget, widget, parent)
@@ -39,6 +39,44 @@ class TestQT3UIParser(unittest.TestCase):
         bt_01 = widget.findChild(QtWidgets.QWidget, "pb_uno", QtCore.Qt.FindChildrenRecursively)
         self.assertTrue(bt_01)
 
+    def test_formCache(self) -> None:
+        """Test forms are parsed once and parsed again when the file changes."""
+
+        import os
+        import shutil
+        from pineboolib.core.utils.utils_base import filedir
+        from pineboolib.application.parsers.qt3uiparser import formcache
+
+        mng_modules = application.PROJECT.conn_manager.managerModules()
+        file_1 = filedir("./application/parsers/qt3uiparser/tests/fixtures/main_form_qt3.ui")
+        file_2 = os.path.join(application.PROJECT.tmpdir, "form_cache_qt3.ui")
+        shutil.copy(file_1, file_2)
+
+        cache = formcache.FORM_CACHE
+        form_1 = cache.load(file_1)
+        self.assertTrue(form_1)
+        misses = cache.misses
+        form_2 = cache.load(file_2)
+        self.assertTrue(form_2 is form_1)  # Mismo contenido, mismo sha.
+        self.assertEqual(cache.misses, misses)
+
+        widget = mng_modules.createUI(file_2)
+        self.assertTrue(widget.findChild(QtWidgets.QAction, "ebcomportamiento"))
+        self.assertTrue(form_1.icons)
+        icons = form_1.icons
+        widget_2 = mng_modules.createUI(file_1)
+        self.assertTrue(widget_2.findChild(QtWidgets.QAction, "ebcomportamiento"))
+        self.assertTrue(form_1.icons is icons)
+        self.assertEqual(cache.misses, misses)
+
+        with open(file_2, "a") as file_:
+            file_.write("\n")
+        os.utime(file_2, (0, 0))
+        form_3 = cache.load(file_2)
+        self.assertFalse(form_3 is form_1)
+        self.assertEqual(cache.misses, misses + 1)
+        os.remove(file_2)
+
     @classmethod
     def tearDownClass(cls) -> None:
         """Ensure test clear all data."""
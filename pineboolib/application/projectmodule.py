@@ -2,11 +2,13 @@
 Project Module.
 """
 import os
+import time
+from concurrent import futures
 from optparse import Values
 from pathlib import Path
 
 
-from typing import List, Optional, Any, Dict, Callable, TYPE_CHECKING
+from typing import List, Optional, Any, Dict, Callable, Tuple, TYPE_CHECKING
 
 
 # from pineboolib.fllegacy.flaccesscontrollists import FLAccessControlLists # FIXME: Not allowed yet
@@ -16,7 +18,7 @@ from pineboolib.core.utils import logging, utils_base
 from pineboolib.core.utils.struct import AreaStruct
 from pineboolib.core import exceptions, settings, message_manager
 from pineboolib.application.database import pnconnectionmanager
-from pineboolib.application.utils import path, xpm
+from pineboolib.application.utils import path, xpm, script_cache
 from pineboolib.application import module, file
 
 
@@ -290,8 +292,12 @@ class Project(object):
         count = 0
 
         list_files: List[str] = []
+        pending_files: Dict[Tuple[str, str, str], str] = {}
 
-        for idmodulo, nombre, sha in list(cursor_):
+        files_rows = list(cursor_)
+        self.conn_manager.managerModules().loadFilesCatalog(files_rows)
+
+        for idmodulo, nombre, sha in files_rows:
             if not self.dgi.accept_file(nombre):
                 continue
 
@@ -334,45 +340,15 @@ class Project(object):
                 else:
                     continue
 
-            cur2 = self.conn_manager.useConn("dbAux").cursor()
-            sql = (
-                "SELECT contenido FROM flfiles WHERE idmodulo = %s AND nombre = %s AND sha = %s"
-                % (
-                    conn.driver().formatValue("string", idmodulo, False),
-                    conn.driver().formatValue("string", nombre, False),
-                    conn.driver().formatValue("string", sha, False),
-                )
-            )
-            cur2.execute(sql)
-            for (contenido,) in list(cur2):
-
-                encode_ = "utf-8" if str(nombre).endswith((".kut", ".ts", ".py")) else "ISO-8859-15"
-
-                folder = path._dir(
-                    "cache",
-                    "/".join(fileobj.filekey.split("/")[: len(fileobj.filekey.split("/")) - 1]),
-                )
-                if os.path.exists(folder) and not os.path.exists(
-                    file_name
-                ):  # Borra la carpeta si no existe el fichero destino
-                    for root, dirs, files in os.walk(folder):
-                        for file_item in files:
-                            os.remove(os.path.join(root, file_item))
-
-                if contenido and not os.path.exists(file_name):
-                    self.message_manager().send(
-                        "splash", "showMessage", ["Volcando a caché %s..." % nombre]
-                    )
-                    file_2 = open(file_name, "wb")
-                    txt = contenido.encode(encode_, "replace")
-                    file_2.write(txt)
-                    file_2.close()
+            if not os.path.exists(file_name):
+                pending_files[(idmodulo, nombre, sha)] = file_name
 
             if self.parse_project and nombre.endswith(".qs"):
-                if os.path.exists(file_name):
-                    list_files.append(file_name)
+                list_files.append(file_name)
 
         file_1.close()
+        self.download_files(pending_files)
+        list_files = [file_name for file_name in list_files if os.path.exists(file_name)]
         self.message_manager().send("splash", "showMessage", ["Convirtiendo a Python ..."])
 
         if list_files:
@@ -410,6 +386,95 @@ class Project(object):
 
         return True
 
+    def download_files(self, pending_files: Dict[Tuple[str, str, str], str]) -> None:
+        """
+        Write the content of several flfiles records into the cache.
+
+        The records are read in chunks of ebcomportamiento/flfiles_chunk_size names and the
+        files are written by a thread pool while the next rows are fetched.
+        @param pending_files. Dict (idmodulo, nombre, sha) -> cache file path.
+        """
+
+        if not pending_files:
+            return
+
+        pending_files = dict(pending_files)
+        start = time.time()
+        conn = self.conn_manager.useConn("dbAux")
+        cursor = conn.cursor()
+        chunk_size = max(int(settings.config.value("ebcomportamiento/flfiles_chunk_size", 100)), 1)
+        names = sorted(set(key[1] for key in pending_files.keys()))
+        total_files = 0
+        total_bytes = 0
+
+        with futures.ThreadPoolExecutor(max_workers=4) as executor:
+            jobs = []
+            for pos in range(0, len(names), chunk_size):
+                sql = (
+                    "SELECT idmodulo, nombre, sha, contenido FROM flfiles WHERE nombre IN (%s)"
+                    % (
+                        ", ".join(
+                            conn.driver().formatValue("string", nombre, False)
+                            for nombre in names[pos : pos + chunk_size]
+                        )
+                    )
+                )
+                cursor.execute(sql)
+                while True:
+                    rows = cursor.fetchmany(50)
+                    if not rows:
+                        break
+
+                    for idmodulo, nombre, sha, contenido in rows:
+                        file_name = pending_files.pop((idmodulo, nombre, sha), None)
+                        if file_name is None or not contenido:
+                            continue
+
+                        encode_ = (
+                            "utf-8"
+                            if str(nombre).endswith((".kut", ".ts", ".py"))
+                            else "ISO-8859-15"
+                        )
+                        data = contenido.encode(encode_, "replace")
+                        total_files += 1
+                        total_bytes += len(data)
+                        jobs.append(executor.submit(self._write_cache_file, file_name, data))
+
+                self.message_manager().send(
+                    "splash",
+                    "showMessage",
+                    [
+                        "Volcando a caché %s ficheros (%s KB) ..."
+                        % (total_files, total_bytes // 1024)
+                    ],
+                )
+
+            for job in jobs:
+                job.result()
+
+        msg = "Volcados a caché %s ficheros (%s KB) en %.2f s" % (
+            total_files,
+            total_bytes // 1024,
+            time.time() - start,
+        )
+        LOGGER.info(msg)
+        self.message_manager().send("splash", "showMessage", [msg])
+
+    @staticmethod
+    def _write_cache_file(file_name: str, data: bytes) -> None:
+        """Write a file into the cache, removing the old versions of the same file."""
+
+        folder = os.path.dirname(file_name)
+        if os.path.exists(folder):  # Borra la carpeta si no existe el fichero destino
+            for root, dirs, files in os.walk(folder):
+                for file_item in files:
+                    os.remove(os.path.join(root, file_item))
+        else:
+            os.makedirs(folder)
+
+        with open(file_name, "wb") as file_:
+            file_.write(data)
+
     def call(
         self,
         function: str,
@@ -559,6 +624,8 @@ class Project(object):
                 while dest_file_name in self.pending_conversion_list:
                     # Esperamos a que el fichero se convierta.
                     QtWidgets.QApplication.processEvents()
+            elif script_cache.restore(path_file, dest_file_name):
+                LOGGER.debug("%s recuperado del almacén de scripts", dest_file_name)
             else:
                 self.pending_conversion_list.append(dest_file_name)
                 itemlist.append(
@@ -576,6 +643,9 @@ class Project(object):
         msg = "Convirtiendo a Python . . ."
         LOGGER.info(msg)
 
+        if not itemlist:
+            return
+
         threads_num = pyconvert.CPU_COUNT
         if len(itemlist) < threads_num:
             threads_num = len(itemlist)
@@ -590,8 +660,10 @@ class Project(object):
             for item in itemlist:
                 pycode_list.append(pyconvert.pythonify_item(item))
 
-        for item in itemlist:
+        for item, converted in zip(itemlist, pycode_list):
             self.pending_conversion_list.remove(item.dst_path)
+            if converted:
+                script_cache.store(item.src_path, item.dst_path)
 
         if not all(pycode_list):
             LOGGER.warning("Conversion failed for some files")
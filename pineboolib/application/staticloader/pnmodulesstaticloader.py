@@ -15,12 +15,14 @@ from pineboolib.core import settings, decorators
 from pineboolib.application.qsatypes import sysbasetype
 
 import os
+import threading
+import time
 
 # from pineboolib.fllegacy.flutil import FLUtil
 # from pineboolib.fllegacy import flapplication
 # from pineboolib.fllegacy.flcheckbox import FLCheckBox
 
-from typing import Any, List, Optional, cast, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Set, Tuple, cast, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pineboolib.interfaces import iconnection
@@ -46,11 +48,23 @@ class AQStaticDirInfo(object):
 
 
 class AQStaticBdInfo(object):
-    """Get or set settings on database related to staticloader."""
+    """
+    Get or set settings on database related to staticloader.
+
+    Keep an index of the files of the static folders (file name -> folder, path, mtime), built
+    when the settings change and checked against the disk every check_time seconds, so a lookup
+    does not touch the filesystem. Names added, removed or modified since the last check are
+    kept until takeChanged is called.
+    """
+
+    check_time: float = 2  # Seconds between checks of the static folders.
 
     enabled_: bool
     dirs_: List[AQStaticDirInfo]
     key_: str
+    _index: Optional[Dict[str, Tuple[str, str, int]]]
+    _contents: Dict[str, Tuple[int, str]]
+    _changed: Set[str]
 
     def __init__(self, database: "iconnection.IConnection") -> None:
         """Create new AQStaticBdInfo."""
@@ -58,6 +72,12 @@ class AQStaticBdInfo(object):
         self.dirs_ = []
         self.key_ = "StaticLoader/%s/" % self.db_
         self.enabled_ = settings.config.value("%senabled" % self.key_, False)
+        self._lock = threading.RLock()
+        self._index = None
+        self._signature: Optional[Tuple] = None
+        self._checked_at = 0.0
+        self._contents = {}
+        self._changed = set()
 
     def findPath(self, p: str) -> Optional[AQStaticDirInfo]:
         """Find if path "p" is managed in this class."""
@@ -95,6 +115,102 @@ class AQStaticBdInfo(object):
 
         settings.config.set_value("%sdirs" % self.key_, dirs)
         settings.config.set_value("%sactiveDirs" % self.key_, ",".join(active_dirs))
+        self._checked_at = 0.0
+
+    def find(self, file_name: str) -> Optional[Tuple[str, str, int]]:
+        """
+        Return where a file is loaded from.
+
+        @param file_name. File name.
+        @return (folder, path, mtime) of the first active folder with the file, or None.
+        """
+
+        if self._index is None or time.time() - self._checked_at >= self.check_time:
+            self.refresh()
+
+        return self._index.get(file_name) if self._index is not None else None
+
+    def content(self, file_name: str) -> Optional[str]:
+        """Return the content of a file, read again only when it changes."""
+
+        entry = self.find(file_name)
+        if entry is None:
+            return None
+
+        cached = self._contents.get(file_name)
+        if cached is not None and cached[0] == entry[2]:
+            return cached[1]
+
+        if application.PROJECT.conn_manager is None:
+            raise Exception("Project is not connected yet")
+
+        content = application.PROJECT.conn_manager.managerModules().contentFS(entry[1])
+        if content is not None:
+            with self._lock:
+                self._contents[file_name] = (entry[2], content)
+
+        return content
+
+    def refresh(self) -> None:
+        """Read the settings and check the static folders for changes."""
+
+        with self._lock:
+            self.readSettings()
+            signature = tuple((info.active_, info.path_) for info in self.dirs_)
+            index = self.scan()
+            if self._index is not None:
+                if signature != self._signature:
+                    self._changed.update(self._index.keys())
+                    self._changed.update(index.keys())
+                else:
+                    for name in set(self._index.keys()) | set(index.keys()):
+                        if self._index.get(name) != index.get(name):
+                            self._changed.add(name)
+
+                for name in self._changed:
+                    self._contents.pop(name, None)
+
+            self._index = index
+            self._signature = signature
+            self._checked_at = time.time()
+
+    def scan(self) -> Dict[str, Tuple[str, str, int]]:
+        """Return the files of the active static folders."""
+
+        separator = "\\" if sysbasetype.SysBaseType.osName().find("WIN") > -1 else "/"
+        index: Dict[str, Tuple[str, str, int]] = {}
+        for info in self.dirs_:
+            if not info.active_:
+                continue
+            try:
+                entries = list(os.scandir(info.path_))
+            except OSError as error:
+                logger.warning("No se puede leer el directorio %s: %s", info.path_, error)
+                continue
+
+            for entry in entries:
+                if entry.name in index:
+                    continue
+                try:
+                    if entry.is_file():
+                        index[entry.name] = (
+                            info.path_,
+                            info.path_ + separator + entry.name,
+                            entry.stat().st_mtime_ns,
+                        )
+                except OSError:
+                    continue
+
+        return index
+
+    def takeChanged(self) -> List[str]:
+        """Return the files changed since the last call."""
+
+        with self._lock:
+            changed = list(self._changed)
+            self._changed = set()
+
+        return changed
 
 
 class FLStaticLoaderWarning(QtCore.QObject):
@@ -297,41 +413,33 @@ class PNStaticLoader(QtCore.QObject):
     def content(n: str, b: "AQStaticBdInfo", only_path: bool = False) -> Any:
         """Get content from given path."""
         global warn_
-        b.readSettings()
-        separator = "\\" if sysbasetype.SysBaseType.osName().find("WIN") > -1 else "/"
-        for info in b.dirs_:
-            content_path = info.path_ + separator + n
-            if info.active_ and os.path.exists(content_path):
-                if not warn_:
-                    warn_ = FLStaticLoaderWarning()
+        entry = b.find(n)
+        if entry is None:
+            return None
 
-                # timer = QtCore.QTimer
-                # if not warn_.warns_ and config.value("ebcomportamiento/SLInterface", True):
-                #    timer.singleShot(500, warn_.popupWarnings)
+        dir_path, content_path = entry[0], entry[1]
+        if not warn_:
+            warn_ = FLStaticLoaderWarning()
 
-                # if not warn_.paths_:
-                #    timer.singleShot(1500, warn_.updateScripts)
+        # timer = QtCore.QTimer
+        # if not warn_.warns_ and config.value("ebcomportamiento/SLInterface", True):
+        #    timer.singleShot(500, warn_.popupWarnings)
 
-                msg = "%s -> ...%s" % (n, info.path_[0:40])
+        # if not warn_.paths_:
+        #    timer.singleShot(1500, warn_.updateScripts)
 
-                if msg not in warn_.warns_:
-                    warn_.warns_.append(msg)
-                    warn_.paths_.append("%s:%s" % (n, info.path_))
-                    if settings.config.value("ebcomportamiento/SLConsola", False):
-                        logger.warning("CARGA ESTATICA ACTIVADA:%s -> %s", n, info.path_)
+        msg = "%s -> ...%s" % (n, dir_path[0:40])
 
-                if only_path:
-                    return content_path
-                else:
-
-                    if application.PROJECT.conn_manager is None:
-                        raise Exception("Project is not connected yet")
+        if msg not in warn_.warns_:
+            warn_.warns_.append(msg)
+            warn_.paths_.append("%s:%s" % (n, dir_path))
+            if settings.config.value("ebcomportamiento/SLConsola", False):
+                logger.warning("CARGA ESTATICA ACTIVADA:%s -> %s", n, dir_path)
 
-                    return application.PROJECT.conn_manager.managerModules().contentFS(
-                        info.path_ + separator + n
-                    )
+        if only_path:
+            return content_path
 
-        return None
+        return b.content(n)
 
     def __getattr__(self, name: str) -> QtWidgets.QWidget:
         """Emulate child properties as if they were inserted into the object."""
@@ -29,6 +29,49 @@ class TestStaticLoader(unittest.TestCase):
         script = application.load_script.load_script("sys.qs", action)
         self.assertEqual(script.FormInternalObj().saluda(), "Hola!")
 
+    def test_index(self) -> None:
+        """Test files are found by the index and changes are detected."""
+        import os
+        import shutil
+        from pineboolib import application
+
+        mng_modules = application.PROJECT.conn_manager.managerModules()
+        static_info = mng_modules.static_db_info_
+        folder = os.path.join(application.PROJECT.tmpdir, "static_index")
+        os.makedirs(folder, exist_ok=True)
+        file_name = os.path.join(folder, "static_test.qs")
+        with open(file_name, "w") as file_:
+            file_.write("// version 1")
+
+        dirs = config.value("%sdirs" % static_info.key_, [])
+        config.set_value("%sdirs" % static_info.key_, dirs + [True, folder])
+        try:
+            static_info.refresh()
+            static_info.takeChanged()
+            entry = static_info.find("static_test.qs")
+            self.assertTrue(entry)
+            self.assertEqual(entry[1], file_name)
+            self.assertEqual(mng_modules.contentStatic("static_test.qs"), "// version 1")
+            self.assertTrue(static_info.find("sys.py"))
+            self.assertFalse(static_info.find("no_exists.qs"))
+
+            with open(file_name, "w") as file_:
+                file_.write("// version 2")
+            os.utime(file_name, (0, 0))
+            self.assertEqual(mng_modules.contentStatic("static_test.qs"), "// version 1")
+            static_info._checked_at = 0
+            mng_modules.filesCached_["static_test.qs"] = "// cached"
+            self.assertEqual(mng_modules.contentStatic("static_test.qs"), "// version 2")
+            self.assertFalse("static_test.qs" in mng_modules.filesCached_.keys())
+
+            os.remove(file_name)
+            static_info._checked_at = 0
+            self.assertEqual(mng_modules.contentStatic("static_test.qs"), None)
+        finally:
+            config.set_value("%sdirs" % static_info.key_, dirs)
+            static_info.refresh()
+            shutil.rmtree(folder)
+
     @classmethod
     def tearDownClass(cls) -> None:
         """Ensure test clear all data."""
@@ -40,6 +40,90 @@ class TestProjectModule(unittest.TestCase):
         if os.path.exists(path_py):
             os.remove(path_py)
 
+    def test_script_cache(self) -> None:
+        """Test converted scripts are restored from the shared store."""
+
+        from pineboolib import application
+        from pineboolib.application.utils import script_cache
+        import importlib.util
+        import os
+        import shutil
+
+        path = fixture_path("flfacturac.qs")
+        tmp_path = "%s/%s" % (application.PROJECT.tmpdir, "temp_qs_script_cache.qs")
+        path_py = "%s.py" % tmp_path[:-3]
+        shutil.copy(path, tmp_path)
+        if os.path.exists(path_py):
+            os.remove(path_py)
+
+        cached_py = script_cache.store_path(tmp_path)
+        if os.path.exists(os.path.dirname(cached_py)):
+            shutil.rmtree(os.path.dirname(cached_py))
+
+        application.PROJECT.no_python_cache = False
+        application.PROJECT.parse_script_list([tmp_path])
+        self.assertTrue(os.path.exists(cached_py))
+        self.assertTrue(os.path.exists(importlib.util.cache_from_source(cached_py)))
+        with open(path_py) as file_:
+            converted = file_.read()
+
+        os.remove(path_py)
+        application.PROJECT.parse_script_list([tmp_path])
+        with open(path_py) as file_:
+            self.assertEqual(file_.read(), converted)
+        self.assertTrue(os.path.exists(importlib.util.cache_from_source(path_py)))
+
+        with open(tmp_path, "a") as file_:
+            file_.write("\n")
+        self.assertNotEqual(script_cache.store_path(tmp_path), cached_py)
+        self.assertFalse(script_cache.restore(tmp_path, path_py))
+        application.PROJECT.no_python_cache = True
+
+        os.remove(tmp_path)
+        os.remove(path_py)
+        shutil.rmtree(os.path.dirname(cached_py))
+
+    def test_download_files(self) -> None:
+        """Test flfiles contents are downloaded in chunks."""
+
+        from pineboolib import application
+        from pineboolib.application.database import pnsqlquery
+        from pineboolib.core import settings
+        import os
+        import shutil
+
+        qry = pnsqlquery.PNSqlQuery()
+        pending = {}
+        folder = "%s/%s" % (application.PROJECT.tmpdir, "temp_download_files")
+        for number in range(5):
+            name = "download_%s.qs" % number
+            self.assertTrue(
+                qry.exec_(
+                    "INSERT INTO flfiles (nombre, bloqueo, idmodulo, sha, contenido) VALUES"
+                    " ('%s', true, 'sys', 'SHA%s', 'var content = %s;')" % (name, number, number)
+                )
+            )
+            pending[("sys", name, "SHA%s" % number)] = "%s/%s/SHA%s.qs" % (folder, name, number)
+
+        pending[("sys", "download_0.qs", "OTHER")] = "%s/other.qs" % folder
+        os.makedirs("%s/download_1.qs" % folder)
+        with open("%s/download_1.qs/OLD.qs" % folder, "w") as file_:
+            file_.write("old")
+
+        settings.config.set_value("ebcomportamiento/flfiles_chunk_size", 2)
+        try:
+            application.PROJECT.download_files(pending)
+        finally:
+            settings.config.set_value("ebcomportamiento/flfiles_chunk_size", 100)
+            qry.exec_("DELETE FROM flfiles WHERE nombre LIKE 'download_%'")
+
+        for number in range(5):
+            with open("%s/download_%s.qs/SHA%s.qs" % (folder, number, number)) as file_:
+                self.assertEqual(file_.read(), "var content = %s;" % number)
+        self.assertFalse(os.path.exists("%s/download_1.qs/OLD.qs" % folder))
+        self.assertFalse(os.path.exists("%s/other.qs" % folder))
+        shutil.rmtree(folder)
+
     @classmethod
     def tearDownClass(cls) -> None:
         """Ensure test clear all data."""
@@ -0,0 +1,147 @@
+"""
+Manage the shared store of converted scripts.
+
+The Python code generated from a QS file only depends on the QS content and on the
+converter, so it is kept in a content addressed store shared by every database:
+<ebcomportamiento/script_cache_dir>/<converter signature>/<sha1 of the qs>/<name>.qs.py
+together with its compiled bytecode.
+"""
+
+import hashlib
+import importlib.util
+import os
+import os.path
+import py_compile
+import shutil
+import tempfile
+
+from pineboolib.core.settings import config
+from pineboolib import logging, application
+
+from typing import Optional
+
+LOGGER = logging.getLogger("script_cache")
+
+CONVERTER_FILES = ("flex.py", "flscriptparse.py", "postparse.py", "pyconvert.py", "pytnyzer.py")
+
+_SIGNATURE: Optional[str] = None
+
+
+def enabled() -> bool:
+    """Return if the store is used."""
+
+    return config.value("ebcomportamiento/script_cache", True) in (True, "true") and not getattr(
+        application.PROJECT, "no_python_cache", False
+    )
+
+
+def store_dir() -> str:
+    """Return the store folder. By default script_cache, next to the cache folder."""
+
+    folder = config.value("ebcomportamiento/script_cache_dir", "")
+    if not folder:
+        folder = os.path.join(application.PROJECT.tmpdir, "script_cache")
+
+    return folder
+
+
+def converter_signature() -> str:
+    """Return a hash of the pineboo version and the sources of the QS converter."""
+
+    global _SIGNATURE
+
+    if _SIGNATURE is None:
+        from pineboolib.application.parsers import qsaparser
+
+        hash_ = hashlib.sha1()
+        hash_.update(application.PROJECT.load_version().split(" ")[-1].encode("UTF-8"))
+        folder = os.path.dirname(qsaparser.__file__)
+        for file_name in CONVERTER_FILES:
+            with open(os.path.join(folder, file_name), "rb") as file_:
+                hash_.update(file_.read())
+
+        _SIGNATURE = hash_.hexdigest()[:16]
+
+    return _SIGNATURE
+
+
+def store_path(src_path: str) -> str:
+    """
+    Return the store path of the Python file for a QS file.
+
+    @param src_path. QS file path.
+    @return path, that may not exist.
+    """
+
+    with open(src_path, "rb") as file_:
+        sha = hashlib.sha1(file_.read()).hexdigest()
+
+    name = os.path.basename(src_path)
+    return os.path.join(store_dir(), converter_signature(), sha, "%s.py" % name[:-3])
+
+
+def restore(src_path: str, dst_path: str) -> bool:
+    """
+    Copy the converted file (and its bytecode) of a QS file from the store.
+
+    @param src_path. QS file path.
+    @param dst_path. Python file path.
+    @return True if the file was in the store.
+    """
+
+    if not enabled():
+        return False
+
+    try:
+        cached_py = store_path(src_path)
+        if not os.path.exists(cached_py):
+            return False
+
+        # copy2 conserva la fecha, así el bytecode sigue siendo válido para la copia.
+        shutil.copy2(cached_py, dst_path)
+        cached_pyc = importlib.util.cache_from_source(cached_py)
+        if os.path.exists(cached_pyc):
+            dst_pyc = importlib.util.cache_from_source(dst_path)
+            os.makedirs(os.path.dirname(dst_pyc), exist_ok=True)
+            shutil.copy2(cached_pyc, dst_pyc)
+    except Exception as error:
+        LOGGER.warning("No se ha podido recuperar %s del almacén: %s", src_path, error)
+        return False
+
+    return True
+
+
+def store(src_path: str, dst_path: str) -> None:
+    """
+    Save the converted file of a QS file in the store and compile it.
+
+    @param src_path. QS file path.
+    @param dst_path. Python file path.
+    """
+
+    if not enabled() or not os.path.exists(dst_path):
+        return
+
+    tmp_path = None
+    try:
+        cached_py = store_path(src_path)
+        if os.path.exists(cached_py):
+            return
+
+        folder = os.path.dirname(cached_py)
+        os.makedirs(folder, exist_ok=True)
+        # Se escribe en un temporal y se renombra para que otros procesos no lean un fichero a medias.
+        handle, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        os.close(handle)
+        shutil.copy2(dst_path, tmp_path)
+        py_compile.compile(
+            tmp_path,
+            cfile=importlib.util.cache_from_source(cached_py),
+            dfile=cached_py,
+            doraise=True,
+        )
+        os.replace(tmp_path, cached_py)
+    except Exception as error:
+        LOGGER.warning("No se ha podido guardar %s en el almacén: %s", src_path, error)
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
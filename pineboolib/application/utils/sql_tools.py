@@ -6,7 +6,7 @@ from pineboolib.core.utils import logging
 from pineboolib import application
 
 import datetime
-from typing import Dict, Any, List, TYPE_CHECKING
+from typing import Callable, Dict, Any, List, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pineboolib.interfaces.ifieldmetadata import IFieldMetaData  # noqa: F401
@@ -26,6 +26,7 @@ class SqlInspector(object):
     _alias: Dict[str, str]
     _posible_float: bool
     _list_sql: List[str]
+    _converters: Dict[bool, Tuple[Callable[[Any], Any], ...]]
 
     def __init__(self) -> None:
         """
@@ -36,6 +37,7 @@ class SqlInspector(object):
         self._field_list = {}
         self._table_names = []
         self._mtd_fields = {}
+        self._converters = {}
         # self.set_sql(sql_text)
         # self.resolve()
 
@@ -51,6 +53,7 @@ class SqlInspector(object):
         self._alias = {}
         self._list_sql = []
         self._posible_float = False
+        self._converters = {}
         if self._sql.startswith("show"):
             return
 
@@ -373,30 +376,64 @@ class SqlInspector(object):
         @param pos. index postion.
         """
 
-        if not self.mtd_fields():
-            if isinstance(value, datetime.time):
-                value = str(value)[0:8]
-            return value
+        converters = self.converters(raw)
+        if 0 <= pos < len(converters):
+            return converters[pos](value)
+
+        if not self._mtd_fields:
+            return _plain_value(value)
+
+        return self._converter(pos, raw)(value)
+
+    def converters(self, raw: bool = False) -> Tuple[Callable[[Any], Any], ...]:
+        """
+        Return a tuple with the function that converts the values of each position.
+
+        The functions are built once per resolved query.
+        @param raw. pixmap fields return the reference instead of the content.
+        """
+
+        raw = bool(raw)
+        if raw not in self._converters:
+            positions = set(self._field_list.values())
+            if self._mtd_fields:
+                positions.update(self._mtd_fields.keys())
+                self._converters[raw] = tuple(
+                    self._converter(pos, raw) for pos in range(max(positions) + 1)
+                )
+            else:
+                self._converters[raw] = tuple(
+                    _plain_value for pos in range(max(positions) + 1 if positions else 0)
+                )
+
+        return self._converters[raw]
+
+    def _converter(self, pos: int, raw: bool) -> Callable[[Any], Any]:
+        """
+        Return the function that converts the values of a position according to field type.
+
+        @param pos. index postion.
+        @param raw. pixmap fields return the reference instead of the content.
+        """
+
+        from pineboolib.application import types
 
         type_ = "double"
         if pos not in self._mtd_fields.keys():
             if pos not in self._field_list.values():
-                LOGGER.warning("SQL_TOOLS : resolve_value : No se encuentra la posición %s", pos)
-                return None
+                return lambda value: _missing_value(pos)
         else:
             mtd = self._mtd_fields[pos]
             if mtd is not None:
                 type_ = mtd.type()
 
-        ret_: Any = value
         if type_ in ("string", "stringlist", "timestamp"):
-            pass
+            return _same_value
         elif type_ == "double":
-            ret_ = float(ret_)
+            return float
         elif type_ in ("int", "uint", "serial"):
-            ret_ = int(ret_)
+            return int
         elif type_ == "pixmap":
-
             if application.PROJECT.conn_manager is None:
                 raise Exception("Project is not connected yet")
 
@@ -404,29 +441,19 @@ class SqlInspector(object):
             if metadata is None:
                 raise Exception("Metadata not found")
             if raw or not application.PROJECT.conn_manager.manager().isSystemTable(metadata.name()):
-                ret_ = application.PROJECT.conn_manager.manager().fetchLargeValue(ret_)
+                return _large_value
+            return _same_value
         elif type_ == "date":
-            from pineboolib.application import types
-
-            ret_ = types.Date(str(ret_))
+            return lambda value: types.Date(str(value))
         elif type_ == "time":
-            ret_ = str(ret_)
-            if ret_.find(".") > -1:
-                ret_ = ret_[0 : ret_.find(".")]
-            elif ret_.find("+") > -1:
-                ret_ = ret_[0 : ret_.find("+")]
-
+            return _time_value
         elif type_ in ("unlock", "bool"):
-            from pineboolib.application import types
-
-            ret_ = types.boolean(ret_)
+            return types.boolean
         elif type_ == "bytearray":
-            ret_ = bytearray(ret_)
-        else:
-            ret_ = float(ret_)
-            print("TIPO DESCONOCIDO", type_, ret_)
+            return bytearray
 
-        return ret_
+        LOGGER.warning("SQL_TOOLS : tipo desconocido %s en la posición %s", type_, pos)
+        return float
 
     def _create_mtd_fields(self, fields_list: list, tables_list: list) -> None:
         """
@@ -469,3 +496,41 @@ class SqlInspector(object):
                     if table_name not in self._invalid_tables:
                         self._invalid_tables.append(table_name)
                     # tables_list.remove(table_name)
+
+
+def _same_value(value: Any) -> Any:
+    """Return the value as is."""
+
+    return value
+
+
+def _plain_value(value: Any) -> Any:
+    """Return the value of a field without metadata."""
+
+    if isinstance(value, datetime.time):
+        value = str(value)[0:8]
+    return value
+
+
+def _time_value(value: Any) -> str:
+    """Return a time value without fractions of second or time zone."""
+
+    value = str(value)
+    if value.find(".") > -1:
+        value = value[0 : value.find(".")]
+    elif value.find("+") > -1:
+        value = value[0 : value.find("+")]
+    return value
+
+
+def _large_value(value: Any) -> Any:
+    """Return the content of a large value reference."""
+
+    return application.PROJECT.conn_manager.manager().fetchLargeValue(value)
+
+
+def _missing_value(pos: int) -> None:
+    """Warn about a position that is not in the query."""
+
+    LOGGER.warning("SQL_TOOLS : resolve_value : No se encuentra la posición %s", pos)
+    return None
@@ -10,7 +10,7 @@ from pineboolib import application, logging
 from pineboolib.application import types
 from pineboolib.application.database import pnsqlcursor
 
-from typing import Union, Any, List, TYPE_CHECKING
+from typing import Union, Any, Dict, List, Optional, TYPE_CHECKING
 
 
 if TYPE_CHECKING:
@@ -142,6 +142,33 @@ class AQSql(object):
 
         return ok
 
+    @classmethod
+    def insertBulk(
+        self,
+        table_or_cursor: Union[str, "isqlcursor.ISqlCursor"],
+        records: Union[List[Dict[str, Any]], types.Array],
+        conn: str = "default",
+        chunk_size: Optional[int] = None,
+    ) -> bool:
+        """Insert a list of records ({field: value}) in a cursor at once."""
+        cur: "isqlcursor.ISqlCursor"
+
+        if isinstance(table_or_cursor, str):
+            cur = pnsqlcursor.PNSqlCursor(table_or_cursor, conn)
+        else:
+            cur = table_or_cursor
+
+        if not cur.metadata():
+            return False
+
+        records_list: List[Dict[str, Any]] = []
+        for record in records:
+            if isinstance(record, types.Array):
+                record = dict(record._dict)
+            records_list.append(record)
+
+        return cur.insertBulk(records_list, chunk_size)
+
     @classmethod
     def del_(
         self,
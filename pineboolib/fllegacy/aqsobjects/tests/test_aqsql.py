@@ -31,6 +31,26 @@ class TestAQSql(unittest.TestCase):
         cur_areas.refresh()
         self.assertEqual(cur_areas.size(), 0)
 
+    def test_insert_bulk(self) -> None:
+        """InsertBulk test."""
+        from pineboolib.application.database import pnsqlcursor
+        from pineboolib.application import types
+        from pineboolib.fllegacy.aqsobjects import aqsql
+
+        records = types.Array()
+        for number in range(3):
+            record = types.Array()
+            record["idarea"] = "B%s" % number
+            record["descripcion"] = "descripcion area %s" % number
+            records.append(record)
+
+        aq_ = aqsql.AQSql()
+        self.assertTrue(aq_.insertBulk("flareas", records))
+        cur_areas = pnsqlcursor.PNSqlCursor("flareas")
+        cur_areas.select("idarea LIKE 'B%'")
+        self.assertEqual(cur_areas.size(), 3)
+        self.assertTrue(aq_.del_("flareas", "idarea LIKE 'B%'"))
+
     @classmethod
     def tearDownClass(cls) -> None:
         """Ensure test clear all data."""
@@ -11,9 +11,10 @@ from pineboolib.application.metadata import (
     pntablemetadata,
     pnrelationmetadata,
     pnfieldmetadata,
+    pnmetadatacache,
 )
 
-from pineboolib.application.database import pnsqlquery, pngroupbyquery, pnsqlcursor
+from pineboolib.application.database import pnsqlquery, pngroupbyquery, pnsqlcursor, pnlargevalues
 from pineboolib.application.utils import xpm, convert_flaction
 
 
@@ -26,7 +27,7 @@ from . import flutil
 
 from xml.etree import ElementTree
 
-from typing import Optional, Union, Any, List, Dict, TYPE_CHECKING
+from typing import Optional, Union, Any, Iterable, List, Dict, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pineboolib.interfaces import iconnection
@@ -204,10 +205,39 @@ class FLManager(QtCore.QObject, IManager):
 
                 # docElem = doc.documentElement()
                 # tree = utils_base.load2xml(stream)
-                tree = ElementTree.fromstring(stream)
-                ret = self.metadata(tree, quick)
-                if ret is None:
-                    return None
+                metadata_cache = pnmetadatacache.METADATA_CACHE
+                cache_key = metadata_cache.key(stream)
+                ret = metadata_cache.load(self.db_.DBName(), cache_key)
+                if ret is not None:
+                    ret.setAlias(util.translate("Metadata", ret.alias()))
+                    for field in ret.fieldList():
+                        field.setAlias(util.translate("Metadata", field.alias()))
+                else:
+                    tree = ElementTree.fromstring(stream)
+                    ret = self._metadata_from_xml(tree, quick)
+                    if ret is None:
+                        return None
+
+                    if not ret.isQuery():
+                        # Las consultas dependen de los metadatos de otras tablas, no se guardan.
+                        alias_node = tree.find("alias")
+                        field_aliases: Dict[str, str] = {}
+                        for field_node in tree.findall("field"):
+                            name_node = field_node.find("name")
+                            field_alias_node = field_node.find("alias")
+                            if name_node is not None and name_node.text:
+                                field_aliases[name_node.text] = utils_base.auto_qt_translate_text(
+                                    field_alias_node.text if field_alias_node is not None else ""
+                                )
+                        metadata_cache.store(
+                            self.db_.DBName(),
+                            cache_key,
+                            ret,
+                            utils_base.auto_qt_translate_text(
+                                alias_node.text if alias_node is not None else ""
+                            ),
+                            field_aliases,
+                        )
 
                 if not ret.isQuery() and not self.existsTable(metadata_name_or_xml):
                     self.createTable(ret)
@@ -248,143 +278,159 @@ class FLManager(QtCore.QObject, IManager):
             return ret
 
         else:
-            # QDomDoc
-
-            # root = n.getroot()
-            name: str = ""
-            query: str = ""
-            alias: str = ""
-            ftsfun: str = ""
-            visible = True
-            editable = True
-            concur_warn = False
-            detect_locks = False
-
-            for child in metadata_name_or_xml:
-                if child.tag == "field":
-                    continue
-                elif child.tag == "name":
-                    name = child.text or ""
-                elif child.tag == "query":
-                    query = child.text or ""
-                elif child.tag == "alias":
-                    alias = util.translate(
-                        "Metadata", utils_base.auto_qt_translate_text(child.text)
-                    )
-                elif child.tag == "visible":
-                    visible = child.text == "true"
-                elif child.tag == "editable":
-                    editable = child.text == "true"
-                elif child.tag == "detectLocks":
-                    detect_locks = child.text == "true"
-                elif child.tag == "concurWarn":
-                    concur_warn = child.text == "true"
-                elif child.tag == "FTSFunction":
-                    ftsfun = child.text or ""
-
-            table_metadata = pntablemetadata.PNTableMetaData(name, alias, query)
-
-            table_metadata.setFTSFunction(ftsfun)
-            table_metadata.setConcurWarn(concur_warn)
-            table_metadata.setDetectLocks(detect_locks)
-
-            compound_key = pncompoundkeymetadata.PNCompoundKeyMetaData()
-            assocs = []
-
-            for child in metadata_name_or_xml:
-                if child.tag == "field":
-                    field_mtd = self.metadataField(child, visible, editable)
-                    table_metadata.addFieldMD(field_mtd)
-                    if field_mtd.isCompoundKey():
-                        compound_key.addFieldMD(field_mtd)
-
-                    if field_mtd.associatedFieldName():
-                        assocs.append(field_mtd.associatedFieldName())
-                        assocs.append(field_mtd.associatedFieldFilterTo())
-                        assocs.append(field_mtd.name())
-
-            table_metadata.setCompoundKey(compound_key)
+            table_metadata = self._metadata_from_xml(metadata_name_or_xml, quick)
+            acl = flapplication.aqApp.acl()
+            if acl:
+                acl.process(table_metadata)
+
+            return table_metadata
+
+    def _metadata_from_xml(
+        self, metadata_xml: "ElementTree.Element", quick: bool
+    ) -> "pntablemetadata.PNTableMetaData":
+        """
+        Build the definition of a table from the xml of its .mtd file, without applying ACLs.
+
+        @param metadata_xml. Root element of the .mtd file.
+        @param quick. If False, the fields of the queries are checked.
+        @return PNTableMetaData.
+        """
+
+        util = flutil.FLUtil()
+
+        # root = n.getroot()
+        name: str = ""
+        query: str = ""
+        alias: str = ""
+        ftsfun: str = ""
+        visible = True
+        editable = True
+        concur_warn = False
+        detect_locks = False
+        lazy_count = False
+
+        for child in metadata_xml:
+            if child.tag == "field":
+                continue
+            elif child.tag == "name":
+                name = child.text or ""
+            elif child.tag == "query":
+                query = child.text or ""
+            elif child.tag == "alias":
+                alias = util.translate("Metadata", utils_base.auto_qt_translate_text(child.text))
+            elif child.tag == "visible":
+                visible = child.text == "true"
+            elif child.tag == "editable":
+                editable = child.text == "true"
+            elif child.tag == "detectLocks":
+                detect_locks = child.text == "true"
+            elif child.tag == "concurWarn":
+                concur_warn = child.text == "true"
+            elif child.tag == "lazyCount":
+                lazy_count = child.text == "true"
+            elif child.tag == "FTSFunction":
+                ftsfun = child.text or ""
+
+        table_metadata = pntablemetadata.PNTableMetaData(name, alias, query)
+
+        table_metadata.setFTSFunction(ftsfun)
+        table_metadata.setConcurWarn(concur_warn)
+        table_metadata.setDetectLocks(detect_locks)
+        table_metadata.setLazyCount(lazy_count)
+
+        compound_key = pncompoundkeymetadata.PNCompoundKeyMetaData()
+        assocs = []
+
+        for child in metadata_xml:
+            if child.tag == "field":
+                field_mtd = self.metadataField(child, visible, editable)
+                table_metadata.addFieldMD(field_mtd)
+                if field_mtd.isCompoundKey():
+                    compound_key.addFieldMD(field_mtd)
+
+                if field_mtd.associatedFieldName():
+                    assocs.append(field_mtd.associatedFieldName())
+                    assocs.append(field_mtd.associatedFieldFilterTo())
+                    assocs.append(field_mtd.name())
+
+        table_metadata.setCompoundKey(compound_key)
+        aWith = None
+        aBy = None
+
+        for it in assocs:
+            if not aWith:
+                aWith = it
+                continue
+            elif not aBy:
+                aBy = it
+                continue
+
+            elif table_metadata.field(it) is None:
+                continue
+
+            if table_metadata.field(aWith) is not None:
+                table_metadata.field(it).setAssociatedField(table_metadata.field(aWith), aBy)
             aWith = None
             aBy = None
 
-            for it in assocs:
-                if not aWith:
-                    aWith = it
-                    continue
-                elif not aBy:
-                    aBy = it
-                    continue
+        if query and not quick:
+            qry = self.query(query)
+            if qry:
+                table = None
+                field = None
+                fields = table_metadata.fieldNames()
+                # .split(",")
+                fieldsEmpty = not fields
+
+                for it2 in qry.fieldList():
+                    pos = it2.find(".")
+                    if pos > -1:
+                        table = it2[:pos]
+                        field = it2[pos + 1 :]
+                    else:
+                        field = it2
 
-                elif table_metadata.field(it) is None:
-                    continue
+                    # if not (not fieldsEmpty and table == name and fields.find(field.lower())) != fields.end():
+                    # print("Tabla %s nombre %s campo %s buscando en %s" % (table, name, field, fields))
+                    # if not fieldsEmpty and table == name and (field.lower() in fields): Asi
+                    # esta en Eneboo, pero incluye campos repetidos
+                    if not fieldsEmpty and (field.lower() in fields):
+                        continue
 
-                if table_metadata.field(aWith) is not None:
-                    table_metadata.field(it).setAssociatedField(table_metadata.field(aWith), aBy)
-                aWith = None
-                aBy = None
+                    if table is None:
+                        raise ValueError("table is empty!")
 
-            if query and not quick:
-                qry = self.query(query)
-                if qry:
-                    table = None
-                    field = None
-                    fields = table_metadata.fieldNames()
-                    # .split(",")
-                    fieldsEmpty = not fields
-
-                    for it2 in qry.fieldList():
-                        pos = it2.find(".")
-                        if pos > -1:
-                            table = it2[:pos]
-                            field = it2[pos + 1 :]
-                        else:
-                            field = it2
-
-                        # if not (not fieldsEmpty and table == name and fields.find(field.lower())) != fields.end():
-                        # print("Tabla %s nombre %s campo %s buscando en %s" % (table, name, field, fields))
-                        # if not fieldsEmpty and table == name and (field.lower() in fields): Asi
-                        # esta en Eneboo, pero incluye campos repetidos
-                        if not fieldsEmpty and (field.lower() in fields):
-                            continue
-
-                        if table is None:
-                            raise ValueError("table is empty!")
-
-                        mtdAux = self.metadata(table, True)
-                        if mtdAux is not None:
-                            fmtdAux = mtdAux.field(field)
-                            if fmtdAux is not None:
-                                isForeignKey = False
-                                if fmtdAux.isPrimaryKey() and not table == name:
-                                    fmtdAux = pnfieldmetadata.PNFieldMetaData(fmtdAux)
-                                    fmtdAux.setIsPrimaryKey(False)
-                                    fmtdAux.setEditable(False)
-
-                                # newRef = not isForeignKey
-                                fmtdAuxName = fmtdAux.name().lower()
-                                if fmtdAuxName.find(".") == -1:
-                                    # fieldsAux = table_metadata.fieldNames().split(",")
-                                    fieldsAux = table_metadata.fieldNames()
-                                    if fmtdAuxName not in fieldsAux:
-                                        if not isForeignKey:
-                                            fmtdAux = pnfieldmetadata.PNFieldMetaData(fmtdAux)
-
-                                        fmtdAux.setName("%s.%s" % (table, field))
-                                        # newRef = False
-
-                                # FIXME: ref() does not exist. Probably a C++ quirk from Qt to reference counting.
-                                # if newRef:
-                                #    fmtdAux.ref()
-
-                                table_metadata.addFieldMD(fmtdAux)
-
-                    del qry
+                    mtdAux = self.metadata(table, True)
+                    if mtdAux is not None:
+                        fmtdAux = mtdAux.field(field)
+                        if fmtdAux is not None:
+                            isForeignKey = False
+                            if fmtdAux.isPrimaryKey() and not table == name:
+                                fmtdAux = pnfieldmetadata.PNFieldMetaData(fmtdAux)
+                                fmtdAux.setIsPrimaryKey(False)
+                                fmtdAux.setEditable(False)
 
-            acl = flapplication.aqApp.acl()
-            if acl:
-                acl.process(table_metadata)
+                            # newRef = not isForeignKey
+                            fmtdAuxName = fmtdAux.name().lower()
+                            if fmtdAuxName.find(".") == -1:
+                                # fieldsAux = table_metadata.fieldNames().split(",")
+                                fieldsAux = table_metadata.fieldNames()
+                                if fmtdAuxName not in fieldsAux:
+                                    if not isForeignKey:
+                                        fmtdAux = pnfieldmetadata.PNFieldMetaData(fmtdAux)
 
-            return table_metadata
+                                    fmtdAux.setName("%s.%s" % (table, field))
+                                    # newRef = False
+
+                            # FIXME: ref() does not exist. Probably a C++ quirk from Qt to reference counting.
+                            # if newRef:
+                            #    fmtdAux.ref()
+
+                            table_metadata.addFieldMD(fmtdAux)
+
+                del qry
+
+        return table_metadata
 
     @decorators.NotImplementedWarn
     def metadataDev(self, n: str, quick: bool = False) -> bool:
@@ -1435,12 +1481,11 @@ class FLManager(QtCore.QObject, IManager):
         @return Large value stored
         """
         if ref_key and ref_key[0:3] == "RK@":
+            content = pnlargevalues.LARGE_VALUES.get(ref_key)
+            if content is not None:
+                return xpm.cache_xpm(content)
 
-            table_name = (
-                "fllarge"
-                if flapplication.aqApp.singleFLLarge()
-                else "fllarge_" + ref_key.split("@")[1]
-            )
+            table_name = self.largeValueTable(ref_key)
 
             if self.existsTable(table_name):
                 q = pnsqlquery.PNSqlQuery(None, "dbAux")
@@ -1448,10 +1493,95 @@ class FLManager(QtCore.QObject, IManager):
                 q.setFrom(table_name)
                 q.setWhere("refkey = '%s'" % ref_key)
                 if q.exec_() and q.first():
-                    return xpm.cache_xpm(q.value(0))
+                    content = q.value(0)
+                    if content:
+                        pnlargevalues.LARGE_VALUES.set(ref_key, content)
+                    return xpm.cache_xpm(content)
 
         return None
 
+    def prefetchLargeValues(self, ref_keys: Iterable[Any]) -> int:
+        """
+        Read with one query per table the large values of several reference keys.
+
+        The contents are kept in the large values cache, so the next fetchLargeValue
+        of these keys does not query the database. The reading stops when the contents would
+        not fit in the cache, so they do not drop each other.
+
+        @param ref_keys. Reference keys. Values that are not reference keys are ignored.
+        @return Number of contents read.
+        """
+
+        large_values = pnlargevalues.LARGE_VALUES
+        if not large_values.max_bytes():
+            return 0
+
+        pending: Dict[str, Dict[str, bool]] = {}
+        single = None
+        for ref_key in ref_keys:
+            if (
+                isinstance(ref_key, str)
+                and ref_key[0:3] == "RK@"
+                and not large_values.contains(ref_key)
+            ):
+                if single is None:
+                    single = flapplication.aqApp.singleFLLarge()
+                pending.setdefault(self.largeValueTable(ref_key, single), {})[ref_key] = True
+
+        total = 0
+        budget = large_values.max_bytes()
+        conn = self.db_.connManager().dbAux()
+        chunk_size = 200
+        for table_name, keys in pending.items():
+            if budget <= 0:
+                break
+            if not self.existsTable(table_name):
+                continue
+
+            list_keys = list(keys.keys())
+            for pos in range(0, len(list_keys), chunk_size):
+                cursor = conn.execute_query(
+                    "SELECT refkey, contenido FROM %s WHERE refkey IN (%s)"
+                    % (
+                        table_name,
+                        ", ".join(
+                            conn.driver().formatValue("string", ref_key, False)
+                            for ref_key in list_keys[pos : pos + chunk_size]
+                        ),
+                    ),
+                    conn.cursor(),
+                )
+                if conn.lastError():
+                    logger.warning("prefetchLargeValues: %s", conn.lastError())
+                    break
+
+                for ref_key, content in cursor.fetchall():
+                    if content:
+                        budget -= len(content)
+                        if budget < 0:
+                            break
+                        large_values.set(ref_key, content)
+                        total += 1
+
+                if budget <= 0:
+                    break
+
+        return total
+
+    def largeValueTable(self, ref_key: str, single: Optional[bool] = None) -> str:
+        """
+        Return the name of the table that stores the large value of a reference key.
+
+        @param ref_key. Reference key.
+        @param single. Result of aqApp.singleFLLarge(), if it is already known.
+        @return Table name.
+        """
+
+        if single is None:
+            single = flapplication.aqApp.singleFLLarge()
+
+        return "fllarge" if single else "fllarge_" + ref_key.split("@")[1]
+
     def initCount(self) -> int:
         """
         Indicate the number of times FLManager :: init () has been called.
@@ -12,9 +12,10 @@ from pineboolib.application.staticloader import pnmodulesstaticloader
 from pineboolib.application.database import pnsqlquery, pnsqlcursor
 
 from pineboolib.application.utils import path, xpm, convert_flaction
-from pineboolib.application.parsers.qt3uiparser import qt3ui
+from pineboolib.application.parsers.qt3uiparser import qt3ui, formcache
 
 from pineboolib import application
+from pineboolib.application import file as app_file
 
 from pineboolib.q3widgets import qmainwindow, qdialog
 
@@ -24,7 +25,7 @@ from . import flformrecorddb
 
 from pineboolib import logging
 
-from typing import Union, List, Dict, Optional, cast, TYPE_CHECKING
+from typing import Any, Iterable, Union, List, Dict, Optional, Set, cast, TYPE_CHECKING
 import os
 
 
@@ -111,6 +112,12 @@ class FLManagerModules(object):
     """
     dict_module_files_: Dict[str, str]
 
+    """
+    Catálogo de ficheros de flfiles (nombre -> módulo, sha y ruta en la caché).
+    Se carga una vez por carga del proyecto y evita consultar flfiles en cada fichero.
+    """
+    files_catalog_: Optional[Dict[str, app_file.File]]
+
     """
     Uso interno.
     Informacion para la carga estatica desde el disco local
@@ -144,6 +151,8 @@ class FLManagerModules(object):
         self.list_id_areas_ = []
         self.dict_info_mods_ = {}
         self.dict_module_files_ = {}
+        self.files_catalog_ = None
+        self.static_mtd_loaded_: Set[str] = set()
 
     # """
     # Acciones de inicialización del sistema de módulos.
@@ -171,9 +180,12 @@ class FLManagerModules(object):
             del self.dict_module_files_
             self.dict_module_files_ = {}
 
+        self.files_catalog_ = None
+
         if self.static_db_info_:
             del self.static_db_info_
             self.static_db_info_ = pnmodulesstaticloader.AQStaticBdInfo(self.conn_)
+            self.static_mtd_loaded_ = set()
 
         if self.dict_key_files_:
             self.writeState()
@@ -299,14 +311,10 @@ class FLManagerModules(object):
         if sys_table:
             modId = "sys"
         else:
-            modId = self.idModuleOfFile(file_name)
-            if not sha_key:
-                cursor = self.conn_.execute_query(
-                    "SELECT sha FROM flfiles WHERE nombre='%s'" % file_name
-                )
-
-                for contenido in cursor:
-                    sha_key = contenido[0]
+            file_info = self.fileInfo(file_name)
+            modId = file_info.module if file_info is not None else ""
+            if not sha_key and file_info is not None:
+                sha_key = file_info.sha
 
         # if not PROJECT._DGI:
         #    raise Exception("DGI not loaded")
@@ -384,9 +392,11 @@ class FLManagerModules(object):
             cursor.setValueBuffer("nombre", file_name)
             cursor.setValueBuffer("idmodulo", id_module)
 
+        sha = flutil.FLUtil().sha1(content)
         cursor.setValueBuffer("contenido", content)
-        cursor.setValueBuffer("sha", flutil.FLUtil().sha1(content))
-        cursor.commitBuffer()
+        cursor.setValueBuffer("sha", sha)
+        if cursor.commitBuffer():
+            self.updateFileInfo(id_module, file_name, sha)
 
     @staticmethod
     def createUI(
@@ -424,16 +434,14 @@ class FLManagerModules(object):
 
             return QtWidgets.QWidget()
 
-        tree = utils_base.load2xml(form_path)
+        form = formcache.FORM_CACHE.load(form_path)
 
-        if not tree:
+        if form is None:
             return parent or QtWidgets.QWidget()
 
-        root_ = tree.getroot()
+        root_ = form.tree.getroot()
 
-        UIVersion = root_.get("version")
-        if UIVersion is None:
-            UIVersion = "1.0"
+        UIVersion = form.version()
         if parent is None:
 
             wid = root_.find("widget")
@@ -748,18 +756,69 @@ class FLManagerModules(object):
         if not file_name[:3] == "sys" and not self.conn_.connManager().manager().isSystemTable(
             file_name
         ):
-            formatVal = (
+            file_info = self.fileInfo(file_name)
+            if file_info is not None:
+                return str(file_info.sha)
+
+        return ""
+
+    def loadFilesCatalog(self, rows: Optional[Iterable[Any]] = None) -> None:
+        """
+        Load the catalog of the files stored in flfiles.
+
+        @param rows. (idmodulo, nombre, sha) of every file, if they are already read.
+        """
+
+        if rows is None:
+            cursor = (
                 self.conn_.connManager()
-                .manager()
-                .formatAssignValue("nombre", "string", file_name, True)
+                .dbAux()
+                .execute_query("SELECT idmodulo, nombre, sha FROM flfiles WHERE NOT sha = ''")
             )
-            q = pnsqlquery.PNSqlQuery(None, "dbAux")
-            # q.setForwardOnly(True)
-            q.exec_("SELECT sha FROM flfiles WHERE %s" % formatVal)
-            if q.next():
-                return str(q.value(0))
+            rows = list(cursor) if cursor is not None else []
 
-        return ""
+        db_name = self.conn_.DBName()
+        self.files_catalog_ = {}
+        for id_module, name, sha in rows:
+            self.files_catalog_[str(name)] = app_file.File(
+                str(id_module), str(name), str(sha), db_name=db_name
+            )
+
+    def fileInfo(self, file_name: str) -> Optional[app_file.File]:
+        """
+        Return the catalog entry of a file stored in flfiles.
+
+        @param file_name. File name.
+        @return File with the module, sha and cache path or None if it is not stored.
+        """
+
+        if self.files_catalog_ is None:
+            self.loadFilesCatalog()
+
+        return self.files_catalog_.get(file_name) if self.files_catalog_ is not None else None
+
+    def updateFileInfo(self, id_module: str, file_name: str, sha: str) -> None:
+        """
+        Update the catalog entry of a file after saving or deleting it.
+
+        @param id_module. Module identifier.
+        @param file_name. File name.
+        @param sha. Sha of the new content, empty if the file is deleted.
+        """
+
+        if self.files_catalog_ is not None:
+            if sha:
+                self.files_catalog_[file_name] = app_file.File(
+                    id_module, file_name, sha, db_name=self.conn_.DBName()
+                )
+            else:
+                self.files_catalog_.pop(file_name, None)
+
+        if file_name in self.dict_key_files_.keys():
+            self.dict_key_files_[file_name] = sha
+            self.dict_module_files_[file_name.upper()] = id_module
+
+        self.filesCached_.pop(file_name, None)
 
     def loadKeyFiles(self) -> None:
         """
@@ -768,14 +827,13 @@ class FLManagerModules(object):
 
         self.dict_key_files_ = {}
         self.dict_module_files_ = {}
-        q = pnsqlquery.PNSqlQuery(None, "dbAux")
-        # q.setForwardOnly(True)
-        q.exec_("SELECT nombre, sha, idmodulo FROM flfiles")
-        name = None
-        while q.next():
-            name = str(q.value(0))
-            self.dict_key_files_[name] = str(q.value(1))
-            self.dict_module_files_[name.upper()] = str(q.value(2))
+        if self.files_catalog_ is None:
+            self.loadFilesCatalog()
+
+        if self.files_catalog_ is not None:
+            for name, file_info in self.files_catalog_.items():
+                self.dict_key_files_[name] = str(file_info.sha)
+                self.dict_module_files_[name.upper()] = file_info.module
 
     def loadAllIdModules(self) -> None:
         """
@@ -861,12 +919,8 @@ class FLManagerModules(object):
             if application.PROJECT.conn_manager.manager().isSystemTable(name):
                 return "sys"
 
-        cursor = self.conn_.execute_query("SELECT idmodulo FROM flfiles WHERE nombre='%s'" % name)
-
-        for idmodulo in cursor:
-            return idmodulo[0]
-
-        return ""
+        file_info = self.fileInfo(name)
+        return file_info.module if file_info is not None else ""
 
     def writeState(self) -> None:
         """
@@ -935,6 +989,9 @@ class FLManagerModules(object):
         str_ret = pnmodulesstaticloader.PNStaticLoader.content(
             file_name, self.static_db_info_, only_path
         )
+        for name in self.static_db_info_.takeChanged():
+            self.staticFileChanged(name)
+
         if str_ret is not None:
 
             s = ""
@@ -949,7 +1006,9 @@ class FLManagerModules(object):
             elif self.dict_key_files_ and file_name.find(".qs") > -1:
                 self.dict_key_files_[file_name] = sha
 
-            if file_name.endswith(".mtd"):
+            # Las tablas se revisan la primera vez que se cargan y cada vez que cambia el fichero.
+            if file_name.endswith(".mtd") and file_name not in self.static_mtd_loaded_:
+                self.static_mtd_loaded_.add(file_name)
                 from PyQt5.QtXml import QDomDocument  # type: ignore
 
                 doc = QDomDocument(file_name)
@@ -968,6 +1027,23 @@ class FLManagerModules(object):
 
         return str_ret
 
+    def staticFileChanged(self, file_name: str) -> None:
+        """
+        Forget the cached data of a file changed in a static folder.
+
+        @param file_name File name.
+        """
+
+        logger.debug("Carga estática: %s ha cambiado", file_name)
+        self.filesCached_.pop(file_name, None)
+        if file_name.endswith(".mtd"):
+            self.static_mtd_loaded_.discard(file_name)
+            mng = self.conn_.connManager().manager()
+            for key in (file_name, file_name[:-4]):
+                mng.cache_metadata_.pop(key, None)
+                if key in mng.metadata_cache_fails_:
+                    mng.metadata_cache_fails_.remove(key)
+
     def staticLoaderSetup(self) -> None:
         """
         Display dialog box to configure static load from local disk.
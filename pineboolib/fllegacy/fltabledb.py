@@ -329,6 +329,11 @@ class FLTableDB(QtWidgets.QWidget):
     onlyTable_: bool
     reqOnlyTable_: bool
 
+    """
+    Indica que el grid se muestra sin esperar al COUNT del total de registros.
+    """
+    lazyCount_: bool
+
     """
     Editor falso
     """
@@ -371,6 +376,7 @@ class FLTableDB(QtWidgets.QWidget):
         self.reqEditOnly_ = False
         self.reqInsertOnly_ = False
         self.reqOnlyTable_ = False
+        self.lazyCount_ = False
         self.tabFilterLoaded = False
         self.timer_1 = QtCore.QTimer(self)
         if name:
@@ -1005,6 +1011,20 @@ class FLTableDB(QtWidgets.QWidget):
         """
         return self.reqOnlyTable_
 
+    def setLazyCount(self, on: bool = True) -> None:
+        """
+        Enable lazy count mode.
+
+        The grid shows the first rows without waiting for the total count of records.
+        """
+        self.lazyCount_ = on
+        if getattr(self, "cursor_", None) is not None:
+            self.cursor().model().set_lazy_count(on)
+
+    def lazyCount(self) -> bool:
+        """Return if the lazy count mode is enabled."""
+        return self.lazyCount_
+
     @decorators.NotImplementedWarn
     def setAutoSortColumn(self, on: bool = True):
         """
@@ -2137,6 +2157,8 @@ class FLTableDB(QtWidgets.QWidget):
                 else:
                     finalFilter = "%s AND %s" % (finalFilter, self.tdbFilterLastWhere_)
 
+            if self.lazyCount_:
+                self.cursor().model().set_lazy_count(True)
             self.tableRecords_.setPersistentFilter(finalFilter)
             self.tableRecords_.setShowAllPixmaps(self.showAllPixmaps_)
             self.tableRecords_.refresh()
@@ -343,6 +343,36 @@ class SysType(sysbasetype.SysBaseType):
         diag.add(txtEdit)
         diag.exec_()
 
+    @classmethod
+    def sqlStatsDialog(self, limit: int = 100) -> None:
+        """Show the timing statistics of the SQL statements."""
+
+        from pineboolib.application.database import pnsqlstats
+
+        diag = Dialog()
+        txtEdit = QTextEdit()
+        diag.caption = self.translate(u"scripts", u"Estadísticas SQL")
+        diag.setWidth(800)
+        columns = ["connection", "count", "total_ms", "avg_ms", "p50_ms", "p95_ms", "p99_ms"]
+        columns += ["max_ms", "rows", "callers", "fingerprint"]
+        html = u'<html><table border="1"><tr>'
+        for column in columns:
+            html += u"<td><b>%s</b></td>" % column
+        html += u"</tr>"
+        for statement in pnsqlstats.SQL_STATS.summary(limit=limit):
+            statement["callers"] = ", ".join(
+                "%s (%s)" % (caller, count) for caller, count in statement["callers"].items()
+            )
+            html += u"<tr>"
+            for column in columns:
+                html += u"<td>%s</td>" % statement[column]
+            html += u"</tr>"
+
+        html += u"</table></html>"
+        txtEdit.text = html
+        diag.add(txtEdit)
+        diag.exec_()
+
     @classmethod
     def mvProjectXml(self) -> QtXml.QDomDocument:
         """Extract a module defition to a QDomDocument."""
@@ -0,0 +1,48 @@
+"""Test_flmanagermodules module."""
+
+import unittest
+from pineboolib.loader.main import init_testing, finish_testing
+from pineboolib.application.database import pnsqlcursor
+from pineboolib.fllegacy import flutil
+from pineboolib import application
+
+
+class TestFLManagerModules(unittest.TestCase):
+    """TestFLManagerModules Class."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Ensure pineboo is initialized for testing."""
+        init_testing()
+
+    def test_files_catalog(self) -> None:
+        """Test the catalog of the files stored in flfiles."""
+
+        manager_modules = application.PROJECT.conn_manager.managerModules()
+        content = "function prueba() {\n    return 1;\n}\n"
+        sha = flutil.FLUtil().sha1(content)
+
+        manager_modules.setContent("prueba_catalogo.qs", "sys", content)
+        self.assertEqual(manager_modules.idModuleOfFile("prueba_catalogo.qs"), "sys")
+        self.assertEqual(manager_modules.shaOfFile("prueba_catalogo.qs"), sha)
+
+        manager_modules.loadFilesCatalog()
+        file_info = manager_modules.fileInfo("prueba_catalogo.qs")
+        self.assertTrue(file_info is not None)
+        self.assertEqual(file_info.sha, sha)  # type: ignore
+        self.assertTrue(file_info.path().endswith("%s.qs" % sha))  # type: ignore
+        self.assertEqual(manager_modules.contentCached("prueba_catalogo.qs"), content)
+
+        cursor = pnsqlcursor.PNSqlCursor("flfiles")
+        cursor.select("nombre = 'prueba_catalogo.qs'")
+        self.assertTrue(cursor.first())
+        cursor.setModeAccess(cursor.Del)
+        cursor.refreshBuffer()
+        self.assertTrue(cursor.commitBuffer())
+        self.assertEqual(manager_modules.fileInfo("prueba_catalogo.qs"), None)
+        self.assertEqual(manager_modules.idModuleOfFile("prueba_catalogo.qs"), "")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Ensure test clear all data."""
+        finish_testing()
@@ -8,7 +8,7 @@ from pineboolib.core.utils import logging
 from .iapicursor import IApiCursor
 
 
-from typing import Any, List, Dict, Optional, Union, TYPE_CHECKING
+from typing import Any, List, Dict, Optional, Sequence, Union, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pineboolib.application.metadata.pntablemetadata import PNTableMetaData
@@ -312,6 +312,44 @@ class IConnection:
 
         return ""
 
+    def insertBulk(
+        self,
+        table_name: str,
+        fields: List[str],
+        rows: List[List[str]],
+        chunk_size: Optional[int] = None,
+    ) -> bool:
+        """Insert several rows with formatted values into a table."""
+
+        return False
+
+    def execute_params(
+        self, q: str, params: Union[Sequence[Any], Dict[str, Any]], cursor: Any = None
+    ) -> Any:
+        """Execute a query with bound parameters in a database cursor."""
+
+        return None
+
+    def prepared_stats(self) -> Dict[str, int]:
+        """Return the prepared statements cache counters."""
+
+        return {}
+
+    def sql_stats(self, order_by: str = "total_ms", limit: int = 0) -> List[Dict[str, Any]]:
+        """Return the timing statistics of the statements."""
+
+        return []
+
+    def setSelectMemo(self, enabled: bool = True) -> None:
+        """Remember the results of sqlSelect inside the transactions."""
+
+        return
+
+    def selectMemo(self) -> Optional[Dict[str, Any]]:
+        """Return the sqlSelect results of the current transaction."""
+
+        return None
+
     def alterTable(
         self, mtd_1: "PNTableMetaData", mtd_2: "PNTableMetaData", key: str, force: bool = False
     ) -> bool:
@@ -75,6 +75,10 @@ class IManager(object):
         """Fetch from fllarge."""
         return None
 
+    def prefetchLargeValues(self, ref_keys: Any) -> int:
+        """Fetch several values from fllarge."""
+        return 0
+
     def finish(self) -> None:
         """Finish?."""
         return None
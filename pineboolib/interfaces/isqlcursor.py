@@ -669,6 +669,10 @@ class ISqlCursor(QtCore.QObject):
         """Commit current buffer to db."""
         pass
 
+    def insertBulk(self, records: Any, chunk_size: Any = None) -> Any:
+        """Insert several records at once."""
+        pass
+
     def commitBufferCursorRelation(self) -> Any:
         """Commit buffer from cursor relation."""
         pass
@@ -95,6 +95,10 @@ class ITableMetaData:
         """Enable concurrency warning."""
         return
 
+    def setLazyCount(self, state: bool) -> None:
+        """Enable lazy count mode."""
+        return
+
     def setDetectLocks(self, state: bool) -> None:
         """Enable Lock detection."""
         return
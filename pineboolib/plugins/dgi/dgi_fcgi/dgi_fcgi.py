@@ -3,6 +3,7 @@
 from pineboolib import logging
 from pineboolib.plugins.dgi.dgi_schema import dgi_schema
 from pineboolib.application.utils.check_dependencies import check_dependencies
+from pineboolib.core import settings
 
 from pineboolib import application
 
@@ -68,8 +69,18 @@ class parser(object):
 
     def call(self, environ: Mapping[str, Any], start_response) -> Any:
         """Return value from called function."""
-        start_response("200 OK", [("Content-Type", "text/html")])
         aList = environ["QUERY_STRING"]
+        # Estadísticas de las sentencias SQL. Muestran el texto de las consultas y la petición no
+        # está autenticada, así que sólo se sirven si se activan expresamente.
+        if aList == "sql_stats" and settings.config.value(
+            "ebcomportamiento/sql_stats_fcgi", False
+        ) in (True, "true"):
+            from pineboolib.application.database import pnsqlstats
+
+            start_response("200 OK", [("Content-Type", "application/json")])
+            return pnsqlstats.SQL_STATS.dump_json()
+
+        start_response("200 OK", [("Content-Type", "text/html")])
         try:
             retorno_: Any = application.PROJECT.call(self._callScript, aList)
         except Exception:
@@ -15,6 +15,7 @@ from pineboolib.fllegacy import flutil
 from . import pnsqlschema
 
 from xml.etree import ElementTree
+import re
 import traceback
 from typing import Iterable, Optional, Union, List, Dict, Any, cast
 
@@ -648,6 +649,16 @@ class FLMSSQL(pnsqlschema.PNSqlSchema):
         """Return a database friendly text."""
         return str(text).replace("'", "''")
 
+    def queryLimit(self, sql: str, limit: int) -> str:
+        """Return a select query limited to a number of rows."""
+        return re.sub(
+            r"^\s*select(\s+distinct)?\s+",
+            lambda match: "SELECT%s TOP %d " % (match.group(1) or "", limit),
+            sql,
+            count=1,
+            flags=re.IGNORECASE,
+        )
+
     def queryUpdate(self, name: str, update: str, filter: str) -> str:
         """Return a database friendly update query."""
         return """UPDATE %s SET %s WHERE %s""" % (name, update, filter)
@@ -122,6 +122,24 @@ class FLMYSQL_MYISAM(pnsqlschema.PNSqlSchema):
 
         return self.conn_
 
+    def streamCursor(self, exclusive: bool = False) -> Any:
+        """
+        Return a new cursor to read a result in batches.
+
+        SSCursor keeps the result in the server, but the connection can not run other queries
+        until it is read, so it is only used if exclusive.
+        """
+
+        if self.conn_ is None:
+            raise Exception("streamCursor. self.conn_ is None")
+
+        if exclusive:
+            import MySQLdb.cursors  # type: ignore
+
+            return self.conn_.cursor(MySQLdb.cursors.SSCursor)
+
+        return self.conn_.cursor()
+
     def formatValueLike(self, type_: str, v: Any, upper: bool) -> str:
         """Format value for database LIKE expression."""
         res = "IS NULL"
@@ -131,6 +131,23 @@ class FLMYSQL_MYISAM2(flmysql_myisam.FLMYSQL_MYISAM):
 
         return self.conn_
 
+    def streamCursor(self, exclusive: bool = False) -> Any:
+        """
+        Return a new cursor to read a result in batches.
+
+        pymysql SSCursor keeps the result in the server, so it is only used if exclusive.
+        """
+
+        if self.conn_ is None:
+            raise Exception("streamCursor. self.conn_ is None")
+
+        if exclusive:
+            import pymysql.cursors  # type: ignore
+
+            return self.conn_.cursor(pymysql.cursors.SSCursor)
+
+        return self.conn_.cursor()
+
     def dict_cursor(self) -> Any:
         """Return dict cursor."""
 
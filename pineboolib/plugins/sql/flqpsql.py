@@ -15,8 +15,11 @@ from pineboolib.fllegacy import flutil
 from . import pnsqlschema
 
 from xml.etree import ElementTree
+import collections
+import io
+import json
 import traceback
-from typing import Iterable, Optional, Union, List, Dict, Any, cast
+from typing import Iterable, Optional, Union, List, Dict, Any, Tuple, cast
 
 
 LOGGER = logging.getLogger(__name__)
@@ -25,6 +28,16 @@ LOGGER = logging.getLogger(__name__)
 class FLQPSQL(pnsqlschema.PNSqlSchema):
     """FLQPSQL class."""
 
+    fetch_block_size: int = 500  # Rows fetched from a server cursor per round trip.
+    fetch_blocks_cached: int = 20  # Blocks kept in memory per server cursor.
+    server_prepare: bool = True  # Use PREPARE / EXECUTE for parameterized queries.
+    bulk_copy: bool = True  # Use COPY FROM STDIN in insertBulk.
+    _prepared_count: int
+    _cursors_alive: Dict[str, int]
+    _cursors_position: Dict[str, int]
+    _rows_blocks: Dict[str, "collections.OrderedDict[int, List[Any]]"]
+    _levels_stack: List[Optional[int]]
+
     def __init__(self):
         """Inicialize."""
         super().__init__()
@@ -33,6 +46,48 @@ class FLQPSQL(pnsqlschema.PNSqlSchema):
         self.errorList = []
         self.alias_ = "PostgreSQL (PSYCOPG2)"
         self.defaultPort_ = 5432
+        self.fetch_block_size = int(
+            settings.config.value("ebcomportamiento/pg_fetch_block_size", self.fetch_block_size)
+        )
+        self.fetch_blocks_cached = int(
+            settings.config.value(
+                "ebcomportamiento/pg_fetch_blocks_cached", self.fetch_blocks_cached
+            )
+        )
+        # Server side cursors declared by this connection, with the transaction level
+        # (transaction + savepoints) active when they were declared.
+        self._cursors_alive = {}
+        self._cursors_position = {}
+        self._rows_blocks = {}
+        self._levels_stack = []
+        self.server_prepare = text2bool(
+            str(settings.config.value("ebcomportamiento/pg_server_prepare", self.server_prepare))
+        )
+        self._prepared_count = 0
+        self._stream_count = 0
+        self.bulk_copy = text2bool(
+            str(settings.config.value("ebcomportamiento/pg_bulk_copy", self.bulk_copy))
+        )
+
+    def useThreads(self) -> bool:
+        """Return True if the driver can run queries in other threads, with their own connection."""
+        return True
+
+    def streamCursor(self, exclusive: bool = False) -> Any:
+        """
+        Return a cursor to read a result in batches.
+
+        If exclusive, a named (server side) cursor. WITH HOLD, so it works in autocommit mode.
+        """
+
+        if self.conn_ is None:
+            raise Exception("streamCursor. self.conn_ is None")
+
+        if not exclusive:
+            return self.conn_.cursor()
+
+        self._stream_count += 1
+        return self.conn_.cursor("pnstream_%s" % self._stream_count, withhold=True)
 
     def safe_load(self) -> bool:
         """Return if the driver can loads dependencies safely."""
@@ -44,6 +99,7 @@ class FLQPSQL(pnsqlschema.PNSqlSchema):
         self, db_name: str, db_host: str, db_port: int, db_userName: str, db_password: str
     ) -> Any:
         """Connecto to database."""
+        self._prepared_statements.clear()  # Las sentencias preparadas son de la sesión.
         self._dbname = db_name
         check_dependencies.check_dependencies(
             {"psycopg2": "python3-psycopg2", "sqlalchemy": "sqlAlchemy"}
@@ -262,6 +318,7 @@ class FLQPSQL(pnsqlschema.PNSqlSchema):
             )
             return False
 
+        self._levels_stack.append(n)
         return True
 
     def rollbackSavePoint(self, n: int) -> bool:
@@ -284,6 +341,10 @@ class FLQPSQL(pnsqlschema.PNSqlSchema):
             )
             return False
 
+        if n in self._levels_stack:
+            level = self._levels_stack.index(n)
+            self._levels_stack = self._levels_stack[: level + 1]
+            self._forget_cursors_over(level)
         return True
 
     def commitTransaction(self) -> bool:
@@ -303,6 +364,8 @@ class FLQPSQL(pnsqlschema.PNSqlSchema):
             )
             return False
 
+        self._levels_stack = []
+        self._lower_cursors_to(0)
         return True
 
     def rollbackTransaction(self) -> bool:
@@ -323,6 +386,8 @@ class FLQPSQL(pnsqlschema.PNSqlSchema):
             )
             return False
 
+        self._levels_stack = []
+        self._forget_cursors_over(0)
         return True
 
     def transaction(self) -> bool:
@@ -341,6 +406,7 @@ class FLQPSQL(pnsqlschema.PNSqlSchema):
             )
             return False
 
+        self._levels_stack = [None]
         return True
 
     def releaseSavePoint(self, n: int) -> bool:
@@ -365,6 +431,9 @@ class FLQPSQL(pnsqlschema.PNSqlSchema):
 
             return False
 
+        if n in self._levels_stack:
+            self._levels_stack = self._levels_stack[: self._levels_stack.index(n)]
+            self._lower_cursors_to(len(self._levels_stack))
         return True
 
     def setType(self, type_: str, leng: Optional[Union[str, int]] = None) -> str:
@@ -746,6 +815,15 @@ class FLQPSQL(pnsqlschema.PNSqlSchema):
         """Return a database friendly update query."""
         return """UPDATE %s SET %s WHERE %s RETURNING *""" % (name, update, filter)
 
+    def queryInsert(
+        self, name: str, fields: str, values: str, returning: Optional[str] = None
+    ) -> str:
+        """Return a database friendly insert query, returning the fields specified if supported."""
+        sql = """INSERT INTO %s (%s) VALUES (%s)""" % (name, fields, values)
+        if returning:
+            sql += " RETURNING %s" % returning
+        return sql
+
     def declareCursor(
         self, curname: str, fields: str, table: str, where: str, cursor: Any, conn: Any
     ) -> None:
@@ -754,7 +832,7 @@ class FLQPSQL(pnsqlschema.PNSqlSchema):
         if not self.isOpen():
             raise Exception("declareCursor: Database not open")
 
-        sql = "DECLARE %s CURSOR WITH HOLD FOR SELECT %s FROM %s WHERE %s " % (
+        sql = "DECLARE %s SCROLL CURSOR WITH HOLD FOR SELECT %s FROM %s WHERE %s " % (
             curname,
             fields,
             table,
@@ -766,6 +844,11 @@ class FLQPSQL(pnsqlschema.PNSqlSchema):
             LOGGER.error("refreshQuery: %s", e)
             LOGGER.info("SQL: %s", sql)
             LOGGER.trace("Detalle:", stack_info=True)
+            return
+
+        self._cursors_alive[curname] = len(self._levels_stack)
+        self._cursors_position[curname] = 0
+        self._rows_blocks[curname] = collections.OrderedDict()
 
     def getRow(self, number: int, curname: str, cursor: Any) -> List:
         """Return a data row."""
@@ -774,18 +857,37 @@ class FLQPSQL(pnsqlschema.PNSqlSchema):
             raise Exception("getRow: Database not open")
 
         ret_: List[Any] = []
-        sql = "FETCH ABSOLUTE %s FROM %s" % (number + 1, curname)
-        sql_exists = "SELECT name FROM pg_cursors WHERE name = '%s'" % curname
-        cursor.execute(sql_exists)
-        if cursor.fetchone() is None:
+        if curname not in self._cursors_alive:
             return ret_
 
-        try:
-            cursor.execute(sql)
-            ret_ = cursor.fetchone()
-        except Exception as e:
-            LOGGER.error("getRow: %s", e)
-            LOGGER.trace("Detalle:", stack_info=True)
+        block_number = number // self.fetch_block_size
+        first_row = block_number * self.fetch_block_size
+        blocks = self._rows_blocks[curname]
+        if block_number in blocks:
+            blocks.move_to_end(block_number)
+        else:
+            try:
+                if self._cursors_position[curname] != first_row:
+                    cursor.execute("MOVE ABSOLUTE %s FROM %s" % (first_row, curname))
+                cursor.execute("FETCH FORWARD %s FROM %s" % (self.fetch_block_size, curname))
+                rows = cursor.fetchall()
+            except Exception as e:
+                LOGGER.error("getRow: %s", e)
+                LOGGER.trace("Detalle:", stack_info=True)
+                self._cursors_position[curname] = -1
+                return ret_
+
+            self._cursors_position[curname] = (
+                first_row + len(rows) if len(rows) == self.fetch_block_size else -1
+            )
+            blocks[block_number] = rows
+            if len(blocks) > self.fetch_blocks_cached:
+                blocks.popitem(last=False)
+
+        rows = blocks[block_number]
+        if number - first_row < len(rows):
+            ret_ = rows[number - first_row]
+
         return ret_
 
     def findRow(self, cursor: Any, curname: str, field_pos: int, value: Any) -> Optional[int]:
@@ -796,6 +898,10 @@ class FLQPSQL(pnsqlschema.PNSqlSchema):
         if not self.isOpen():
             raise Exception("findRow: Database not open")
 
+        if curname not in self._cursors_alive:
+            return pos
+
+        self._cursors_position[curname] = -1
         try:
             while True:
                 sql = "FETCH %s FROM %s" % ("FIRST" if not limit else limit + 10000, curname)
@@ -821,17 +927,37 @@ class FLQPSQL(pnsqlschema.PNSqlSchema):
         if not self.isOpen():
             raise Exception("deleteCursor: Database not open")
 
-        try:
-            sql_exists = "SELECT name FROM pg_cursors WHERE name = '%s'" % cursor_name
-            cursor.execute(sql_exists)
-            if cursor.fetchone() is None:
-                return
+        if cursor_name not in self._cursors_alive:
+            return
 
+        self._forget_cursor(cursor_name)
+        try:
             cursor.execute("CLOSE %s" % cursor_name)
         except Exception as exception:
             LOGGER.error("finRow: %s", exception)
             LOGGER.warning("Detalle:", stack_info=True)
 
+    def _forget_cursor(self, cursor_name: str) -> None:
+        """Remove a server side cursor from the local registry."""
+
+        self._cursors_alive.pop(cursor_name, None)
+        self._cursors_position.pop(cursor_name, None)
+        self._rows_blocks.pop(cursor_name, None)
+
+    def _forget_cursors_over(self, level: int) -> None:
+        """Forget cursors declared over a transaction level, they are dropped by the server."""
+
+        for cursor_name, cursor_level in list(self._cursors_alive.items()):
+            if cursor_level > level:
+                self._forget_cursor(cursor_name)
+
+    def _lower_cursors_to(self, level: int) -> None:
+        """Move cursors declared over a released transaction level to the parent level."""
+
+        for cursor_name, cursor_level in self._cursors_alive.items():
+            if cursor_level > level:
+                self._cursors_alive[cursor_name] = level
+
     def alterTable(
         self,
         mtd1: Union[str, "pntablemetadata.PNTableMetaData"],
@@ -1449,6 +1575,90 @@ class FLQPSQL(pnsqlschema.PNSqlSchema):
 
         return True
 
+    def insertBulk(
+        self,
+        table_name: str,
+        fields: List[str],
+        rows: List[List[str]],
+        chunk_size: Optional[int] = None,
+    ) -> bool:
+        """Insert several rows into a table using COPY FROM STDIN."""
+
+        if not rows or not fields or not self.bulk_copy:
+            return super().insertBulk(table_name, fields, rows, chunk_size)
+
+        if not self.isOpen():
+            raise Exception("insertBulk: Database not open")
+
+        cursor = self.cursor()
+        if not hasattr(cursor, "copy_expert"):  # pg8000
+            return super().insertBulk(table_name, fields, rows, chunk_size)
+
+        self.set_last_error_null()
+        chunk_size = chunk_size or self.bulk_chunk_size
+        sql = "COPY %s (%s) FROM STDIN" % (table_name, ", ".join(fields))
+        for pos in range(0, len(rows), chunk_size):
+            data = io.StringIO()
+            for row in rows[pos : pos + chunk_size]:
+                data.write("\t".join([self._copy_value(value) for value in row]))
+                data.write("\n")
+            data.seek(0)
+            try:
+                cursor.copy_expert(sql, data)
+            except Exception:
+                LOGGER.error("insertBulk: No se pudieron insertar los registros en %s", table_name)
+                self.setLastError(
+                    "No se pudieron insertar los registros en %s.\n%s"
+                    % (table_name, traceback.format_exc()),
+                    sql,
+                )
+                return False
+
+        return True
+
+    def estimatedCount(self, table_name: str, where: str) -> Optional[int]:
+        """Return the number of rows estimated by the planner."""
+
+        if where.strip().replace(" ", "") == "1=1":
+            sql = "SELECT reltuples::bigint FROM pg_class WHERE relname = '%s'" % table_name
+        else:
+            sql = "EXPLAIN (FORMAT JSON) SELECT 1 FROM %s WHERE %s" % (table_name, where)
+
+        try:
+            cursor = self.conn_.cursor()
+            cursor.execute(sql)
+            result = cursor.fetchone()
+        except Exception:
+            LOGGER.warning("estimatedCount: %s", traceback.format_exc())
+            return None
+
+        if not result or result[0] is None:
+            return None
+
+        value = result[0]
+        if isinstance(value, str):
+            value = json.loads(value)
+        if isinstance(value, list):
+            value = value[0]["Plan"]["Plan Rows"]
+
+        return int(value) if int(value) >= 0 else None  # -1: tabla sin analizar.
+
+    def _copy_value(self, value: str) -> str:
+        """Convert a value formatted by formatValue to COPY text format."""
+
+        if value in ("NULL", "Null"):
+            return "\\N"
+
+        if len(value) > 1 and value[0] == "'" and value[-1] == "'":
+            value = value[1:-1].replace("''", "'")
+
+        return (
+            value.replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r")
+        )
+
     def Mr_Proper(self) -> None:
         """Clear all garbage data."""
         util = flutil.FLUtil()
@@ -1602,5 +1812,54 @@ class FLQPSQL(pnsqlschema.PNSqlSchema):
         # ret_ = query.replace(";", "")
         return query
 
+    def compile_query(
+        self, q: str, param_style: Optional[str] = None
+    ) -> Tuple[str, List[Union[int, str]]]:
+        """Prepare the statement in the server and return the EXECUTE sentence that runs it."""
+
+        if (
+            param_style
+            or not self.server_prepare
+            or q.split(None, 1)[0].upper() not in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+        ):
+            return super().compile_query(q, param_style)
+
+        statement, param_names = super().compile_query(q, "dollar")
+        self._prepared_count += 1
+        name = "pnstmt_%s" % self._prepared_count
+        self.conn_.cursor().execute("PREPARE %s AS %s" % (name, statement))
+        if param_names:
+            return "EXECUTE %s (%s)" % (name, ", ".join(["%s"] * len(param_names))), param_names
+
+        return "EXECUTE %s" % name, param_names
+
+    def release_statement(self, statement: str) -> None:
+        """Deallocate a prepared statement."""
+
+        if not statement.startswith("EXECUTE "):
+            return
+
+        try:
+            self.conn_.cursor().execute("DEALLOCATE %s" % statement.split()[1])
+        except Exception:
+            LOGGER.warning("release_statement: %s", traceback.format_exc())
+
+    def reset_session(self) -> None:
+        """Close the server side cursors and drop the temporary state of the session."""
+
+        cursor = self.conn_.cursor()
+        try:
+            # DISCARD ALL also deallocates the prepared statements of the cache.
+            cursor.execute("CLOSE ALL")
+            cursor.execute("DISCARD TEMP")
+            cursor.execute("RESET ALL")
+        finally:
+            cursor.close()
+
+        self._cursors_alive = {}
+        self._cursors_position = {}
+        self._rows_blocks = {}
+        self._levels_stack = []
+
     # def isOpen(self):
     #    return self.conn_.closed == 0
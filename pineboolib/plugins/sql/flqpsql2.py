@@ -23,6 +23,18 @@ class FLQPSQL2(FLQPSQL):
         self.mobile_ = True
         self.pure_python_ = True
 
+    def useThreads(self) -> bool:
+        """Return True if the driver use threads."""
+        return False
+
+    def streamCursor(self, exclusive: bool = False) -> Any:
+        """Return a new cursor. pg8000 has no server side cursors."""
+
+        if self.conn_ is None:
+            raise Exception("streamCursor. self.conn_ is None")
+
+        return self.conn_.cursor()
+
     def safe_load(self) -> bool:
         """Return if the driver can loads dependencies safely."""
         return check_dependencies({"pg8000": "pg8000", "sqlalchemy": "sqlAlchemy"}, False)
@@ -32,6 +44,7 @@ class FLQPSQL2(FLQPSQL):
     ) -> Any:
         """Connecto to database."""
         self._dbname = db_name
+        self._prepared_statements.clear()  # Las sentencias preparadas son de la sesión.
         check_dependencies({"pg8000": "pg8000", "sqlalchemy": "sqlAlchemy"})
         import pg8000  # type: ignore
         import traceback
@@ -33,6 +33,7 @@ class FLSQLITE(pnsqlschema.PNSqlSchema):
 
     db_filename: Optional[str]
     db_name: str
+    param_style = "qmark"
 
     def __init__(self):
         """Inicialize."""
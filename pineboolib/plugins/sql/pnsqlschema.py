@@ -2,8 +2,10 @@
 
 from pineboolib import logging
 
+import collections
+import re
 import traceback
-from typing import Iterable, Optional, Union, List, Any, Dict, TYPE_CHECKING
+from typing import Iterable, Optional, Union, List, Any, Dict, Sequence, Tuple, TYPE_CHECKING
 from pineboolib.core import settings
 
 if TYPE_CHECKING:
@@ -12,6 +14,11 @@ if TYPE_CHECKING:
 
 LOGGER = logging.getLogger(__name__)
 
+# Separa los literales entre comillas del resto de la sentencia.
+QUOTED_RE = re.compile(r"('(?:[^']|'')*'|\"[^\"]*\")")
+PARAM_RE = re.compile(r"(?<!:):([A-Za-z_]\w*)|\?")
+WHITESPACE_RE = re.compile(r"\s+")
+
 
 class PNSqlSchema(object):
     """PNSqlSchema class."""
@@ -34,6 +41,12 @@ class PNSqlSchema(object):
     rows_cached: Dict[str, List[Any]]
     init_cached: int = 200
     open_: bool
+    param_style: str = "format"  # DB-API paramstyle of the module used by the driver.
+    prepared_cache_size: int = 100  # Prepared statements kept per connection.
+    bulk_chunk_size: int = 500  # Rows sent per sentence by insertBulk.
+    _prepared_statements: "collections.OrderedDict[str, Tuple[str, List[Union[int, str]]]]"
+    _prepared_hits: int
+    _prepared_misses: int
 
     def __init__(self):
         """Inicialize."""
@@ -54,6 +67,15 @@ class PNSqlSchema(object):
         self.db_ = None
         self.rows_cached = {}
         self.open_ = False
+        self.prepared_cache_size = int(
+            settings.config.value("ebcomportamiento/prepared_cache_size", self.prepared_cache_size)
+        )
+        self.bulk_chunk_size = int(
+            settings.config.value("ebcomportamiento/bulk_chunk_size", self.bulk_chunk_size)
+        )
+        self._prepared_statements = collections.OrderedDict()
+        self._prepared_hits = 0
+        self._prepared_misses = 0
         # self.sql_query = {}
         # self.cursors_dict = {}
 
@@ -65,6 +87,18 @@ class PNSqlSchema(object):
         """Return True if the driver use Timer."""
         return True
 
+    def streamCursor(self, exclusive: bool = False) -> Any:
+        """
+        Return a new cursor to read a result in batches.
+
+        @param exclusive. True if the connection can be busy until the whole result is read.
+        """
+
+        if self.conn_ is None:
+            raise Exception("streamCursor. self.conn_ is None")
+
+        return self.conn_.cursor()
+
     def version(self) -> str:
         """Return version number."""
         return self.version_
@@ -276,6 +310,56 @@ class PNSqlSchema(object):
         """Insert multiple registers into a table."""
         return False
 
+    def insertBulk(
+        self,
+        table_name: str,
+        fields: List[str],
+        rows: List[List[str]],
+        chunk_size: Optional[int] = None,
+    ) -> bool:
+        """
+        Insert several rows into a table using multi-row INSERT sentences.
+
+        Values must be already formatted with formatValue.
+        """
+        if not rows:
+            return True
+
+        if not self.isOpen():
+            raise Exception("insertBulk: Database not open")
+
+        self.set_last_error_null()
+        chunk_size = chunk_size or self.bulk_chunk_size
+        cursor = self.cursor()
+        if not fields:  # Todos los campos toman su valor por defecto.
+            chunk_size = 1
+
+        for pos in range(0, len(rows), chunk_size):
+            if fields:
+                sql = "INSERT INTO %s (%s) VALUES %s" % (
+                    table_name,
+                    ", ".join(fields),
+                    ", ".join(["(%s)" % ", ".join(row) for row in rows[pos : pos + chunk_size]]),
+                )
+            else:
+                sql = "INSERT INTO %s DEFAULT VALUES" % table_name
+            try:
+                cursor.execute(sql)
+            except Exception:
+                LOGGER.error("insertBulk: No se pudieron insertar los registros en %s", table_name)
+                self.setLastError(
+                    "No se pudieron insertar los registros en %s.\n%s"
+                    % (table_name, traceback.format_exc()),
+                    sql,
+                )
+                return False
+
+        return True
+
+    def estimatedCount(self, table_name: str, where: str) -> Optional[int]:
+        """Return the number of rows estimated by the database or None if not available."""
+        return None
+
     def Mr_Proper(self) -> None:
         """Clear all garbage data."""
         pass
@@ -316,6 +400,149 @@ class PNSqlSchema(object):
 
         return cursor
 
+    def execute_params(
+        self, q: str, params: Union[Sequence[Any], Dict[str, Any]], cursor: Any = None
+    ) -> Any:
+        """
+        Execute a query with bound parameters and return the cursor.
+
+        Parameters are written as "?" (params is a sequence) or ":name" (params is a dict)
+        and are passed to the database module instead of being formatted into the query.
+        """
+        if not self.isOpen():
+            raise Exception("execute_params: Database not open")
+
+        self.set_last_error_null()
+        if cursor is None:
+            cursor = self.cursor()
+        try:
+            statement, param_names = self.prepare_query(q)
+            if isinstance(params, dict):
+                values = [params[name] for name in param_names]
+            elif len(params) != len(param_names):
+                raise ValueError(
+                    "Expected %s parameters, %s given" % (len(param_names), len(params))
+                )
+            else:
+                values = list(params)
+
+            if values:
+                cursor.execute(statement, values)
+            else:
+                cursor.execute(statement)
+        except Exception:
+            LOGGER.error("No se pudo ejecutar la query %s", q)
+            self.setLastError(
+                "No se pudo ejecutar la query %s.\n%s" % (q, traceback.format_exc()), q
+            )
+
+        return cursor
+
+    def normalize_query(self, q: str) -> str:
+        """Return the query with the whitespaces outside literals collapsed."""
+
+        chunks = QUOTED_RE.split(q.strip())
+        for number in range(0, len(chunks), 2):
+            chunks[number] = WHITESPACE_RE.sub(" ", chunks[number])
+        return "".join(chunks)
+
+    def prepare_query(self, q: str) -> Tuple[str, List[Union[int, str]]]:
+        """
+        Return the driver statement for a query and the order of its parameters.
+
+        Results are kept in a LRU cache keyed by the normalized query.
+        """
+        key = self.normalize_query(q)
+        entry = self._prepared_statements.get(key)
+        if entry is not None:
+            self._prepared_statements.move_to_end(key)
+            self._prepared_hits += 1
+            return entry
+
+        self._prepared_misses += 1
+        entry = self.compile_query(key)
+        self._prepared_statements[key] = entry
+        while len(self._prepared_statements) > self.prepared_cache_size:
+            self.release_statement(self._prepared_statements.popitem(last=False)[1][0])
+
+        return entry
+
+    def compile_query(
+        self, q: str, param_style: Optional[str] = None
+    ) -> Tuple[str, List[Union[int, str]]]:
+        """
+        Translate "?" and ":name" placeholders to a DB-API paramstyle.
+
+        Return the statement and the parameter names (or positions) in order of use.
+        """
+        style = param_style or self.param_style
+        param_names: List[Union[int, str]] = []
+
+        def placeholder(match: Any) -> str:
+            param_names.append(match.group(1) or len(param_names))
+            if style == "qmark":
+                return "?"
+            elif style == "numeric":
+                return ":%s" % len(param_names)
+            elif style == "dollar":
+                return "$%s" % len(param_names)
+            return "%s"
+
+        chunks = QUOTED_RE.split(q)
+        escape = style in ("format", "pyformat") and any(
+            PARAM_RE.search(chunk) for chunk in chunks[::2]
+        )
+        for number, chunk in enumerate(chunks):
+            if escape:
+                chunk = chunk.replace("%", "%%")
+            chunks[number] = chunk if number % 2 else PARAM_RE.sub(placeholder, chunk)
+
+        if len(set(isinstance(name, int) for name in param_names)) > 1:
+            raise ValueError("Positional and named parameters can not be mixed: %s" % q)
+
+        return "".join(chunks), param_names
+
+    def release_statement(self, statement: str) -> None:
+        """Release a statement removed from the prepared statements cache."""
+        pass
+
+    def clear_prepared_cache(self) -> None:
+        """Clear the prepared statements cache."""
+
+        for statement, param_names in self._prepared_statements.values():
+            self.release_statement(statement)
+        self._prepared_statements.clear()
+
+    def reset_session(self) -> None:
+        """Leave the session as a new one, to reuse the connection. Keep the prepared statements."""
+        pass
+
+    def take_over(self, driver: "PNSqlSchema") -> None:
+        """
+        Take the connection and the session state (prepared statements...) of other instance.
+
+        The other instance is left closed, so whoever still holds it can not use the connection.
+        """
+
+        self.__dict__.update(driver.__dict__)
+        driver.conn_ = None
+        driver.open_ = False
+        driver.cursor_ = None
+        driver.engine_ = None
+        driver.session_ = None
+        driver.rows_cached = {}
+        driver._prepared_statements = collections.OrderedDict()
+
+    def prepared_stats(self) -> Dict[str, int]:
+        """Return the prepared statements cache counters."""
+
+        return {
+            "hits": self._prepared_hits,
+            "misses": self._prepared_misses,
+            "size": len(self._prepared_statements),
+            "capacity": self.prepared_cache_size,
+        }
+
     def getTimeStamp(self) -> str:
         """Return TimeStamp."""
 
@@ -429,6 +656,17 @@ class PNSqlSchema(object):
         sql = "UPDATE %s SET %s WHERE %s" % (name, update, filter)
         return sql
 
+    def queryInsert(
+        self, name: str, fields: str, values: str, returning: Optional[str] = None
+    ) -> str:
+        """Return a database friendly insert query, returning the fields specified if supported."""
+        sql = "INSERT INTO %s (%s) VALUES (%s)" % (name, fields, values)
+        return sql
+
+    def queryLimit(self, sql: str, limit: int) -> str:
+        """Return a select query limited to a number of rows."""
+        return "%s LIMIT %d" % (sql, limit)
+
     def cursor(self) -> Any:
         """Return a cursor connection."""
 
@@ -0,0 +1,42 @@
+"""Test_flmysql module."""
+import unittest
+from pineboolib.plugins.sql import flmysql_myisam2, flmysql_innodb2
+
+from typing import Any, List, Optional
+
+try:
+    import pymysql.cursors  # type: ignore
+except ImportError:
+    pymysql = None
+
+
+class FakeConn(object):
+    """FakeConn class. Record the cursor classes requested."""
+
+    def __init__(self) -> None:
+        """Inicialize."""
+        self.classes: List[Any] = []
+
+    def cursor(self, cursor_class: Optional[Any] = None) -> Any:
+        """Return cursor."""
+        self.classes.append(cursor_class)
+        return cursor_class
+
+
+@unittest.skipIf(pymysql is None, "pymysql is not installed")
+class TestFLMYSQL2(unittest.TestCase):
+    """TestFLMYSQL2 Class."""
+
+    def test_stream_cursor(self) -> None:
+        """Test pymysql drivers use the pymysql server side cursor."""
+
+        for driver in (flmysql_myisam2.FLMYSQL_MYISAM2(), flmysql_innodb2.FLMYSQL_INNODB2()):
+            conn = FakeConn()
+            driver.conn_ = conn
+            self.assertTrue(driver.streamCursor(True) is pymysql.cursors.SSCursor)
+            self.assertEqual(driver.streamCursor(False), None)
+            self.assertEqual(conn.classes, [pymysql.cursors.SSCursor, None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,211 @@
+"""Test_flqpsql module."""
+import unittest
+from pineboolib.plugins.sql import flqpsql
+
+from typing import Any, Dict, List, Optional
+
+
+class FakeCursor(object):
+    """FakeCursor class. Emulate a server side cursor."""
+
+    def __init__(self, rows: List[Any]) -> None:
+        """Inicialize."""
+        self.rows = rows
+        self.positions: Dict[str, int] = {}
+        self.statements: List[str] = []
+        self.result: List[Any] = []
+
+    def execute(self, sql: str, params: Optional[List[Any]] = None) -> None:
+        """Emulate DECLARE, MOVE, FETCH and CLOSE."""
+        self.statements.append(sql if params is None else sql % tuple(params))
+        words = sql.split()
+        self.result = []
+        if words[0] == "MOVE":
+            self.positions[words[-1]] = int(words[2])
+        elif words[0] == "FETCH":
+            size = int(words[2])
+            position = self.positions.get(words[-1], 0)
+            self.result = self.rows[position : position + size]
+            self.positions[words[-1]] = position + len(self.result)
+
+    def copy_expert(self, sql: str, data: Any) -> None:
+        """Emulate COPY FROM STDIN."""
+        self.statements.append(sql)
+        self.result = data.read().splitlines()
+
+    def fetchone(self) -> Any:
+        """Return first row of last result."""
+        return self.result[0] if self.result else None
+
+    def fetchall(self) -> List[Any]:
+        """Return last result."""
+        return self.result
+
+    def close(self) -> None:
+        """Close cursor."""
+        pass
+
+
+class FakeConn(object):
+    """FakeConn class."""
+
+    def __init__(self, cursor: FakeCursor) -> None:
+        """Inicialize."""
+        self._cursor = cursor
+
+    def cursor(self) -> FakeCursor:
+        """Return cursor."""
+        return self._cursor
+
+
+class TestFLQPSQL(unittest.TestCase):
+    """TestFLQPSQL Class."""
+
+    def test_get_row_blocks(self) -> None:
+        """Test rows are fetched in blocks."""
+
+        cursor = FakeCursor([(number,) for number in range(25)])
+        driver = flqpsql.FLQPSQL()
+        driver.conn_ = FakeConn(FakeCursor([]))
+        driver.fetch_block_size = 10
+        driver.fetch_blocks_cached = 2
+
+        driver.declareCursor("cur_test", "id", "fltest", "1=1", cursor, None)
+        cursor.statements = []
+        for number in range(10):
+            self.assertEqual(driver.getRow(number, "cur_test", cursor), (number,))
+        self.assertEqual(cursor.statements, ["FETCH FORWARD 10 FROM cur_test"])
+
+        self.assertEqual(driver.getRow(12, "cur_test", cursor), (12,))
+        self.assertEqual(len(cursor.statements), 2)
+        self.assertEqual(driver.getRow(24, "cur_test", cursor), (24,))
+        self.assertEqual(driver.getRow(25, "cur_test", cursor), [])
+        self.assertEqual(driver.getRow(3, "cur_test", cursor), (3,))
+        self.assertEqual(
+            cursor.statements[-2:],
+            ["MOVE ABSOLUTE 0 FROM cur_test", "FETCH FORWARD 10 FROM cur_test"],
+        )
+
+        driver.deleteCursor("cur_test", cursor)
+        self.assertEqual(cursor.statements[-1], "CLOSE cur_test")
+        self.assertEqual(driver.getRow(3, "cur_test", cursor), [])
+
+    def test_cursor_liveness(self) -> None:
+        """Test cursors declared inside a rolled back transaction are forgotten."""
+
+        cursor = FakeCursor([(number,) for number in range(5)])
+        driver = flqpsql.FLQPSQL()
+        driver.conn_ = FakeConn(FakeCursor([]))
+
+        driver.declareCursor("cur_1", "id", "fltest", "1=1", cursor, None)
+        self.assertTrue(driver.transaction())
+        driver.declareCursor("cur_2", "id", "fltest", "1=1", cursor, None)
+        self.assertTrue(driver.savePoint(1))
+        driver.declareCursor("cur_3", "id", "fltest", "1=1", cursor, None)
+        self.assertTrue(driver.rollbackSavePoint(1))
+        self.assertEqual(driver.getRow(0, "cur_3", cursor), [])
+        self.assertEqual(driver.getRow(0, "cur_2", cursor), (0,))
+        self.assertTrue(driver.rollbackTransaction())
+        self.assertEqual(driver.getRow(0, "cur_2", cursor), [])
+        self.assertEqual(driver.getRow(0, "cur_1", cursor), (0,))
+
+    def test_prepared_statements(self) -> None:
+        """Test parameterized queries are prepared once in the server."""
+
+        cursor = FakeCursor([])
+        driver = flqpsql.FLQPSQL()
+        driver.conn_ = FakeConn(cursor)
+        driver.open_ = True
+        driver.server_prepare = True
+        driver.prepared_cache_size = 2
+
+        sql = "SELECT nombre FROM clientes WHERE codcliente = :cod"
+        driver.execute_params(sql, {"cod": "'000001'"})
+        driver.execute_params(sql, {"cod": "'000002'"})
+        cursor.statements = [sql for sql in cursor.statements if sql != "select 1"]
+        self.assertEqual(
+            cursor.statements,
+            [
+                "PREPARE pnstmt_1 AS SELECT nombre FROM clientes WHERE codcliente = $1",
+                "EXECUTE pnstmt_1 ('000001')",
+                "EXECUTE pnstmt_1 ('000002')",
+            ],
+        )
+        self.assertEqual(driver.prepared_stats()["hits"], 1)
+        self.assertEqual(driver.prepared_stats()["misses"], 1)
+
+        driver.execute_params("DELETE FROM clientes WHERE codcliente = ?", ["'000001'"])
+        driver.execute_params("UPDATE clientes SET nombre = ?", ["'test'"])
+        self.assertEqual(
+            cursor.statements[-2:], ["DEALLOCATE pnstmt_1", "EXECUTE pnstmt_3 ('test')"]
+        )
+        self.assertEqual(driver.prepared_stats()["size"], 2)
+
+        driver.execute_params("LOCK TABLE clientes", [])
+        self.assertEqual(cursor.statements[-1], "LOCK TABLE clientes")
+
+    def test_reset_session(self) -> None:
+        """Test a reused connection closes its cursors and keeps the prepared statements."""
+
+        cursor = FakeCursor([(number,) for number in range(5)])
+        driver = flqpsql.FLQPSQL()
+        driver.conn_ = FakeConn(cursor)
+        driver.open_ = True
+        driver.server_prepare = True
+
+        sql = "SELECT nombre FROM clientes WHERE codcliente = :cod"
+        driver.declareCursor("cur_1", "id", "fltest", "1=1", cursor, None)
+        driver.execute_params(sql, {"cod": "'000001'"})
+        cursor.statements = []
+        driver.reset_session()
+        self.assertEqual(cursor.statements, ["CLOSE ALL", "DISCARD TEMP", "RESET ALL"])
+        self.assertEqual(driver.getRow(0, "cur_1", cursor), [])
+
+        new_driver = flqpsql.FLQPSQL()
+        new_driver.take_over(driver)
+        self.assertTrue(driver.conn_ is None)
+        self.assertFalse(driver.prepared_stats()["size"])
+        with self.assertRaises(Exception):
+            driver.getRow(0, "cur_1", cursor)
+
+        new_driver.execute_params(sql, {"cod": "'000002'"})
+        self.assertEqual(cursor.statements[-1], "EXECUTE pnstmt_1 ('000002')")
+
+    def test_insert_bulk(self) -> None:
+        """Test insertBulk uses COPY."""
+
+        cursor = FakeCursor([])
+        driver = flqpsql.FLQPSQL()
+        driver.conn_ = FakeConn(cursor)
+        driver.cursor_ = cursor
+        driver.open_ = True
+        driver.bulk_copy = True
+
+        rows = [["1", "'uno'", "True"], ["2", "'it''s\ttab'", "NULL"], ["3", "'a\\b'", "False"]]
+        self.assertTrue(driver.insertBulk("fltest", ["id", "string_field", "bool_field"], rows, 2))
+        self.assertEqual(
+            [sql for sql in cursor.statements if sql != "select 1"],
+            [
+                "COPY fltest (id, string_field, bool_field) FROM STDIN",
+                "COPY fltest (id, string_field, bool_field) FROM STDIN",
+            ],
+        )
+        self.assertEqual(cursor.result, ["3\ta\\\\b\tFalse"])
+        self.assertEqual(driver._copy_value("'it''s\ttab'"), "it's\\ttab")
+        self.assertEqual(driver._copy_value("NULL"), "\\N")
+
+    def test_estimated_count(self) -> None:
+        """Test estimatedCount reads the planner estimations."""
+
+        cursor = FakeCursor([])
+        driver = flqpsql.FLQPSQL()
+        driver.conn_ = FakeConn(cursor)
+
+        cursor.execute = lambda sql: setattr(cursor, "result", [(1500,)])  # type: ignore
+        self.assertEqual(driver.estimatedCount("fltest", "1 = 1"), 1500)
+        cursor.execute = lambda sql: setattr(  # type: ignore
+            cursor, "result", [([{"Plan": {"Plan Rows": 42}}],)]
+        )
+        self.assertEqual(driver.estimatedCount("fltest", "id > 10"), 42)
+        cursor.execute = lambda sql: setattr(cursor, "result", [(-1,)])  # type: ignore
+        self.assertEqual(driver.estimatedCount("fltest", "1=1"), None)
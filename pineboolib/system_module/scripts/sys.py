@@ -107,6 +107,15 @@ class FormInternalObj(qsa.FormDBWidget):
             _cur_serial.setValueBuffer(u"sha", _serial_value)
             _cur_serial.commitBuffer()
 
+            # Mantiene al día el catálogo de ficheros del gestor de módulos.
+            cur_files_.db().connManager().managerModules().updateFileInfo(
+                str(cur_files_.valueBuffer(u"idmodulo")),
+                str(cur_files_.valueBuffer(u"nombre")),
+                ""
+                if cur_files_.modeAccess() == cur_files_.Del
+                else str(cur_files_.valueBuffer(u"sha") or ""),
+            )
+
         return True
 
 